@@ -0,0 +1,255 @@
+"""Monte Carlo balance sweeps over headless shifts, on every CPU core.
+
+    python balance.py --players 1 --runs 200 --set ORDERS_PER_HOUR_SINGLE=4,5,6 \\
+        --set COOK_TIME_MEAT=4,5 --out balance.json
+
+Every combination of ``--set`` values is a configuration. Each run plays
+``--shifts`` consecutive shifts with ``bots.ScriptedPolicy``, spending each
+shift's score in the store before the next one, the way a player would.
+Results stream back from the worker processes and the summary file is
+rewritten as they arrive, so a long sweep can be read while it runs.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import settings
+from settings import *
+import headless
+from bots import ScriptedPolicy
+from store import Store
+
+# Settings a sweep may change, and the tables built from them
+TUNABLES = (
+    "ORDERS_PER_HOUR_SINGLE", "ORDERS_PER_HOUR_MULTI",
+    "COOK_TIME_MEAT", "COOK_TIME_SAUSAGE", "COOK_TIME_PASTA",
+    "REWARD_BURGER", "REWARD_HOTDOG", "REWARD_PASTA", "REWARD_SALAD", "REWARD_CLEANING",
+    "PERK_COST_SPEED", "PERK_COST_HOLDING", "PERK_COST_SALARY",
+)
+RECIPE_REWARDS = {
+    ItemType.BURGER: "REWARD_BURGER",
+    ItemType.HOTDOG: "REWARD_HOTDOG",
+    ItemType.PASTA_DISH: "REWARD_PASTA",
+    ItemType.SALAD_DISH: "REWARD_SALAD",
+}
+COOK_TIMES = {
+    ItemType.MEAT: (COOKING_STOVE, "COOK_TIME_MEAT"),
+    ItemType.SAUSAGE: (COOKING_STOVE, "COOK_TIME_SAUSAGE"),
+    ItemType.PASTA: (COOKING_BOILER, "COOK_TIME_PASTA"),
+}
+
+# Game modules that copy settings into their own namespace on import
+GAME_MODULES = ("orders", "stations", "sprites", "kitchen", "store", "ui", "bots", "headless")
+
+# Values as shipped, so each run starts from the same economy
+BASELINE = {name: getattr(settings, name) for name in TUNABLES}
+
+
+def apply_overrides(overrides):
+    """Set tunables in every game module and rebuild the tables derived from them."""
+    for name, value in overrides.items():
+        if name not in TUNABLES:
+            raise ValueError(f"{name} is not a tunable setting")
+        setattr(settings, name, value)
+        for module_name in GAME_MODULES:
+            module = sys.modules.get(module_name)
+            if module is not None and hasattr(module, name):
+                setattr(module, name, value)
+
+    # The recipe and cooking tables are shared dicts, so update them in place
+    for dish, name in RECIPE_REWARDS.items():
+        RECIPES[dish]["reward"] = getattr(settings, name)
+    for raw, (table, name) in COOK_TIMES.items():
+        table[raw] = (table[raw][0], getattr(settings, name))
+
+
+class QueueSampler:
+    """Wraps a policy and records how many orders wait after every step."""
+
+    def __init__(self, policy):
+        self.policy = policy
+        self.samples = 0
+        self.total = 0
+        self.peak = 0
+
+    def __call__(self, kitchen, keys):
+        waiting = len(kitchen.order_manager.orders)
+        self.samples += 1
+        self.total += waiting
+        self.peak = max(self.peak, waiting)
+        return self.policy(kitchen, keys)
+
+
+def run_career(config_index, overrides, seed, num_players, shifts, duration):
+    """One run: consecutive shifts, buying perks with each shift's pay."""
+    apply_overrides({**BASELINE, **overrides})
+
+    result = {"config": config_index, "seed": seed, "shifts": []}
+    perks = {}
+    for shift in range(shifts):
+        sampler = QueueSampler(ScriptedPolicy())
+        stats = headless.run_shift(num_players, perks, sampler, duration, seed * 1000 + shift)
+        result["shifts"].append({
+            "score": stats["score"],
+            "orders_completed": stats["orders_completed"],
+            "orders_spawned": stats["orders_spawned"],
+            "mean_queue": sampler.total / max(sampler.samples, 1),
+            "max_queue": sampler.peak,
+            "perks": sorted(perks),
+        })
+
+        # Greedy shopper: buy every perk it can afford, in store order
+        store = Store(stats["score"])
+        for index, perk in enumerate(store.perks):
+            if perk.can_afford(store.money):
+                store.purchase_perk(index)
+        perks = store.get_active_perks()
+    return result
+
+
+def _init_worker():
+    headless.init()
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class ConfigSummary:
+    """Running totals for one configuration, updated as runs come back."""
+
+    def __init__(self, overrides):
+        self.overrides = overrides
+        self.runs = 0
+        self.scores = []  # total over a run's shifts
+        self.shift_scores = {}
+        self.completed = 0
+        self.spawned = 0
+        self.queue_total = 0.0
+        self.queue_samples = 0
+        self.queue_peak = 0
+        self.perk_counts = {}
+
+    def add(self, result):
+        self.runs += 1
+        self.scores.append(sum(shift["score"] for shift in result["shifts"]))
+        for index, shift in enumerate(result["shifts"]):
+            self.shift_scores.setdefault(index, []).append(shift["score"])
+            self.completed += shift["orders_completed"]
+            self.spawned += shift["orders_spawned"]
+            self.queue_total += shift["mean_queue"]
+            self.queue_samples += 1
+            self.queue_peak = max(self.queue_peak, shift["max_queue"])
+            for perk in shift["perks"]:
+                self.perk_counts[perk] = self.perk_counts.get(perk, 0) + 1
+
+    def to_dict(self):
+        if not self.runs:
+            return {"overrides": self.overrides, "runs": 0}
+        shifts = len(self.shift_scores)
+        return {
+            "overrides": self.overrides,
+            "runs": self.runs,
+            "score": _distribution(self.scores),
+            "shift_score": [_distribution(self.shift_scores[index]) for index in range(shifts)],
+            "completion_rate": self.completed / self.spawned if self.spawned else 0.0,
+            "mean_queue": self.queue_total / self.queue_samples,
+            "max_queue": self.queue_peak,
+            # Share of shifts played with each perk
+            "perk_rate": {perk: count / (self.runs * shifts)
+                          for perk, count in sorted(self.perk_counts.items())},
+        }
+
+
+def _distribution(values):
+    mean = sum(values) / len(values)
+    return {
+        "mean": mean,
+        "std": (sum((v - mean) ** 2 for v in values) / len(values)) ** 0.5,
+        "min": min(values),
+        "p10": _percentile(values, 0.1),
+        "p50": _percentile(values, 0.5),
+        "p90": _percentile(values, 0.9),
+        "max": max(values),
+    }
+
+
+def write_summary(path, header, summaries):
+    # Written to a temporary file first so readers never see half a file
+    data = dict(header, configs=[summary.to_dict() for summary in summaries])
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(temp_path, path)
+
+
+def parse_sweep(assignments):
+    """``NAME=v1,v2`` strings to a list of override dicts, one per combination."""
+    names = []
+    choices = []
+    for assignment in assignments:
+        name, _, values = assignment.partition("=")
+        if name not in TUNABLES:
+            raise SystemExit(f"{name} is not a tunable setting; choose from {', '.join(TUNABLES)}")
+        names.append(name)
+        choices.append([float(v) if "." in v else int(v) for v in values.split(",")])
+    return [dict(zip(names, combo)) for combo in itertools.product(*choices)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep economy settings over simulated shifts")
+    parser.add_argument("--set", dest="sweep", action="append", default=[], metavar="NAME=V1,V2",
+                        help="values to try for a tunable setting; repeat for a grid")
+    parser.add_argument("--players", type=int, choices=(1, 2), default=1)
+    parser.add_argument("--runs", type=int, default=100, help="runs per configuration")
+    parser.add_argument("--shifts", type=int, default=3, help="consecutive shifts per run")
+    parser.add_argument("--duration", type=float, default=None,
+                        help="shift length in seconds (default: a full shift)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first run")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--out", default="balance.json")
+    parser.add_argument("--flush", type=float, default=2.0,
+                        help="seconds between summary rewrites")
+    args = parser.parse_args(argv)
+
+    configs = parse_sweep(args.sweep)
+    summaries = [ConfigSummary(overrides) for overrides in configs]
+    total = len(configs) * args.runs
+    header = {"players": args.players, "shifts": args.shifts, "runs_per_config": args.runs,
+              "duration": args.duration or GAME_DURATION, "baseline": BASELINE}
+
+    started = time.perf_counter()
+    last_flush = started
+    done = 0
+    with ProcessPoolExecutor(args.workers, initializer=_init_worker) as pool:
+        futures = [pool.submit(run_career, index, overrides, args.seed + run,
+                               args.players, args.shifts, args.duration)
+                   for run in range(args.runs)
+                   for index, overrides in enumerate(configs)]
+        for future in as_completed(futures):
+            result = future.result()
+            summaries[result["config"]].add(result)
+            done += 1
+
+            now = time.perf_counter()
+            if now - last_flush >= args.flush or done == total:
+                last_flush = now
+                elapsed = now - started
+                write_summary(args.out, dict(header, completed_runs=done, elapsed=elapsed), summaries)
+                print(f"\r{done}/{total} runs, {elapsed:.0f}s", end="", flush=True)
+    print()
+
+    for summary in summaries:
+        data = summary.to_dict()
+        print(f"{data['overrides'] or 'baseline'}: score {data['score']['mean']:.1f} "
+              f"(p10 {data['score']['p10']}, p90 {data['score']['p90']}), "
+              f"completion {data['completion_rate']:.0%}, queue {data['mean_queue']:.1f}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
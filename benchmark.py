@@ -0,0 +1,222 @@
+"""Per-tick timings of the simulation in fixed kitchen scenarios.
+
+    python benchmark.py                                  # every scenario
+    python benchmark.py --save bench.json                # keep the results as a baseline
+    python benchmark.py --compare bench.json             # flag scenarios that got slower
+    python benchmark.py --scenario rush --ticks 5000
+
+Each scenario builds a kitchen in a known state, lets it settle, then times
+``Kitchen.update`` (with the input applied before it) tick by tick and
+reports the mean, median, 99th percentile and worst tick. A scenario is a
+regression when its mean or median exceeds the baseline's by more than
+``--threshold``; the exit status is 1 if any did.
+"""
+import gc
+import sys
+import json
+import random
+import time
+import platform
+import argparse
+
+from settings import *
+import headless
+from controls import KeyState
+from kitchen import Kitchen
+from bots import ScriptedPolicy
+
+SEED = 1000
+
+
+class Wander:
+    """Walks every player in a new direction now and then, bumping into counters."""
+
+    def __init__(self, num_players, seed=SEED):
+        self.num_players = num_players
+        self.rng = random.Random(seed)
+        self.ticks = 0
+
+    def __call__(self, kitchen, keys):
+        if self.ticks % 30 == 0:
+            for num in range(1, self.num_players + 1):
+                keys.set_direction(num, self.rng.choice((-1, 0, 1)), self.rng.choice((-1, 0, 1)))
+        self.ticks += 1
+        return ()
+
+
+def _spawn_orders(kitchen, count):
+    for _ in range(count):
+        kitchen.order_manager._spawn_order()
+
+
+def _settle(kitchen, policy, done, limit=SIM_HZ * 30):
+    # Untimed steps until the scenario's state is in place
+    keys = KeyState()
+    for _ in range(limit):
+        if done():
+            return
+        for player_index, action in policy(kitchen, keys) or ():
+            kitchen.apply_action(player_index, action)
+        kitchen.update(SIM_DT, keys)
+    raise RuntimeError("scenario did not settle")
+
+
+def quiet_shift():
+    """1 player walking around an empty kitchen at the start of a shift."""
+    return Kitchen(1, seed=SEED), Wander(1)
+
+
+def rush():
+    """2 bot players cooking with 12 open orders and their customers in."""
+    kitchen = Kitchen(2, seed=SEED)
+    _spawn_orders(kitchen, 12)
+    return kitchen, ScriptedPolicy()
+
+
+def full_tables():
+    """1 player with all 6 dining tables seated and waiting for food."""
+    kitchen = Kitchen(1, seed=SEED)
+    _spawn_orders(kitchen, 6)
+    _settle(kitchen, headless.idle_policy,
+            lambda: sum(c.state == "sitting" for c in kitchen.customers) >= 6)
+    return kitchen, Wander(1)
+
+
+def dirty_kitchen():
+    """1 player walking past the full 5 dirt spots."""
+    kitchen = Kitchen(1, seed=SEED)
+    while len(kitchen.dirt_spots) < MAX_DIRT_SPOTS:
+        kitchen._spawn_dirt()
+    return kitchen, Wander(1)
+
+
+def helpers():
+    """1 idle player and 2 helper bots planning and walking every order."""
+    kitchen = Kitchen(1, seed=SEED, helpers=2)
+    _spawn_orders(kitchen, 8)
+    return kitchen, headless.idle_policy
+
+
+SCENARIOS = {
+    "quiet": quiet_shift,
+    "rush": rush,
+    "full_tables": full_tables,
+    "dirty": dirty_kitchen,
+    "helpers": helpers,
+}
+
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def time_scenario(build, ticks, warmup):
+    """Seconds per tick for ``ticks`` ticks after ``warmup`` untimed ones."""
+    kitchen, policy = build()
+    keys = KeyState()
+    for _ in range(warmup):
+        for player_index, action in policy(kitchen, keys) or ():
+            kitchen.apply_action(player_index, action)
+        kitchen.update(SIM_DT, keys)
+
+    times = [0.0] * ticks
+    clock = time.perf_counter
+    gc.collect()
+    for tick in range(ticks):
+        # The policy decides outside the timing; applying its input is part of the tick
+        actions = policy(kitchen, keys) or ()
+        started = clock()
+        for player_index, action in actions:
+            kitchen.apply_action(player_index, action)
+        kitchen.update(SIM_DT, keys)
+        times[tick] = clock() - started
+    return times
+
+
+def summarize(times):
+    ordered = sorted(times)
+    return {
+        "ticks": len(times),
+        "mean_us": sum(times) / len(times) * 1e6,
+        "p50_us": _percentile(ordered, 0.5) * 1e6,
+        "p99_us": _percentile(ordered, 0.99) * 1e6,
+        "max_us": ordered[-1] * 1e6,
+    }
+
+
+def run(names, ticks, warmup, repeat):
+    # Noise only ever adds time, so each scenario keeps its quietest run
+    results = {}
+    for name in names:
+        runs = [summarize(time_scenario(SCENARIOS[name], ticks, warmup)) for _ in range(repeat)]
+        results[name] = min(runs, key=lambda result: result["mean_us"])
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Lines describing each scenario against the baseline, and whether any regressed."""
+    lines = []
+    regressed = False
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            lines.append(f"{name}: not in baseline")
+            continue
+        changes = {key: result[key] / base[key] - 1 for key in ("mean_us", "p50_us", "p99_us", "max_us")}
+        slower = changes["mean_us"] > threshold or changes["p50_us"] > threshold
+        regressed |= slower
+        lines.append(f"{name}: " + "  ".join(f"{key[:-3]} {change:+.0%}" for key, change in changes.items())
+                     + ("  REGRESSION" if slower else ""))
+    return lines, regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time Kitchen.update in fixed scenarios")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="scenario to run; repeat for several (default: all)")
+    parser.add_argument("--ticks", type=int, default=3000, help="timed ticks per run")
+    parser.add_argument("--warmup", type=int, default=120, help="untimed ticks before timing")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per scenario; the quietest is kept")
+    parser.add_argument("--save", metavar="PATH", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="slowdown in mean or median that counts as a regression (default 0.10)")
+    args = parser.parse_args(argv)
+
+    headless.init()
+    names = args.scenario or list(SCENARIOS)
+    results = run(names, args.ticks, args.warmup, args.repeat)
+
+    print(f"{'scenario':<12} {'mean':>9} {'p50':>9} {'p99':>9} {'max':>9}  (us per tick)")
+    for name, result in results.items():
+        print(f"{name:<12} {result['mean_us']:9.1f} {result['p50_us']:9.1f} "
+              f"{result['p99_us']:9.1f} {result['max_us']:9.1f}")
+
+    data = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "ticks": args.ticks,
+        "warmup": args.warmup,
+        "repeat": args.repeat,
+        "scenarios": results,
+    }
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(data, f, indent=2)
+        print(f"Saved {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get("platform") != data["platform"]:
+            print(f"Baseline was taken on {baseline.get('platform')}; timings may not be comparable")
+        lines, regressed = compare(results, baseline["scenarios"], args.threshold)
+        print(f"Against {args.compare}:")
+        for line in lines:
+            print("  " + line)
+        return 1 if regressed else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,446 @@
+"""Scripted players for headless runs and helper cooks.
+
+``ScriptedPolicy`` is a ``headless.run_shift`` policy: each player takes the
+oldest open order, walks through its recipe station by station and serves it.
+It plays well enough to stress the economy, not to win. A ``Kitchen`` built
+with ``helpers`` runs the same policy for its bot-driven cooks.
+
+Bots walk on a ``NavGrid``, a coarse occupancy grid of the furniture. When a
+grid is made for a layout it searches a field of moves toward every station
+and every dining seat, so during a shift a bot's step is a table lookup.
+"""
+from types import SimpleNamespace
+import pygame
+from settings import *
+from spatial import within
+from controls import (ACTION_INTERACT, ACTION_SERVE, ACTION_DROP,
+                      ACTION_COOLER_MEAT, ACTION_COOLER_SAUSAGE, ACTION_COOLER_CLOSE)
+
+# Side of a grid cell in pixels; a player's step per tick must not exceed it
+NAV_CELL = 10
+
+# Players never walk above the top bar
+NAV_TOP = 70
+
+# Grid moves, straight ones first so ties prefer them
+NAV_MOVES = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
+
+# How close a player's centre must be to a seated customer's to serve
+SERVE_DISTANCE = 70
+
+# Probe points inside a grid cell; a goal cell must hold from all of them
+NAV_CORNERS = ((1, 1), (NAV_CELL - 2, 1), (1, NAV_CELL - 2), (NAV_CELL - 2, NAV_CELL - 2))
+
+# Ticks without progress before a bot drops everything and starts over;
+# time spent waiting on a cooking station does not count
+GIVE_UP_TICKS = 20 * SIM_HZ
+
+
+class NavGrid:
+    """Where one player shape can stand, as cells over the player's position.
+
+    A cell is free when the player's collision box clears the furniture from
+    anywhere in it, so a step from a free cell to a free neighbour never
+    collides. Grids and their fields are shared by every kitchen with the
+    same layout; all fields are searched when the grid is made, before the
+    first tick that needs one.
+    """
+    _grids = {}
+
+    @classmethod
+    def for_player(cls, kitchen, player):
+        rect, body = player.rect, player.collision_rect
+        shape = (rect.width, rect.height, body.x - rect.x, body.y - rect.y, body.width, body.height)
+        obstacles = tuple(tuple(r) for r in kitchen.obstacle_rects())
+        key = (obstacles, shape)
+        grid = cls._grids.get(key)
+        if grid is None:
+            grid = cls._grids[key] = cls(obstacles, shape)
+            grid._build_fields(kitchen)
+        return grid
+
+    def __init__(self, obstacles, shape):
+        width, height, offset_x, offset_y, body_width, body_height = shape
+        self.width = width
+        self.height = height
+        self.cols = (SCREEN_WIDTH - width) // NAV_CELL + 1
+        self.rows = (SCREEN_HEIGHT - height - 10 - NAV_TOP) // NAV_CELL + 1
+        self.fields = {}
+
+        rects = [pygame.Rect(r) for r in obstacles]
+        # Where the collision box can be from anywhere in the cell; positions
+        # round to the rect, so up to the next cell's first pixel
+        box = pygame.Rect(0, 0, body_width + NAV_CELL, body_height + NAV_CELL)
+        self.free = []
+        for row in range(self.rows):
+            for col in range(self.cols):
+                box.topleft = (col * NAV_CELL + offset_x, NAV_TOP + row * NAV_CELL + offset_y)
+                self.free.append(box.collidelist(rects) == -1)
+
+    def cell(self, pos):
+        col = min(max(int(pos[0]) // NAV_CELL, 0), self.cols - 1)
+        row = min(max((int(pos[1]) - NAV_TOP) // NAV_CELL, 0), self.rows - 1)
+        return row * self.cols + col
+
+    def field(self, key):
+        """Move toward the goal from every cell, by ``station_key`` or ``seat_key``."""
+        return self.fields[key]
+
+    def _build_fields(self, kitchen):
+        self.free_links = self._links(True)
+        self.blocked_links = self._links(False)
+
+        # Every cell where an interact press picks one station, in one pass,
+        # gives the goals of all station fields at once
+        probe = SimpleNamespace(rect=pygame.Rect(0, 0, self.width, self.height))
+        goals = {}
+        for index, (x, y) in self._open_cells():
+            faced = set()
+            for dx, dy in NAV_CORNERS:
+                probe.rect.topleft = (x + dx, y + dy)
+                faced.add(facing(kitchen, probe))
+            if len(faced) == 1:
+                station = faced.pop()
+                if station is not None:
+                    goals.setdefault(station, []).append(index)
+        for station in kitchen.stations:
+            self.fields[station_key(station)] = self._search(goals.get(station, []))
+
+        # Seats are few and small; only cells near each one can be in reach
+        rect = pygame.Rect(0, 0, self.width, self.height)
+        reach = SERVE_DISTANCE + max(self.width, self.height)
+        seats = [seat_center(table) for table in kitchen.dining_tables]
+        for seat in seats:
+            others = [other for other in seats if other != seat]
+            cells, alone = [], []
+            for index, (x, y) in self._open_cells(seat, reach):
+                centers = [rect.move(x + dx, y + dy).center for dx, dy in NAV_CORNERS]
+                if all(_distance(center, seat) < SERVE_DISTANCE for center in centers):
+                    cells.append(index)
+                    # No other seat close enough for the kitchen to hand it the dish
+                    if not any(_distance(center, other) < INTERACT_DISTANCE
+                               for center in centers for other in others):
+                        alone.append(index)
+            self.fields[seat_key(seat)] = self._search(cells)
+            self.fields[seat_key(seat, alone=True)] = self._search(alone)
+
+    def _open_cells(self, around=None, reach=None):
+        # (index, top-left position) of free cells, optionally only those
+        # whose position is within ``reach`` of ``around`` on both axes
+        cols, free = self.cols, self.free
+        rows, columns = range(self.rows), range(cols)
+        if around is not None:
+            ax, ay = around
+            rows = range(max(0, (ay - reach - NAV_TOP) // NAV_CELL),
+                         min(self.rows, (ay + reach - NAV_TOP) // NAV_CELL + 1))
+            columns = range(max(0, (ax - reach) // NAV_CELL), min(cols, (ax + reach) // NAV_CELL + 1))
+        for row in rows:
+            for col in columns:
+                index = row * cols + col
+                if free[index]:
+                    yield index, (col * NAV_CELL, NAV_TOP + row * NAV_CELL)
+
+    def _search(self, goal_cells):
+        # Breadth-first from every goal cell; each cell keeps the move that
+        # first reached it
+        moves = [None] * len(self.free)
+        for index in goal_cells:
+            moves[index] = (0, 0)
+
+        reached = self._spread(moves, list(goal_cells), self.free_links)
+        # Then from blocked cells, where a player pressed against furniture
+        # may stand, back out to the nearest free one
+        self._spread(moves, reached, self.blocked_links)
+        return moves
+
+    def _links(self, free_cells):
+        # Per cell, the (neighbour, move) pairs that reach it, for neighbours
+        # that are free (or blocked), in NAV_MOVES order; shared by every search
+        cols, rows, free = self.cols, self.rows, self.free
+        links = []
+        for index in range(len(free)):
+            row, col = divmod(index, cols)
+            cell_links = []
+            for dx, dy in NAV_MOVES:
+                # The neighbour that gets here by moving (dx, dy)
+                c, r = col - dx, row - dy
+                if not (0 <= c < cols and 0 <= r < rows):
+                    continue
+                neighbour = r * cols + c
+                if free[neighbour] != free_cells:
+                    continue
+                # No cutting corners past furniture
+                if free_cells and dx and dy and not (free[r * cols + col] and free[row * cols + c]):
+                    continue
+                cell_links.append((neighbour, (dx, dy)))
+            links.append(tuple(cell_links))
+        return links
+
+    def _spread(self, moves, frontier, links):
+        reached = list(frontier)
+        while frontier:
+            found = []
+            for index in frontier:
+                for neighbour, move in links[index]:
+                    if moves[neighbour] is None:
+                        moves[neighbour] = move
+                        found.append(neighbour)
+            reached += found
+            frontier = found
+        return reached
+
+
+class Bot:
+    """One player's plan: a list of steps toward a single dish."""
+
+    def __init__(self, player_index, grid):
+        self.player_index = player_index
+        self.grid = grid
+        self.dish = None
+        self.steps = []
+        self.held_count = 0
+        self.cooldown = 0
+        self.idle_ticks = 0
+
+    def reset(self):
+        self.dish = None
+        self.steps = []
+        self.idle_ticks = 0
+
+
+class ScriptedPolicy:
+    """Drives players in a kitchen with a ``Bot`` each.
+
+    ``players`` lists the player indices to drive; all of them by default.
+    Players with a ``heading`` are steered through it, the rest through
+    the held keys.
+    """
+
+    def __init__(self, players=None):
+        self.player_indices = players
+        self.bots = None
+
+    def prepare(self, kitchen):
+        # Bots and their grids, with every field searched; a layout seen
+        # before reuses its grids
+        players = list(kitchen.players)
+        indices = range(len(players)) if self.player_indices is None else self.player_indices
+        self.bots = [Bot(index, NavGrid.for_player(kitchen, players[index])) for index in indices]
+
+    def __call__(self, kitchen, keys):
+        if self.bots is None:
+            self.prepare(kitchen)
+        players = list(kitchen.players)
+
+        actions = []
+        for bot in self.bots:
+            player = players[bot.player_index]
+            dx, dy, bot_actions = self._think(kitchen, bot, player)
+            if player.heading is not None:
+                player.heading = (dx, dy)
+            else:
+                keys.set_direction(player.player_num, dx, dy)
+            actions.extend(bot_actions)
+        return actions
+
+    # Planning
+
+    def _plan(self, kitchen, bot):
+        # Each bot owns the stove, boiler and assembly table matching its index
+        index = bot.player_index
+        stove = kitchen.stoves[index % len(kitchen.stoves)]
+        boiler = kitchen.boilers[index % len(kitchen.boilers)]
+        assembly = kitchen.assembly_tables[index % len(kitchen.assembly_tables)]
+        tables = {station.provides_item: station for station in kitchen.stations
+                  if getattr(station, "provides_item", None) and station is not kitchen.cooler}
+        lettuce = next(s for s in kitchen.stations if s.station_type == "lettuce")
+        sauce = next(s for s in kitchen.stations if s.station_type == StationType.SAUCE)
+
+        if bot.dish == ItemType.BURGER:
+            cook = [("cooler", ACTION_COOLER_MEAT), ("place", stove)]
+            side = [("take", tables[ItemType.BREAD])]
+            finish = [("collect", stove)]
+        elif bot.dish == ItemType.HOTDOG:
+            cook = [("cooler", ACTION_COOLER_SAUSAGE), ("place", stove)]
+            side = [("take", tables[ItemType.BREAD])]
+            finish = [("collect", stove)]
+        elif bot.dish == ItemType.PASTA_DISH:
+            cook = [("take", tables[ItemType.PASTA]), ("place", boiler)]
+            side = [("take", sauce)]
+            finish = [("collect", boiler)]
+        else:
+            cook = []
+            side = [("take", lettuce), ("take", sauce)]
+            finish = []
+        return cook + side + finish + [("assemble", assembly), ("serve", None)]
+
+    def _choose_dish(self, kitchen, bot):
+        # The oldest open order no other bot is already cooking, preferring
+        # dishes someone at a table waits for; with every table taken, a
+        # customer still in line has nowhere to be served
+        claimed = [other.dish for other in self.bots if other is not bot and other.dish]
+        dishes = []
+        for order in kitchen.order_manager.orders:
+            if order.completed:
+                continue
+            if order.dish_type in claimed:
+                claimed.remove(order.dish_type)
+            else:
+                dishes.append(order.dish_type)
+        seated = {c.ordered_item for c in kitchen.customers if c.state == "sitting"}
+        for dish in dishes:
+            if dish in seated:
+                return dish
+        return dishes[0] if dishes else None
+
+    # Acting
+
+    def _think(self, kitchen, bot, player):
+        if bot.cooldown:
+            bot.cooldown -= 1
+
+        # A cooler menu left open for this bot
+        if kitchen.show_cooler_menu and kitchen.cooler_menu_player == bot.player_index:
+            return 0, 0, ((None, ACTION_COOLER_CLOSE),)
+
+        if not bot.steps:
+            bot.dish = self._choose_dish(kitchen, bot)
+            if bot.dish is None:
+                return 0, 0, ()
+            bot.steps = self._plan(kitchen, bot)
+            bot.held_count = len(player.held_items)
+
+        kind, station = bot.steps[0]
+        held = len(player.held_items)
+
+        # Waiting on a station that is still cooking is not being stuck
+        if not (kind in ("place", "collect") and station.cooking):
+            bot.idle_ticks += 1
+            if bot.idle_ticks > GIVE_UP_TICKS:
+                return self._give_up(bot, player)
+
+        # Steps finish when the player's hands change the expected way
+        if kind in ("cooler", "take", "collect") and held > bot.held_count:
+            return self._advance(bot, player)
+        if kind == "place" and (station.cooking or station.current_item):
+            if held < bot.held_count:
+                return self._advance(bot, player)
+        if kind == "assemble" and any(i.item_type == bot.dish for i in player.held_items):
+            return self._advance(bot, player)
+        if kind == "serve" and not any(i.item_type == bot.dish for i in player.held_items):
+            return self._advance(bot, player)
+        bot.held_count = held
+
+        if kind == "serve":
+            return self._serve(kitchen, bot, player)
+
+        target = kitchen.cooler if kind == "cooler" else station
+        if facing(kitchen, player) is target:
+            # Nothing to pick up yet, or someone else is choosing from the cooler
+            if bot.cooldown or (kind == "collect" and station.cooking) or kitchen.show_cooler_menu:
+                return 0, 0, ()
+            bot.cooldown = 6
+            if kind == "cooler":
+                # Open the menu and choose in the same tick
+                return 0, 0, ((bot.player_index, ACTION_INTERACT), (None, station))
+            return 0, 0, ((bot.player_index, ACTION_INTERACT),)
+
+        return self._walk(bot, player, bot.grid.field(station_key(target)))
+
+    def _advance(self, bot, player):
+        bot.steps.pop(0)
+        bot.held_count = len(player.held_items)
+        bot.idle_ticks = 0
+        return 0, 0, ()
+
+    def _give_up(self, bot, player):
+        # Throw away whatever the plan left in hand and pick a new dish
+        if player.held_items or player.holding_mop:
+            return 0, 0, ((bot.player_index, ACTION_DROP),)
+        bot.reset()
+        return 0, 0, ()
+
+    def _serve(self, kitchen, bot, player):
+        seats = [c for c in kitchen.customers
+                 if c.state == "sitting" and c.ordered_item == bot.dish]
+        if not seats:
+            return 0, 0, ()
+        center = player.rect.center
+        customer = min(seats, key=lambda c: _distance(c.rect.center, center))
+        if (_distance(customer.rect.center, center) < SERVE_DISTANCE
+                and serving(kitchen, player) is customer):
+            if bot.cooldown:
+                return 0, 0, ()
+            bot.cooldown = 6
+            return 0, 0, ((bot.player_index, ACTION_SERVE),)
+
+        seat = seat_center(customer.dining_table)
+        field = bot.grid.field(seat_key(seat))
+        if any(other is not customer and other.state == "sitting"
+               and _distance(other.rect.center, seat) < SERVE_DISTANCE + INTERACT_DISTANCE
+               for other in kitchen.customers):
+            # A seated neighbour could take the dish; stand where only this seat is in reach
+            alone = bot.grid.field(seat_key(seat, alone=True))
+            if alone[bot.grid.cell(player.pos)] is not None:
+                field = alone
+        return self._walk(bot, player, field)
+
+    def _walk(self, bot, player, field):
+        grid = bot.grid
+        index = grid.cell(player.pos)
+        move = field[index]
+        if move is None:
+            # No cell leads to the goal from here
+            return 0, 0, ()
+        if move == (0, 0):
+            # In a goal cell, but its edges can still miss; settle toward
+            # the middle
+            row, col = divmod(index, grid.cols)
+            ex = col * NAV_CELL + NAV_CELL / 2 - player.pos.x
+            ey = NAV_TOP + row * NAV_CELL + NAV_CELL / 2 - player.pos.y
+            move = (_sign(ex), _sign(ey))
+        return move + ((),)
+
+
+def facing(kitchen, player):
+    # The station the kitchen would pick for an interact press, in its order;
+    # anything with a ``rect`` will do for ``player``
+    nearby = kitchen.stations.overlapping(player.rect)
+    if kitchen.cooler in nearby and kitchen.cooler.can_interact(player):
+        return kitchen.cooler
+    for station in nearby:
+        if station is not kitchen.cooler and station.can_interact(player):
+            return station
+    return None
+
+
+def serving(kitchen, player):
+    # The seated customer the kitchen would hand a dish to, in its order
+    center = player.rect.center
+    for customer in kitchen.customers.near(center, INTERACT_DISTANCE):
+        if customer.state == "sitting" and within(customer.rect.center, center, INTERACT_DISTANCE):
+            return customer
+    return None
+
+
+def station_key(station):
+    return ("station", station.station_type, tuple(station.collision_rect))
+
+
+def seat_center(table):
+    # Where a customer seated at the table has its centre
+    x, y = table.seat
+    return x + PLAYER_SIZE // 2, y + PLAYER_SIZE // 2
+
+
+def seat_key(seat, alone=False):
+    return ("serve_alone" if alone else "serve", seat)
+
+
+def _sign(value):
+    # Direction toward a point, ignoring the last pixel
+    return 0 if abs(value) < 1 else (1 if value > 0 else -1)
+
+
+def _distance(a, b):
+    return ((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2) ** 0.5
@@ -0,0 +1,112 @@
+import pygame
+
+
+# Player actions; small ints so scripts and recordings can store them compactly
+ACTION_INTERACT = 1
+ACTION_SERVE = 2
+ACTION_DROP = 3
+ACTION_COOLER_MEAT = 4
+ACTION_COOLER_SAUSAGE = 5
+ACTION_COOLER_CLOSE = 6
+
+ACTION_NAMES = {
+    ACTION_INTERACT: "interact",
+    ACTION_SERVE: "serve",
+    ACTION_DROP: "drop",
+    ACTION_COOLER_MEAT: "cooler_meat",
+    ACTION_COOLER_SAUSAGE: "cooler_sausage",
+    ACTION_COOLER_CLOSE: "cooler_close",
+}
+
+# Cooler actions act on whoever opened the menu, so they carry no player
+COOLER_ACTIONS = (ACTION_COOLER_MEAT, ACTION_COOLER_SAUSAGE, ACTION_COOLER_CLOSE)
+
+# Keyboard layout per player: movement keys and one key per action
+PLAYER_KEYS = {
+    1: {
+        "up": pygame.K_w, "down": pygame.K_s, "left": pygame.K_a, "right": pygame.K_d,
+        ACTION_INTERACT: pygame.K_SPACE, ACTION_SERVE: pygame.K_e, ACTION_DROP: pygame.K_q,
+    },
+    2: {
+        "up": pygame.K_UP, "down": pygame.K_DOWN, "left": pygame.K_LEFT, "right": pygame.K_RIGHT,
+        ACTION_INTERACT: pygame.K_RETURN, ACTION_SERVE: pygame.K_PERIOD, ACTION_DROP: pygame.K_COMMA,
+    },
+}
+
+COOLER_KEYS = {
+    pygame.K_1: ACTION_COOLER_MEAT,
+    pygame.K_2: ACTION_COOLER_SAUSAGE,
+    pygame.K_ESCAPE: ACTION_COOLER_CLOSE,
+}
+
+# Debug and practice keys while playing
+REWIND_KEY = pygame.K_BACKSPACE  # hold to scrub back; with Shift, forward again
+SPEED_KEYS = {pygame.K_F1: 0.25, pygame.K_F2: 1.0, pygame.K_F3: 4.0, pygame.K_F4: 16.0}
+
+DIRECTIONS = ("up", "down", "left", "right")
+
+# Every key the simulation polls while held, in bitmask order
+MOVE_KEYS = tuple(PLAYER_KEYS[num][direction] for num in (1, 2) for direction in DIRECTIONS)
+MOVE_KEY_BITS = {key: bit for bit, key in enumerate(MOVE_KEYS)}
+
+
+class KeyState:
+    """Held movement keys, indexable like ``pygame.key.get_pressed()``.
+
+    Lets scripts, bots and replays drive ``Kitchen.update`` without a
+    keyboard. The state is a bitmask over ``MOVE_KEYS``.
+    """
+
+    def __init__(self, mask=0):
+        self.mask = mask
+
+    @classmethod
+    def from_pressed(cls, pressed):
+        mask = 0
+        for bit, key in enumerate(MOVE_KEYS):
+            if pressed[key]:
+                mask |= 1 << bit
+        return cls(mask)
+
+    def __getitem__(self, key):
+        bit = MOVE_KEY_BITS.get(key)
+        return bit is not None and bool(self.mask >> bit & 1)
+
+    def press(self, key):
+        self.mask |= 1 << MOVE_KEY_BITS[key]
+
+    def release(self, key):
+        self.mask &= ~(1 << MOVE_KEY_BITS[key])
+
+    def set_direction(self, player_num, dx=0, dy=0):
+        # Replace one player's held movement keys with a direction
+        keys = PLAYER_KEYS[player_num]
+        for direction in DIRECTIONS:
+            self.release(keys[direction])
+        if dx < 0:
+            self.press(keys["left"])
+        elif dx > 0:
+            self.press(keys["right"])
+        if dy < 0:
+            self.press(keys["up"])
+        elif dy > 0:
+            self.press(keys["down"])
+
+    def clear(self):
+        self.mask = 0
+
+
+def event_actions(event, num_players, cooler_open=False):
+    """(player_index, action) pairs for a key press; index is None for cooler actions."""
+    if event.type != pygame.KEYDOWN:
+        return []
+
+    if cooler_open and event.key in COOLER_KEYS:
+        return [(None, COOLER_KEYS[event.key])]
+
+    actions = []
+    for index in range(num_players):
+        for action, key in PLAYER_KEYS[index + 1].items():
+            if key == event.key and action not in DIRECTIONS:
+                actions.append((index, action))
+    return actions
@@ -0,0 +1,325 @@
+"""Step/reset environments over ``Kitchen`` for automated agents.
+
+    env = KitchenEnv(num_players=2)
+    obs = env.reset(seed=1)
+    obs, reward, done = env.step(actions)
+
+    envs = VecKitchenEnv(64, workers=4)      # 64 kitchens over 4 processes
+    obs = envs.reset(seed=0)                 # (64, OBS_SIZE) float32
+    obs, rewards, dones = envs.step(actions) # actions: (64, players, 2) ints
+
+An action row per player is ``(move, button)``: ``move`` indexes ``MOVES``
+and ``button`` is 0 or one of the ``controls.ACTION_*`` ids. Observations are
+flat float32 vectors laid out by the ``*_OFFSET`` constants below and are
+written into preallocated arrays; ``step`` returns the same arrays every
+call, so copy them if you need to keep one. Requires NumPy.
+"""
+import sys
+import time
+import argparse
+import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from settings import *
+import headless
+from controls import KeyState
+from kitchen import Kitchen
+
+# (dx, dy) for each move index
+MOVES = ((0, 0), (0, -1), (0, 1), (-1, 0), (1, 0))
+
+# Integer codes shared by held items, station contents and orders; 0 is nothing
+ITEM_TYPES = (
+    ItemType.BREAD, ItemType.MEAT, ItemType.SAUSAGE, ItemType.PASTA, ItemType.LETTUCE,
+    ItemType.SAUCE, ItemType.COOKED_MEAT, ItemType.COOKED_SAUSAGE, ItemType.BOILED_PASTA,
+    ItemType.BURGER, ItemType.HOTDOG, ItemType.PASTA_DISH, ItemType.SALAD_DISH,
+)
+ITEM_CODES = {item_type: code for code, item_type in enumerate(ITEM_TYPES, 1)}
+CUSTOMER_STATES = ("arriving", "going_to_table", "sitting", "waiting",
+                   "receiving_food", "eating", "leaving", "exiting")
+CUSTOMER_CODES = {state: code for code, state in enumerate(CUSTOMER_STATES, 1)}
+
+MAX_PLAYERS = 2
+MAX_STATIONS = 16
+MAX_ORDERS = 12
+MAX_CUSTOMERS = 16
+
+# Per player: present, x, y, cleaning, holding mop, then a count per item code
+PLAYER_FEATURES = 5 + len(ITEM_TYPES) + 1
+# Per station: item code, cooking, cook progress, items on an assembly table
+STATION_FEATURES = 4
+# Per order: present, dish code, seconds waited
+ORDER_FEATURES = 3
+# Per customer: state code, x, y, dish code
+CUSTOMER_FEATURES = 4
+# Time left, score, dirt spots, cooler menu open
+GLOBAL_FEATURES = 4
+
+PLAYER_OFFSET = 0
+STATION_OFFSET = PLAYER_OFFSET + MAX_PLAYERS * PLAYER_FEATURES
+ORDER_OFFSET = STATION_OFFSET + MAX_STATIONS * STATION_FEATURES
+CUSTOMER_OFFSET = ORDER_OFFSET + MAX_ORDERS * ORDER_FEATURES
+GLOBAL_OFFSET = CUSTOMER_OFFSET + MAX_CUSTOMERS * CUSTOMER_FEATURES
+OBS_SIZE = GLOBAL_OFFSET + GLOBAL_FEATURES
+
+
+class KitchenEnv:
+    """One kitchen behind ``reset``/``step``; every step is ``frame_skip`` ticks."""
+
+    def __init__(self, num_players=1, perks=None, frame_skip=1, obs=None):
+        self.num_players = num_players
+        self.perks = perks
+        self.frame_skip = frame_skip
+        self.kitchen = None
+        self.keys = KeyState()
+
+        # Views into one flat buffer, which may be a row of a batch
+        self.obs = obs if obs is not None else np.zeros(OBS_SIZE, np.float32)
+        self.player_obs = self.obs[PLAYER_OFFSET:STATION_OFFSET].reshape(MAX_PLAYERS, PLAYER_FEATURES)
+        self.station_obs = self.obs[STATION_OFFSET:ORDER_OFFSET].reshape(MAX_STATIONS, STATION_FEATURES)
+        self.order_obs = self.obs[ORDER_OFFSET:CUSTOMER_OFFSET].reshape(MAX_ORDERS, ORDER_FEATURES)
+        self.customer_obs = self.obs[CUSTOMER_OFFSET:GLOBAL_OFFSET].reshape(MAX_CUSTOMERS, CUSTOMER_FEATURES)
+        self.global_obs = self.obs[GLOBAL_OFFSET:]
+
+    def reset(self, seed=None):
+        headless.init()
+        self.kitchen = Kitchen(self.num_players, self.perks, seed)
+        self.keys.clear()
+        self.players = list(self.kitchen.players)
+        self.stations = list(self.kitchen.stations)[:MAX_STATIONS]
+        self._observe()
+        return self.obs
+
+    def step(self, actions):
+        kitchen = self.kitchen
+        keys = self.keys
+        for index, player in enumerate(self.players):
+            move, button = actions[index]
+            dx, dy = MOVES[move]
+            keys.set_direction(player.player_num, dx, dy)
+            if button:
+                kitchen.apply_action(index, int(button))
+
+        score = kitchen.score
+        for _ in range(self.frame_skip):
+            kitchen.update(SIM_DT, keys)
+            if kitchen.is_game_over():
+                break
+        self._observe()
+        return self.obs, kitchen.score - score, kitchen.is_game_over()
+
+    def _observe(self):
+        kitchen = self.kitchen
+
+        players = self.player_obs
+        players.fill(0.0)
+        for row, player in zip(players, self.players):
+            row[0] = 1.0
+            row[1] = player.pos.x / SCREEN_WIDTH
+            row[2] = player.pos.y / SCREEN_HEIGHT
+            row[3] = player.is_cleaning
+            row[4] = player.holding_mop
+            for item in player.held_items:
+                row[4 + ITEM_CODES.get(item.item_type, 0)] += 1.0
+
+        stations = self.station_obs
+        for row, station in zip(stations, self.stations):
+            item = station.current_item
+            row[0] = ITEM_CODES.get(item.item_type, 0) if item else 0
+            cooking = getattr(station, "cooking", False)
+            row[1] = cooking
+            row[2] = station.cook_timer / station.cook_duration if cooking else 0.0
+            row[3] = len(getattr(station, "items_on_table", ()))
+
+        orders = self.order_obs
+        orders.fill(0.0)
+        for row, order in zip(orders, kitchen.order_manager.orders):
+            row[0] = 1.0
+            row[1] = ITEM_CODES[order.dish_type]
+            row[2] = order.wait_time
+
+        customers = self.customer_obs
+        customers.fill(0.0)
+        for row, customer in zip(customers, kitchen.customers):
+            row[0] = CUSTOMER_CODES.get(customer.state, 0)
+            row[1] = customer.pos.x / SCREEN_WIDTH
+            row[2] = customer.pos.y / SCREEN_HEIGHT
+            row[3] = ITEM_CODES.get(customer.ordered_item, 0)
+
+        globals_ = self.global_obs
+        globals_[0] = kitchen.time_remaining / GAME_DURATION
+        globals_[1] = kitchen.score
+        globals_[2] = len(kitchen.dirt_spots)
+        globals_[3] = kitchen.show_cooler_menu
+
+
+class _Batch:
+    """Observation, reward, done and action arrays for ``num_envs`` kitchens."""
+
+    FIELDS = (("obs", np.float32, (OBS_SIZE,)), ("rewards", np.float32, ()),
+              ("dones", np.bool_, ()), ("actions", np.int32, (MAX_PLAYERS, 2)))
+
+    @classmethod
+    def nbytes(cls, num_envs):
+        return sum(np.dtype(dtype).itemsize * num_envs * int(np.prod(shape))
+                   for _, dtype, shape in cls.FIELDS)
+
+    def __init__(self, num_envs, buffer=None):
+        if buffer is None:
+            buffer = bytearray(self.nbytes(num_envs))
+        offset = 0
+        for name, dtype, shape in self.FIELDS:
+            array = np.ndarray((num_envs,) + shape, dtype, buffer, offset)
+            offset += array.nbytes
+            setattr(self, name, array)
+
+
+def _run_shard(connection, shm_name, num_envs, start, stop, num_players, perks, frame_skip):
+    # Worker process: owns kitchens start..stop of the batch in shared memory
+    shm = shared_memory.SharedMemory(name=shm_name)
+    batch = _Batch(num_envs, shm.buf)
+    envs = [KitchenEnv(num_players, perks, frame_skip, batch.obs[i]) for i in range(start, stop)]
+    seeds = [None] * len(envs)
+    try:
+        while True:
+            command, argument = connection.recv()
+            if command == "reset":
+                for offset, env in enumerate(envs):
+                    seeds[offset] = argument + start + offset if argument is not None else None
+                    env.reset(seeds[offset])
+            elif command == "step":
+                _step_envs(envs, batch, start, seeds, argument)
+            elif command == "close":
+                break
+            connection.send(None)
+    finally:
+        # Every view into the shared buffer must go before it can be closed
+        del envs, batch
+        shm.close()
+
+
+def _step_envs(envs, batch, start, seeds, seed_stride):
+    # Finished kitchens start over at once, with the next seed in their series
+    for offset, env in enumerate(envs):
+        index = start + offset
+        _, reward, done = env.step(batch.actions[index])
+        batch.rewards[index] = reward
+        batch.dones[index] = done
+        if done:
+            if seeds[offset] is not None:
+                seeds[offset] += seed_stride
+            env.reset(seeds[offset])
+
+
+class VecKitchenEnv:
+    """``num_envs`` independent kitchens stepped together.
+
+    With ``workers`` > 0 the kitchens are split across that many processes,
+    which share the batch arrays with this one; otherwise they run in-process.
+    A kitchen whose shift ends is reset on the spot; its ``dones`` entry says
+    so and its observation is already the first of the next shift.
+    """
+
+    def __init__(self, num_envs, num_players=1, perks=None, frame_skip=1, workers=0):
+        self.num_envs = num_envs
+        self.num_players = num_players
+        self.workers = min(workers, num_envs)
+        self._shm = None
+        self._connections = []
+        self._processes = []
+
+        if self.workers:
+            self._shm = shared_memory.SharedMemory(create=True, size=_Batch.nbytes(num_envs))
+            self.batch = _Batch(num_envs, self._shm.buf)
+            bounds = np.linspace(0, num_envs, self.workers + 1).astype(int)
+            for start, stop in zip(bounds[:-1], bounds[1:]):
+                parent, child = multiprocessing.Pipe()
+                process = multiprocessing.Process(
+                    target=_run_shard, daemon=True,
+                    args=(child, self._shm.name, num_envs, int(start), int(stop),
+                          num_players, perks, frame_skip))
+                process.start()
+                self._connections.append(parent)
+                self._processes.append(process)
+        else:
+            self.batch = _Batch(num_envs)
+            self.envs = [KitchenEnv(num_players, perks, frame_skip, self.batch.obs[i])
+                         for i in range(num_envs)]
+            self._seeds = [None] * num_envs
+
+        self.obs = self.batch.obs
+        self.rewards = self.batch.rewards
+        self.dones = self.batch.dones
+        self.actions = self.batch.actions
+
+    def reset(self, seed=None):
+        if self.workers:
+            self._broadcast("reset", seed)
+        else:
+            for index, env in enumerate(self.envs):
+                self._seeds[index] = seed + index if seed is not None else None
+                env.reset(self._seeds[index])
+        return self.obs
+
+    def step(self, actions=None):
+        # Actions may also be written straight into ``self.actions``
+        if actions is not None:
+            self.actions[:, :actions.shape[1]] = actions
+        if self.workers:
+            self._broadcast("step", self.num_envs)
+        else:
+            _step_envs(self.envs, self.batch, 0, self._seeds, self.num_envs)
+        return self.obs, self.rewards, self.dones
+
+    def _broadcast(self, command, argument=None):
+        for connection in self._connections:
+            connection.send((command, argument))
+        for connection in self._connections:
+            connection.recv()
+
+    def close(self):
+        if self._shm is None:
+            return
+        for connection in self._connections:
+            connection.send(("close", None))
+        for process in self._processes:
+            process.join()
+        del self.obs, self.rewards, self.dones, self.actions, self.batch
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure vectorised kitchen throughput")
+    parser.add_argument("--envs", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=0)
+    parser.add_argument("--players", type=int, choices=(1, 2), default=1)
+    parser.add_argument("--frame-skip", type=int, default=1)
+    parser.add_argument("--steps", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    with VecKitchenEnv(args.envs, args.players, frame_skip=args.frame_skip,
+                       workers=args.workers) as envs:
+        envs.reset(seed=0)
+        started = time.perf_counter()
+        for _ in range(args.steps):
+            actions = rng.integers(0, len(MOVES), (args.envs, args.players, 1))
+            envs.step(np.concatenate([actions, np.zeros_like(actions)], axis=2))
+        elapsed = time.perf_counter() - started
+
+    ticks = args.envs * args.steps * args.frame_skip
+    print(f"{ticks} simulation steps in {elapsed:.2f}s: {ticks / elapsed:,.0f} steps/s")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+import pygame
+from collections import OrderedDict
+from settings import TEXT_CACHE_SIZE
+
+
+class CachedFont(pygame.font.Font):
+    """Font whose rendered surfaces are shared through the Fonts cache.
+
+    The returned surfaces are shared, so copy one before changing its
+    alpha or drawing on it.
+    """
+
+    def __init__(self, name, size):
+        super().__init__(name, size)
+        self.key = (name, size)
+
+    def render(self, text, antialias, color, background=None):
+        return Fonts.render(self, text, antialias, color, background)
+
+
+class Fonts:
+    # Loaded fonts by (name, size)
+    _fonts = {}
+    # Rendered text by (font, text, antialias, color, background), oldest first
+    _text = OrderedDict()
+
+    max_entries = TEXT_CACHE_SIZE
+    hits = 0
+    misses = 0
+
+    @classmethod
+    def get(cls, size, name=None):
+        font = cls._fonts.get((name, size))
+        if font is None:
+            font = CachedFont(name, size)
+            cls._fonts[(name, size)] = font
+        return font
+
+    @classmethod
+    def render(cls, font, text, antialias, color, background=None):
+        key = (font.key, text, antialias, color, background)
+        surface = cls._text.get(key)
+        if surface is not None:
+            cls._text.move_to_end(key)
+            cls.hits += 1
+            return surface
+
+        cls.misses += 1
+        surface = pygame.font.Font.render(font, text, antialias, color, background)
+        cls._text[key] = surface
+        if len(cls._text) > cls.max_entries:
+            cls._text.popitem(last=False)
+        return surface
+
+    @classmethod
+    def get_stats(cls):
+        return {
+            "hits": cls.hits,
+            "misses": cls.misses,
+            "fonts": len(cls._fonts),
+            "entries": len(cls._text),
+        }
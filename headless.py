@@ -0,0 +1,81 @@
+"""Run kitchen shifts without a window, as fast as the CPU allows.
+
+    python headless.py --players 2 --shifts 5
+
+Input comes from a policy: a callable ``policy(kitchen, keys)`` that may
+change the held movement keys (a ``controls.KeyState``) and returns the
+(player_index, action) pairs to apply before the next simulation step.
+"""
+import os
+import sys
+import time
+import argparse
+
+# Must be set before pygame creates a window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from settings import *
+from controls import KeyState
+from kitchen import Kitchen
+
+
+def init():
+    # Image loading converts surfaces, which needs a display, even a dummy one
+    if not pygame.get_init():
+        pygame.init()
+    if pygame.display.get_surface() is None:
+        pygame.display.set_mode((1, 1))
+
+
+def idle_policy(kitchen, keys):
+    return ()
+
+
+def run_shift(num_players=1, perks=None, policy=idle_policy, duration=None, seed=None, helpers=0):
+    """Simulate one shift in SIM_DT steps and return the kitchen's stats."""
+    init()
+    kitchen = Kitchen(num_players, perks, seed, helpers)
+    if duration is not None:
+        kitchen.time_remaining = duration
+
+    keys = KeyState()
+    steps = 0
+    started = time.perf_counter()
+    while not kitchen.is_game_over():
+        for player_index, action in policy(kitchen, keys) or ():
+            kitchen.apply_action(player_index, action)
+        kitchen.update(SIM_DT, keys)
+        steps += 1
+
+    stats = kitchen.get_stats()
+    stats["seed"] = kitchen.seed
+    stats["steps"] = steps
+    stats["wall_time"] = time.perf_counter() - started
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run kitchen shifts headless")
+    parser.add_argument("--players", type=int, choices=(1, 2), default=1)
+    parser.add_argument("--shifts", type=int, default=1)
+    parser.add_argument("--duration", type=float, default=None,
+                        help="shift length in seconds (default: a full shift)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed of the first shift; later shifts count up from it")
+    parser.add_argument("--helpers", type=int, default=0,
+                        help="bot cooks working alongside the players")
+    args = parser.parse_args(argv)
+
+    for shift in range(args.shifts):
+        seed = args.seed + shift if args.seed is not None else None
+        stats = run_shift(args.players, duration=args.duration, seed=seed, helpers=args.helpers)
+        sim_time = stats["steps"] * SIM_DT
+        print(f"shift {shift + 1} (seed {stats['seed']}): score ${stats['score']}, {stats['orders_completed']} orders, "
+              f"{stats['steps']} steps in {stats['wall_time']:.3f}s "
+              f"({sim_time / stats['wall_time']:.0f}x real time)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
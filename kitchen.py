@@ -1,16 +1,44 @@
 import pygame
 import random
 from settings import *
-from sprites import Player, Customer, Cashier, DirtSpot, Mop, SpriteSheet, Pedestrian, Tenant, Storeboard, Bush
+from fonts import Fonts
+from sprites import Player, Customer, Cashier, DirtSpot, Mop, SpriteSheet, Pedestrian, Tenant, Storeboard, Bush, Item
 from stations import Cooler, Stove, Boiler, AssemblyTable, ServeCounter, MopStation, DiningTable, LongTable, IngredientTable, SauceStation, LettuceStation
-from orders import OrderManager
+from orders import OrderManager, Order
+from bots import ScriptedPolicy
+from timing import SimClock, Scheduler
+from render import StaticLayer, DirtyRects, DrawQueue, LAYER_WORLD
+from spatial import IndexedGroup, StaticColliders, center_box, collision_box, within
+import snapshot
+from controls import (event_actions, ACTION_INTERACT, ACTION_SERVE, ACTION_DROP,
+                      ACTION_COOLER_MEAT, ACTION_COOLER_SAUSAGE, ACTION_COOLER_CLOSE)
 
 
 class Kitchen:    
-    def __init__(self, num_players=1, perks=None):
+    def __init__(self, num_players=1, perks=None, seed=None, helpers=0):
         self.num_players = num_players
+        self.helpers = helpers
         self.perks = perks if perks else {}
         
+        # Every random draw and timestamp of the shift comes from these, so
+        # the same seed and inputs replay the same shift
+        self.seed = seed if seed is not None else random.randrange(1 << 32)
+        self.rng = random.Random(self.seed)
+        self.clock = SimClock()
+        
+        # Timed work (cooking, order spawns, messages) waits here instead of
+        # being polled every tick
+        self.scheduler = Scheduler(self.clock)
+        
+        # Optional replay.Recorder that sees every input the kitchen applies
+        self.recorder = None
+        
+        # Bot cooks after the human players; they act from the kitchen's own
+        # state, so a replay reproduces them without recording their input
+        self.helper_policy = None
+        if helpers:
+            self.helper_policy = ScriptedPolicy(range(num_players, num_players + helpers))
+        
         # Load floor tile
         self.floor_tile = SpriteSheet.load_image("tile_floor.jpg", (TILE_SIZE, TILE_SIZE))
         self.wood_floor_tile = SpriteSheet.load_image("tile2.png", (TILE_SIZE, TILE_SIZE))
@@ -22,17 +50,20 @@ class Kitchen:
         
         # Initialize sprite groups
         self.all_sprites = pygame.sprite.Group()
-        self.stations = pygame.sprite.Group()
         self.players = pygame.sprite.Group()
-        self.customers = pygame.sprite.Group()
-        self.dirt_spots = pygame.sprite.Group()
         self.dining_tables = pygame.sprite.Group()
         self.longtables = pygame.sprite.Group()
         self.pedestrians = pygame.sprite.Group()
         self.tenants = pygame.sprite.Group()
         self.storeboards = pygame.sprite.Group()
         self.bushes = pygame.sprite.Group()
-        self.mops = pygame.sprite.Group()  
+        
+        # What a player can reach is looked up on a grid: stations by their
+        # collision area, the rest by where they stand
+        self.stations = IndexedGroup(collision_box)
+        self.customers = IndexedGroup(center_box)
+        self.dirt_spots = IndexedGroup(center_box)
+        self.mops = IndexedGroup(center_box)
         
         # Create kitchen layout
         self._setup_stations()
@@ -44,23 +75,56 @@ class Kitchen:
         self._setup_bushes()
         self._setup_mops()
         
+        # Players collide with the furniture through a grid built once per layout
+        self.colliders = StaticColliders.for_layout(self.obstacle_rects())
+        
+        # Floor, road and furniture baked into one surface
+        self.background_layer = StaticLayer(self._collect_static_scenery,
+                                            area=(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT),
+                                            fill=DARK_BROWN)
+        self.draw_queue = DrawQueue()
+        
         # Order management
-        self.order_manager = OrderManager(num_players)
+        self.order_manager = OrderManager(num_players, self.rng, self.clock, self.scheduler)
         self.order_manager.on_new_order = self._on_new_order
         
         # Game state
         self.score = 0
         self.time_remaining = GAME_DURATION
         self.game_hour = 1
-        self.last_dirt_spawn = 0
+        
+        # Dirt appears once every game hour
+        self.next_dirt_at = self.clock.time + GAME_HOUR
+        self.scheduler.at(self.next_dirt_at, self._hourly_dirt)
         
         # Message display
         self.message = ""
-        self.message_timer = 0
+        self.message_expires_at = 0
+        self.message_event = None
         
         # Customer spawn position (near serve counter)
         self.customer_spawn_y = 0
         
+        # Helper bots search their paths now rather than on a tick mid-shift
+        if self.helper_policy:
+            self.helper_policy.prepare(self)
+        
+        # Every image the shift needs is cached now, so the originals can go
+        self._preload_images()
+        SpriteSheet.release_originals()
+        
+    def _preload_images(self):
+        variants = []
+        for filename in set(Item.ITEM_IMAGES.values()):
+            variants.append((filename, (ITEM_SIZE, ITEM_SIZE)))
+            variants.append((filename, (ITEM_SIZE - 8, ITEM_SIZE - 8)))
+        for filename in Order.IMAGE_FILES.values():
+            variants.append((filename, (40, 40)))
+            variants.append((filename, (30, 30)))
+        variants.append(("customer.png", (PLAYER_SIZE, PLAYER_SIZE)))
+        variants.append(("food_stain.png", (48, 48)))
+        SpriteSheet.preload(variants)
+        
     def _setup_stations(self):
         # shows menu on click Cooler for meat/sausage 
         self.cooler = Cooler(5, 68, ItemType.MEAT) 
@@ -83,15 +147,15 @@ class Kitchen:
         self.cooler_menu_player = None 
         
         # Stoves for meat and sausage
-        stove1 = Stove(125, 95)
-        stove2 = Stove(220, 95)
+        stove1 = Stove(125, 95, self.scheduler)
+        stove2 = Stove(220, 95, self.scheduler)
         self.stations.add(stove1, stove2)
         self.all_sprites.add(stove1, stove2)
         self.stoves = [stove1, stove2]
         
         # Boilers for pasta  
-        boiler1 = Boiler(325, 95)
-        boiler2 = Boiler(415, 95)
+        boiler1 = Boiler(325, 95, self.scheduler)
+        boiler2 = Boiler(415, 95, self.scheduler)
         self.stations.add(boiler1, boiler2)
         self.all_sprites.add(boiler1, boiler2)
         self.boilers = [boiler1, boiler2]
@@ -139,6 +203,12 @@ class Kitchen:
         # Track cooking stations for dirt spawning
         self.cooking_stations = self.stoves + self.boilers
         
+    def obstacle_rects(self):
+        # Stations, long tables and dining tables block players
+        return ([s.collision_rect for s in self.stations]
+                + [t.collision_rect for t in self.longtables]
+                + [t.collision_rect for t in self.dining_tables])
+    
     def _setup_players(self):
         # Apply speed perk if purchased
         speed_boost = self.perks.get("speed_boost", 0)
@@ -155,9 +225,17 @@ class Kitchen:
                            holding_boost=self.perks.get("holding_boost", 0))
             self.players.add(player2)
             self.all_sprites.add(player2)
+        
+        # Helpers start together beside the stoves and spread out from there
+        for i in range(self.helpers):
+            helper = Player(self.num_players + i + 1, 300, 200, speed_boost=speed_boost,
+                            holding_boost=self.perks.get("holding_boost", 0))
+            helper.heading = (0, 0)
+            self.players.add(helper)
+            self.all_sprites.add(helper)
     
     def _setup_cashier(self):
-        self.cashier = Cashier(500, 95)
+        self.cashier = Cashier(500, 95, self.scheduler)
     
     def _setup_pedestrians(self):
         road_start_x = SCREEN_WIDTH - 400  
@@ -235,6 +313,7 @@ class Kitchen:
         customer = Customer(
             target_x,
             self.serve_counter.rect.y + 20,
+            self.scheduler,
             order,
             line_position,
             available_table  
@@ -253,13 +332,18 @@ class Kitchen:
             if customer.line_position != i or customer.target_x != new_x:
                 customer.update_line_position(i, new_x)
     
+    def _hourly_dirt(self):
+        self._spawn_dirt()
+        self.next_dirt_at += GAME_HOUR
+        self.scheduler.at(self.next_dirt_at, self._hourly_dirt)
+    
     def _spawn_dirt(self):
         if len(self.dirt_spots) < MAX_DIRT_SPOTS and self.cooking_stations:
-            station = random.choice(self.cooking_stations)
+            station = self.rng.choice(self.cooking_stations)
             
             # Spawn dirt in front of station
-            dirt_x = station.rect.x + random.randint(-30, 30)
-            dirt_y = station.rect.bottom + random.randint(10, 50)
+            dirt_x = station.rect.x + self.rng.randint(-30, 30)
+            dirt_y = station.rect.bottom + self.rng.randint(10, 50)
             
             # Make sure it's in valid area
             dirt_y = min(dirt_y, SCREEN_HEIGHT - 100)
@@ -270,44 +354,43 @@ class Kitchen:
             
             self.show_message("Kitchen is getting dirty!")
     
-    def show_message(self, msg, duration=120):
+    def show_message(self, msg, duration=MESSAGE_DURATION):
         self.message = msg
-        self.message_timer = duration
+        self.message_expires_at = self.clock.time + duration
+        if self.message_event:
+            self.message_event.cancel()
+        self.message_event = self.scheduler.at(self.message_expires_at, self._clear_message)
+    
+    def _clear_message(self):
+        self.message = ""
+        self.message_event = None
     
     def handle_input(self, event):
-        if event.type == pygame.KEYDOWN:
+        for player_index, action in event_actions(event, self.num_players, self.show_cooler_menu):
+            self.apply_action(player_index, action)
+    
+    def apply_action(self, player_index, action):
+        # Keyboard, scripts and replays all act on the kitchen through here
+        if self.recorder:
+            self.recorder.record_action(player_index, action)
+        self._apply_action(player_index, action)
+    
+    def _apply_action(self, player_index, action):
+        if action in (ACTION_COOLER_MEAT, ACTION_COOLER_SAUSAGE):
             if self.show_cooler_menu:
-                if event.key == pygame.K_1:
-                    self._select_from_cooler(ItemType.MEAT, self.cooler_menu_player)
-                    self.show_cooler_menu = False
-                    self.cooler_menu_player = None
-                    return
-                elif event.key == pygame.K_2:
-                    self._select_from_cooler(ItemType.SAUSAGE, self.cooler_menu_player)
-                    self.show_cooler_menu = False
-                    self.cooler_menu_player = None
-                    return
-                elif event.key == pygame.K_ESCAPE:
-                    self.show_cooler_menu = False
-                    self.cooler_menu_player = None
-                    return
-            
-            # Player 1 controls
-            if event.key == pygame.K_SPACE:
-                self._player_interact(0)
-            elif event.key == pygame.K_e:
-                self._player_serve(0)
-            elif event.key == pygame.K_q:
-                self._player_drop(0)
-            
-            # Player 2 controls
-            if self.num_players == 2:
-                if event.key == pygame.K_RETURN:
-                    self._player_interact(1)
-                elif event.key == pygame.K_PERIOD:
-                    self._player_serve(1)
-                elif event.key == pygame.K_COMMA:
-                    self._player_drop(1)
+                item_type = ItemType.MEAT if action == ACTION_COOLER_MEAT else ItemType.SAUSAGE
+                self._select_from_cooler(item_type, self.cooler_menu_player)
+                self.show_cooler_menu = False
+                self.cooler_menu_player = None
+        elif action == ACTION_COOLER_CLOSE:
+            self.show_cooler_menu = False
+            self.cooler_menu_player = None
+        elif action == ACTION_INTERACT:
+            self._player_interact(player_index)
+        elif action == ACTION_SERVE:
+            self._player_serve(player_index)
+        elif action == ACTION_DROP:
+            self._player_drop(player_index)
     
     def _get_player(self, index):
         players_list = list(self.players)
@@ -320,12 +403,12 @@ class Kitchen:
         if not player:
             return
         
+        center = player.rect.center
+        
         # Check for mop pickup 
-        for mop in self.mops:
+        for mop in self.mops.near(center, INTERACT_DISTANCE):
             if not mop.is_held:
-                distance = ((mop.rect.centerx - player.rect.centerx) ** 2 + 
-                           (mop.rect.centery - player.rect.centery) ** 2) ** 0.5
-                if distance < 80:
+                if within(mop.rect.center, center, INTERACT_DISTANCE):
                     if player.pickup_mop(mop):
                         mop.is_held = True
                         mop.holder = player  
@@ -334,10 +417,8 @@ class Kitchen:
         
         # Check for dirt cleaning with mop
         if player.holding_mop:
-            for dirt in self.dirt_spots:
-                distance = ((dirt.rect.centerx - player.rect.centerx) ** 2 + 
-                           (dirt.rect.centery - player.rect.centery) ** 2) ** 0.5
-                if distance < 80:
+            for dirt in self.dirt_spots.near(center, INTERACT_DISTANCE):
+                if within(dirt.rect.center, center, INTERACT_DISTANCE):
                     # Start cleaning animation
                     if player.start_cleaning():
                         # Remove dirt after animation completes
@@ -346,14 +427,17 @@ class Kitchen:
                         self.show_message(f"+${reward} for cleaning!")
                         return
         
+        # Only stations whose cells the player stands in can be touching them
+        nearby = self.stations.overlapping(player.rect)
+        
         # Check for cooler interaction (show menu)
-        if self.cooler.can_interact(player):
+        if self.cooler in nearby and self.cooler.can_interact(player):
             self.show_cooler_menu = True
             self.cooler_menu_player = player_index  
             return
         
         # Check for other station interactions
-        for station in self.stations:
+        for station in nearby:
             if station != self.cooler and station.can_interact(player):
                 success, msg = station.interact(player)
                 if msg:
@@ -379,12 +463,10 @@ class Kitchen:
             return
         
         # Check if near a customer at dining table
-        for customer in self.customers:
+        center = player.rect.center
+        for customer in self.customers.near(center, INTERACT_DISTANCE):
             if customer.state == "sitting":
-                distance = ((customer.rect.centerx - player.rect.centerx) ** 2 + 
-                           (customer.rect.centery - player.rect.centery) ** 2) ** 0.5
-                
-                if distance < 80:  
+                if within(customer.rect.center, center, INTERACT_DISTANCE):
                     if customer.can_receive_delivery(held_dish.item_type):
                         success, reward, completed_order = self.order_manager.try_fulfill_order(held_dish.item_type)
                         if success:
@@ -428,6 +510,7 @@ class Kitchen:
                 mop.rect.y = player.rect.y + player.rect.height
                 mop.is_held = False
                 mop.holder = None  
+                self.mops.moved(mop)
                 self.show_message("Dropped mop")
                 return
         
@@ -452,7 +535,8 @@ class Kitchen:
         else:
             self.show_message("Hands full!")
     
-    def update(self, dt):
+    def update(self, dt, keys=None):
+        self.clock.advance(dt)
         self.time_remaining -= dt
         if self.time_remaining < 0:
             self.time_remaining = 0
@@ -461,34 +545,39 @@ class Kitchen:
         elapsed = GAME_DURATION - self.time_remaining
         self.game_hour = min(6, int(elapsed // GAME_HOUR) + 1)
         
-        # Spawn dirt every game hour
-        current_dirt_time = int(elapsed // GAME_HOUR)
-        if current_dirt_time > self.last_dirt_spawn:
-            self.last_dirt_spawn = current_dirt_time
-            self._spawn_dirt()
+        # Positions at the start of this tick, for render interpolation
+        for sprite in self._moving_sprites():
+            sprite.prev_pos.update(sprite.pos)
         
-        # Get pressed keys
-        keys = pygame.key.get_pressed()
+        # Held keys come from the keyboard unless a script supplies them
+        if keys is None:
+            keys = pygame.key.get_pressed()
+        if self.recorder:
+            self.recorder.record_tick(keys)
         
-        # Include stations, long tables, and dining tables as obstacles
-        obstacles = [s for s in self.stations] + list(self.longtables) + list(self.dining_tables)
-        for player in self.players:
-            player.update(keys, obstacles)
+        if self.helper_policy:
+            for player_index, action in self.helper_policy(self, keys):
+                self._apply_action(player_index, action)
         
-        # Update cooking stations
-        for station in self.stations:
-            station.update(dt)
+        for player in self.players:
+            player.update(keys, self.colliders, dt)
         
         # Update mops
         for mop in self.mops:
             mop.update()
+            if mop.is_held:
+                self.mops.moved(mop)
         
-        # Update orders
+        # Update orders, then fire everything due by now: cooking done,
+        # new orders, customers finishing, messages expiring
         self.order_manager.update(dt, self.time_remaining)
+        self.scheduler.run()
         
-        # Update customers with dt
+        # Update customers with dt; seated and queued ones wait on events
         for customer in self.customers:
-            customer.update(dt)
+            if customer.state not in Customer.IDLE_STATES:
+                customer.update(dt)
+                self.customers.moved(customer)
         
         # Update pedestrians
         for pedestrian in self.pedestrians:
@@ -496,77 +585,85 @@ class Kitchen:
         
         # Update customer line positions
         self._update_customer_line()
-        
-        # Update cashier
-        self.cashier.update()
-        
-        # Update message timer
-        if self.message_timer > 0:
-            self.message_timer -= 1
-            if self.message_timer <= 0:
-                self.message = ""
     
-    def draw(self, screen):
+    def _moving_sprites(self):
+        return [*self.players, *self.customers, *self.pedestrians]
+    
+    def _collect_static_scenery(self):
+        blits = []
         dining_area_x = 600 
         
         for x in range(0, SCREEN_WIDTH, TILE_SIZE):
             for y in range(70, SCREEN_HEIGHT, TILE_SIZE):
                 if x >= dining_area_x:
-                    screen.blit(self.wood_floor_tile, (x, y))
+                    blits.append((self.wood_floor_tile, (x, y)))
                 else:
-                    screen.blit(self.floor_tile, (x, y))
+                    blits.append((self.floor_tile, (x, y)))
         
-        # Draw road on top of wood floor 
+        # Road on top of wood floor 
         road_x = SCREEN_WIDTH - 260  
         road_y = 120  
-        screen.blit(self.road_image, (road_x, road_y))
+        blits.append((self.road_image, (road_x, road_y)))
+        
+        # Counters and decorations never move once placed; dining tables are
+        # depth sorted with the people around them instead
+        for group in self._static_groups():
+            for sprite in group:
+                blits.append((sprite.image, sprite.rect))
+        return blits
+    
+    def _static_groups(self):
+        return (self.longtables, self.tenants, self.storeboards, self.bushes)
+    
+    def _static_layout_key(self):
+        return tuple((id(sprite.image), tuple(sprite.rect))
+                     for group in self._static_groups() for sprite in group)
+    
+    def draw(self, screen, alpha=1.0):
+        # Floor, road, counters and decorations in a single blit
+        self.background_layer.draw(screen, self._static_layout_key())
         
-        # Draw dining tables 
-        for table in self.dining_tables:
-            screen.blit(table.image, table.rect)
-
-         # Draw long tables
-        for longtable in self.longtables:
-            screen.blit(longtable.image, longtable.rect)
-
-        # Draw stations
+        # Draw moving sprites between their last two simulated positions
+        moving = self._moving_sprites()
+        for sprite in moving:
+            sprite.interpolate(alpha)
+        
+        queue = self.draw_queue
         for station in self.stations:
-            station.draw(screen)
+            station.submit_draw(queue)
+            DirtyRects.track(station)
+        
+        for table in self.dining_tables:
+            queue.submit(table.image, table.rect, LAYER_WORLD, table.rect.bottom)
         
-        # Draw dirt spots
         for dirt in self.dirt_spots:
-            screen.blit(dirt.image, dirt.rect)
+            dirt.submit_draw(queue)
+            DirtyRects.track(dirt)
         
-        # Draw mops (not being held)
+        # Mops (not being held)
         for mop in self.mops:
-            mop.draw(screen)
+            mop.submit_draw(queue)
+            DirtyRects.track(mop)
         
-        # Draw customers
         for customer in self.customers:
-            customer.draw(screen)
-        
-        # Draw tenants (decorations)
-        for tenant in self.tenants:
-            tenant.draw(screen)
-        
-        # Draw storeboards (decorations)
-        for storeboard in self.storeboards:
-            storeboard.draw(screen)
-        
-        # Draw bushes (decorations)
-        for bush in self.bushes:
-            bush.draw(screen)
+            customer.submit_draw(queue)
+            DirtyRects.track(customer)
         
-        # Draw pedestrians
         for pedestrian in self.pedestrians:
-            pedestrian.draw(screen)
+            pedestrian.submit_draw(queue)
+            DirtyRects.track(pedestrian)
         
-        # Draw cashier
-        self.cashier.draw(screen)
+        self.cashier.submit_draw(queue)
+        DirtyRects.track(self.cashier)
         
-        # Draw players 
         for player in self.players:
-            player.draw(screen)
+            player.submit_draw(queue)
+            DirtyRects.track(player)
+        
+        # Everything above goes out sorted by layer and depth
+        queue.flush(screen)
+        for sprite in moving:
+            sprite.sync_rect()
         
         # Draw cooler menu if active
         if self.show_cooler_menu:
@@ -589,13 +686,13 @@ class Kitchen:
         screen.blit(s, (box_x, box_y))
         
         # Title
-        big_font = pygame.font.Font(None, 60)
+        big_font = Fonts.get(60)
         title = big_font.render("COOLER", True, (255, 240, 180))
         screen.blit(title, (WIDTH//2 - title.get_width()//2, box_y + 25))
         pygame.draw.line(screen, (255, 220, 120), (box_x + 50, box_y + 75), (box_x + box_width - 50, box_y + 75), 2)
         
         # Menu options
-        font = pygame.font.Font(None, 36)
+        font = Fonts.get(36)
         opt1 = font.render("1 Meat", True, (220, 220, 220))
         opt2 = font.render("2 Sausage", True, (220, 220, 220))
         screen.blit(opt1, (WIDTH//2 - opt1.get_width()//2, box_y + 110))
@@ -609,13 +706,16 @@ class Kitchen:
         glow_surface = pygame.Surface((box_width, box_height), pygame.SRCALPHA)
         pygame.draw.rect(glow_surface, (255, 240, 180, 40), (0, 0, box_width, box_height), border_radius=20)
         screen.blit(glow_surface, (box_x, box_y))
+        
+        DirtyRects.report((self, "cooler_menu"), (box_x - 5, box_y, box_width + 10, box_height + 10))
     
     def draw_orders(self, screen):
         self.order_manager.draw(screen, 0, 0)  
     
     def get_message(self):
-        if self.message_timer > 0:
-            alpha = min(255, self.message_timer * 4)
+        if self.message:
+            remaining = self.message_expires_at - self.clock.time
+            alpha = min(255, int(remaining * MESSAGE_FADE_RATE))
             return self.message, alpha
         return None, 0
     
@@ -628,5 +728,24 @@ class Kitchen:
             'time_remaining': self.time_remaining,
             'game_hour': self.game_hour,
             'orders_completed': self.order_manager.total_completed,
+            'orders_spawned': self.order_manager.total_spawned,
             'total_reward': self.order_manager.total_reward
         }
+    
+    def snapshot(self):
+        # Everything needed to resume the shift, as compact bytes
+        return snapshot.save(self)
+    
+    def restore(self, data):
+        # Back to a snapshot of this kitchen or one with the same players and perks
+        snapshot.load(self, data)
+        self.customers.reindex()
+        self.mops.reindex()
+        DirtyRects.invalidate()
+    
+    @classmethod
+    def from_snapshot(cls, data):
+        seed, num_players, helpers, perks = snapshot.read_header(data)
+        kitchen = cls(num_players, perks, seed, helpers)
+        kitchen.restore(data)
+        return kitchen
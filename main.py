@@ -1,10 +1,17 @@
 import pygame
+import os
 import sys
+import time
 from settings import *
 from ui import GameUI, MainMenu, PlayerSelectMenu, HowToPlayScreen, HighScoreScreen, GameOverScreen
 from kitchen import Kitchen
 from highscore import HighScoreManager
 from store import GameSession
+from render import DirtyRects
+from timing import FramePacer, create_display
+from controls import ACTION_COOLER_CLOSE, REWIND_KEY, SPEED_KEYS
+from replay import Recorder, Replay
+from rewind import RewindBuffer
 
 
 class Game:    
@@ -12,10 +19,11 @@ class Game:
         pygame.init()
         pygame.mixer.init()
         
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.screen = create_display((SCREEN_WIDTH, SCREEN_HEIGHT), VSYNC)
         pygame.display.set_caption(TITLE)
         
         self.clock = pygame.time.Clock()
+        self.pacer = FramePacer(self.clock)
         self.running = True
         
         # Game state
@@ -36,25 +44,65 @@ class Game:
         self.kitchen = None
         self.game_over_screen = None
         
+        # Fixed-step simulation: leftover frame time and how far into the next tick we are
+        self.sim_accumulator = 0.0
+        self.sim_alpha = 1.0
+        
+        # Input recording of the current shift, or the recording being played back
+        self.recorder = None
+        self.replay = None
+        
+        # Simulated seconds per real second; above 1 frames are skipped, not steps
+        self.time_scale = 1.0
+        self.last_draw_time = 0.0
+        
+        # Recent states, for scrubbing back and for dumps around frame spikes
+        self.rewind = None
+        self.scrubbing = False
+        self.scrub_accumulator = 0.0
+        self.last_spike_tick = None
+        
+        # Optional dirty-rect presentation
+        DirtyRects.enabled = DIRTY_RECT_RENDERING
+        DirtyRects.flip_ratio = DIRTY_RECT_FLIP_RATIO
+        self.presented_state = None
+        
+        # What the last presented frame showed; unchanged screens are not redrawn
+        self.drawn_frame = None
+        
     def run(self):
         while self.running:
-            dt = self.clock.tick(FPS) / 1000.0  
+            events, dt = self.pacer.next_frame(self.state)
+            self._check_spike()
             
-            self._handle_events()
-            self._update(dt)
-            self._draw()
+            self._handle_events(events)
+            if not self.pacer.paused:
+                self._update(dt)
             
-            pygame.display.flip()
+            frame = self._frame_key()
+            if self._draw_due() and (frame is None or frame != self.drawn_frame):
+                self._draw()
+                self._present()
+                self.drawn_frame = frame
         
+        self._save_recording()
+        if FRAME_STATS:
+            self.pacer.report()
         pygame.quit()
         sys.exit()
     
-    def _handle_events(self):
-        for event in pygame.event.get():
+    def _handle_events(self, events):
+        for event in events:
             if event.type == pygame.QUIT:
                 self.running = False
                 return
             
+            self.pacer.handle_event(event)
+            
+            if event.type == pygame.WINDOWEXPOSED:
+                DirtyRects.invalidate()
+                self.drawn_frame = None
+            
             if self.state == "menu":
                 result = self.main_menu.handle_input(event)
                 if result == "Start Game":
@@ -96,13 +144,20 @@ class Game:
                     if event.key == pygame.K_ESCAPE:
                         # Check if cooler menu is open first
                         if self.kitchen.show_cooler_menu:
-                            self.kitchen.show_cooler_menu = False
-                            self.kitchen.cooler_menu_player = None
+                            self.kitchen.apply_action(None, ACTION_COOLER_CLOSE)
                         else:
                             # Only return to menu if cooler menu is not open
+                            self._save_recording()
                             self.state = "menu"
+                            if self.replay:
+                                self.running = False
                         return
-                self.kitchen.handle_input(event)
+                    if SPEED_KEYS_ENABLED and event.key in SPEED_KEYS:
+                        self.set_time_scale(SPEED_KEYS[event.key])
+                        continue
+                # A replay supplies its own input
+                if not self.replay:
+                    self.kitchen.handle_input(event)
                 
             elif self.state == "game_over":
                 result = self.game_over_screen.handle_input(event)
@@ -127,18 +182,141 @@ class Game:
                     self.state = "menu"
     
     def _start_game(self):
-        self.kitchen = Kitchen(self.num_players, self.game_session.get_perks())
+        helpers = SOLO_HELPERS if self.num_players == 1 else 0
+        self.kitchen = Kitchen(self.num_players, self.game_session.get_perks(), helpers=helpers)
+        if RECORD_REPLAYS:
+            self.recorder = Recorder(self.kitchen)
+            self.kitchen.recorder = self.recorder
+        self._reset_rewind()
+        self.time_scale = 1.0
         self.state = "playing"
+        self.sim_accumulator = 0.0
+        self.sim_alpha = 1.0
+    
+    def start_replay(self, recording, rate=1.0):
+        # Play a recorded shift in place of keyboard input, at any speed
+        self.num_players = recording.num_players
+        self.kitchen = recording.new_kitchen()
+        self.replay = Replay(recording)
+        self.time_scale = rate
+        self._reset_rewind()
+        self.state = "playing"
+        self.sim_accumulator = 0.0
+        self.sim_alpha = 1.0
+    
+    def _save_recording(self):
+        if self.recorder is None:
+            return
+        name = time.strftime("shift-%Y%m%d-%H%M%S") + f"-{self.kitchen.seed}.tkr"
+        path = self.recorder.save(os.path.join(REPLAY_DIR, name))
+        print(f"Saved replay {path}")
+        self.kitchen.recorder = None
+        self.recorder = None
+    
+    def set_time_scale(self, scale):
+        # Cooking, spawns and movement still advance in SIM_DT steps, just more per frame
+        if scale <= 0:
+            raise ValueError("time scale must be positive")
+        self.time_scale = scale
+    
+    def _draw_due(self):
+        # Above real time the frame budget goes to simulation steps and the
+        # screen refreshes only FAST_FORWARD_DRAW_FPS times a second
+        if self.state != "playing" or self.time_scale <= 1:
+            return True
+        now = time.perf_counter()
+        if now - self.last_draw_time < 1.0 / FAST_FORWARD_DRAW_FPS:
+            return False
+        self.last_draw_time = now
+        return True
+    
+    def _reset_rewind(self):
+        self.rewind = RewindBuffer() if REWIND_ENABLED or SPIKE_DUMP_MS else None
+        self.scrubbing = False
+        self.last_spike_tick = None
+    
+    def _scrub(self, dt):
+        # Holding the rewind key moves through the buffer instead of simulating
+        held = (REWIND_ENABLED and self.rewind is not None and not self.replay
+                and pygame.key.get_pressed()[REWIND_KEY])
+        if not held:
+            if self.scrubbing:
+                # Play on from the frame on screen
+                self.scrubbing = False
+                self.rewind.resume()
+                self.sim_accumulator = 0.0
+            return False
+        
+        if not self.scrubbing:
+            self.scrubbing = True
+            self.scrub_accumulator = 0.0
+            # A recording cannot follow the shift back in time, so it ends here
+            self._save_recording()
+            self.rewind.capture(self.kitchen)
+        
+        forward = pygame.key.get_mods() & pygame.KMOD_SHIFT
+        self.scrub_accumulator += dt * REWIND_SCRUB_RATE
+        frame_time = self.rewind.interval * SIM_DT
+        frame = None
+        while self.scrub_accumulator >= frame_time:
+            self.scrub_accumulator -= frame_time
+            step = self.rewind.step_forward() if forward else self.rewind.step_back()
+            if step is None:
+                self.scrub_accumulator = 0.0
+                break
+            frame = step
+        if frame is not None:
+            self.kitchen.restore(frame)
+        self.sim_alpha = 1.0
+        return True
+    
+    def _check_spike(self):
+        # Save the seconds before a long gameplay frame for rewind.py
+        if not SPIKE_DUMP_MS or self.state != "playing" or self.rewind is None:
+            return
+        if self.pacer.last_frame_ms <= SPIKE_DUMP_MS or not len(self.rewind):
+            return
+        
+        # At most one dump per buffer's worth of play
+        ticks = self.kitchen.clock.ticks
+        if self.last_spike_tick is not None and ticks - self.last_spike_tick < REWIND_SECONDS * SIM_HZ:
+            return
+        self.last_spike_tick = ticks
+        name = time.strftime("spike-%Y%m%d-%H%M%S") + f"-{ticks}.tkrw"
+        path = self.rewind.dump(os.path.join(SPIKE_DIR, name))
+        print(f"Frame took {self.pacer.last_frame_ms:.0f} ms, saved {path}")
     
     def _update(self, dt):
         if self.state == "playing":
-            self.kitchen.update(dt)
+            if self._scrub(dt):
+                return
             
-            # Check for game over
-            if self.kitchen.is_game_over():
-                self._end_game()
+            # Run as many whole simulation steps as this frame covers
+            self.sim_accumulator += dt * self.time_scale
+            while self.sim_accumulator >= SIM_DT:
+                if self.replay:
+                    self.replay.step(self.kitchen)
+                else:
+                    self.kitchen.update(SIM_DT)
+                self.sim_accumulator -= SIM_DT
+                if self.rewind is not None:
+                    self.rewind.tick(self.kitchen)
+                
+                # Check for game over
+                if self.kitchen.is_game_over() or self.replay and self.replay.finished:
+                    self._end_game()
+                    return
+            self.sim_alpha = self.sim_accumulator / SIM_DT
+        elif self.state == "store":
+            self.game_session.store.update(dt)
     
     def _end_game(self):
+        # Playing a recording back leaves scores and money alone
+        if self.replay:
+            self.running = False
+            return
+        self._save_recording()
+        
         final_score = self.kitchen.score
         is_high_score = self.high_score_manager.add_score(final_score, self.num_players)
         
@@ -153,6 +331,21 @@ class Game:
         )
         self.state = "game_over"
     
+    def _frame_key(self):
+        # Gameplay changes every frame; menus only when their view state does
+        screens = {
+            "menu": self.main_menu,
+            "player_select": self.player_select,
+            "how_to_play": self.how_to_play,
+            "high_scores": self.high_score_screen,
+            "game_over": self.game_over_screen,
+            "store": self.game_session.store,
+        }
+        screen = screens.get(self.state)
+        if screen is None:
+            return None
+        return (self.state, screen, screen.view_state())
+    
     def _draw(self):
         if self.state == "menu":
             self.main_menu.draw()
@@ -173,17 +366,31 @@ class Game:
             self.game_over_screen.draw()
             
         elif self.state == "store":
-            # Draw last gameplay frame as background
-            self._draw_gameplay()
+            # Last gameplay frame as background, until the store has kept a copy
+            if self.game_session.store.backdrop is None:
+                self._draw_gameplay()
             # Draw store overlay
             self.game_session.store.draw(self.screen)
     
-    def _draw_gameplay(self):
-        # Clear screen
-        self.screen.fill(DARK_BROWN)
+    def _present(self):
+        if not DirtyRects.enabled:
+            pygame.display.flip()
+            return
+        
+        # A different screen shares nothing with the last one
+        if self.state != self.presented_state:
+            self.presented_state = self.state
+            DirtyRects.invalidate()
         
-        # Draw kitchen 
-        self.kitchen.draw(self.screen)
+        dirty = DirtyRects.collect(self.screen.get_rect())
+        if dirty is None:
+            pygame.display.flip()
+        elif dirty:
+            pygame.display.update(dirty)
+    
+    def _draw_gameplay(self):
+        # Draw kitchen (its background layer covers the whole screen)
+        self.kitchen.draw(self.screen, self.sim_alpha)
         
         # Draw UI top bar
         stats = self.kitchen.get_stats()
@@ -208,6 +415,9 @@ class Game:
         message, alpha = self.kitchen.get_message()
         if message:
             self.ui.draw_message(message, alpha)
+        
+        if self.time_scale != 1:
+            self.ui.draw_time_scale(self.time_scale)
 
 
 def main():
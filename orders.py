@@ -1,15 +1,18 @@
 import pygame
 import random
-import time
 from settings import *
+from fonts import Fonts
+from render import DirtyRects
+from timing import SimClock, Scheduler
 
 
 class Order:
-    def __init__(self, dish_type, order_id):
+    def __init__(self, dish_type, order_id, clock):
         self.dish_type = dish_type
         self.order_id = order_id
+        self.clock = clock
         self.completed = False
-        self.timestamp = time.time()
+        self.timestamp = clock.time
         self.completion_time = None
         
         recipe = RECIPES.get(dish_type, {})
@@ -17,30 +20,34 @@ class Order:
         self.name = recipe.get("name", "Unknown")
         
         self.image = self._load_image()
-        self.wait_time = 0
         
         # Link to customer and dining table
         self.customer = None
         self.dining_table = None
         
+    IMAGE_FILES = {
+        ItemType.BURGER: "burger.png",
+        ItemType.HOTDOG: "hot dog.png",
+        ItemType.PASTA_DISH: "boiled_pasta.png",
+        ItemType.SALAD_DISH: "salad.png"
+    }
+    
     def _load_image(self):
+        return self.get_image((40, 40))
+    
+    def get_image(self, size):
         from sprites import SpriteSheet
-        image_files = {
-            ItemType.BURGER: "burger.png",
-            ItemType.HOTDOG: "hot dog.png",
-            ItemType.PASTA_DISH: "boiled_pasta.png",
-            ItemType.SALAD_DISH: "salad.png"
-        }
-        filename = image_files.get(self.dish_type, "burger.png")
-        return SpriteSheet.load_image(filename, (40, 40))
-    
-    def update(self, dt):
-        if not self.completed:
-            self.wait_time += dt
-                
+        filename = self.IMAGE_FILES.get(self.dish_type, "burger.png")
+        return SpriteSheet.load_image(filename, size)
+    
+    @property
+    def wait_time(self):
+        end = self.completion_time if self.completed else self.clock.time
+        return end - self.timestamp
+    
     def complete(self):
         self.completed = True
-        self.completion_time = time.time()
+        self.completion_time = self.clock.time
         return self.reward
     
     def get_wait_time_str(self):
@@ -50,19 +57,27 @@ class Order:
 
 
 class CompletedOrder:
-    def __init__(self, order_name, reward, dish_image):
+    DISPLAY_DURATION = 3.0
+    
+    def __init__(self, order_name, reward, dish_image, clock):
         self.order_name = order_name
         self.reward = reward
         self.dish_image = dish_image
-        self.display_timer = 3.0
-        
-    def update(self, dt):
-        self.display_timer -= dt
-        return self.display_timer > 0
+        self.clock = clock
+        self.expires_at = clock.time + self.DISPLAY_DURATION
+    
+    @property
+    def display_timer(self):
+        return self.expires_at - self.clock.time
 
 
 class OrderManager:
-    def __init__(self, num_players=1):
+    def __init__(self, num_players=1, rng=None, clock=None, scheduler=None):
+        # Shared with the kitchen so a seed reproduces the whole shift
+        self.rng = rng if rng else random.Random()
+        self.clock = clock if clock else SimClock()
+        self.scheduler = scheduler if scheduler is not None else Scheduler(self.clock)
+        
         self.orders = []
         self.completed_orders = []
         self.all_completed = []
@@ -70,7 +85,9 @@ class OrderManager:
         self.orders_per_hour = ORDERS_PER_HOUR_SINGLE if num_players == 1 else ORDERS_PER_HOUR_MULTI
         
         self.spawn_interval = GAME_HOUR / self.orders_per_hour
-        self.spawn_timer = 0
+        self.taking_orders = True
+        self.next_spawn_at = self.clock.time + self.spawn_interval
+        self.scheduler.at(self.next_spawn_at, self._spawn_due)
         self.total_spawned = 0
         self.order_counter = 0
         
@@ -82,17 +99,21 @@ class OrderManager:
         self.on_new_order = None
         self.on_order_complete = None
         
-    def update(self, dt, game_time_remaining):
-        for order in self.orders:
-            order.update(dt)
+        # Composed order cards by order_id: (tier, wait string, card)
+        self.cards = {}
+        self.card_bases = {}
         
-        self.completed_orders = [co for co in self.completed_orders if co.update(dt)]
-        
-        if game_time_remaining > 10:
-            self.spawn_timer += dt
-            if self.spawn_timer >= self.spawn_interval:
-                self.spawn_timer = 0
-                self._spawn_order()
+    def update(self, dt, game_time_remaining):
+        # Timers live in the scheduler; the shift only says when to stop taking orders
+        self.taking_orders = game_time_remaining > 10
+    
+    def _spawn_due(self):
+        if not self.taking_orders:
+            self.next_spawn_at = None
+            return
+        self._spawn_order()
+        self.next_spawn_at += self.spawn_interval
+        self.scheduler.at(self.next_spawn_at, self._spawn_due)
     
     def _spawn_order(self):
         max_active = 8 if self.num_players == 1 else 12
@@ -100,8 +121,8 @@ class OrderManager:
         
         if len(active_orders) < max_active:
             self.order_counter += 1
-            dish_type = random.choice(self.dish_types)
-            new_order = Order(dish_type, self.order_counter)
+            dish_type = self.rng.choice(self.dish_types)
+            new_order = Order(dish_type, self.order_counter, self.clock)
             self.orders.append(new_order)
             self.total_spawned += 1
             
@@ -115,8 +136,9 @@ class OrderManager:
                 self.total_reward += reward
                 self.total_completed += 1
                 
-                completed = CompletedOrder(order.name, reward, order.image)
+                completed = CompletedOrder(order.name, reward, order.image, self.clock)
                 self.completed_orders.append(completed)
+                self.scheduler.at(completed.expires_at, self._expire_completed, completed)
                 self.all_completed.append(order)
                 
                 self.orders.remove(order)
@@ -128,12 +150,14 @@ class OrderManager:
         
         return False, 0, None
     
+    def _expire_completed(self, completed):
+        self.completed_orders.remove(completed)
+    
     def get_active_orders(self):
         return [o for o in self.orders if not o.completed]
     
     def draw(self, screen, x, y, max_display=4):
-        font = pygame.font.Font(None, 18)
-        small_font = pygame.font.Font(None, 16)
+        font = Fonts.get(18)
         
         active_orders = self.get_active_orders()
         active_orders.sort(key=lambda o: o.wait_time, reverse=True)
@@ -142,53 +166,88 @@ class OrderManager:
         order_height = 55  
         start_x = 320
         
-        for i, order in enumerate(active_orders[:max_display]):
+        shown = active_orders[:max_display]
+        for i, order in enumerate(shown):
             order_x = start_x + i * (order_width + 5)
-            order_y = 8
-            
-            if order.wait_time > 60:
-                bg_color = (150, 60, 60)
-            elif order.wait_time > 30:
-                bg_color = (150, 120, 60)
-            else:
-                bg_color = (60, 100, 60)
-            
-            order_rect = pygame.Rect(order_x, order_y, order_width, order_height)
-            pygame.draw.rect(screen, bg_color, order_rect, border_radius=5)
-            pygame.draw.rect(screen, WHITE, order_rect, 2, border_radius=5)
-            
-            num_text = small_font.render(f"#{order.order_id}", True, LIGHT_GRAY)
-            screen.blit(num_text, (order_x + 5, order_y + 3))
-            
-            name_text = font.render(order.name.upper(), True, WHITE)
-            name_rect = name_text.get_rect(centerx=order_x + order_width//2, top=order_y + 3)
-            screen.blit(name_text, name_rect)
-            
-            wait_text = small_font.render(order.get_wait_time_str(), True, YELLOW)
-            wait_rect = wait_text.get_rect(right=order_x + order_width - 5, top=order_y + 3)
-            screen.blit(wait_text, wait_rect)
-            
-            img_x = order_x + order_width//2 - 15
-            img_y = order_y + 18
-            small_img = pygame.transform.scale(order.image, (30, 30))
-            screen.blit(small_img, (img_x, img_y))
+            screen.blit(self._get_card(order), (order_x, 8))
+        
+        # Forget cards for orders that left the bar
+        if len(self.cards) > len(shown):
+            shown_ids = {order.order_id for order in shown}
+            for order_id in [oid for oid in self.cards if oid not in shown_ids]:
+                del self.cards[order_id]
+                self.card_bases.pop(order_id, None)
         
         if len(active_orders) > max_display:
             more_x = start_x + max_display * (order_width + 5)
             more_text = font.render(f"+{len(active_orders) - max_display} more", True, YELLOW)
             screen.blit(more_text, (more_x, 25))
         
+        if DirtyRects.enabled:
+            cards = tuple((o.order_id, o.get_wait_time_str(), o.wait_time > 30, o.wait_time > 60)
+                          for o in active_orders[:max_display])
+            DirtyRects.report((self, "cards"), (start_x, 0, max_display * (order_width + 5) + 100, 8 + order_height),
+                              (cards, len(active_orders)))
+        
         self._draw_completed_orders(screen)
         self._draw_stats(screen)
     
+    def _get_card(self, order):
+        if order.wait_time > 60:
+            tier = 2
+        elif order.wait_time > 30:
+            tier = 1
+        else:
+            tier = 0
+        wait_str = order.get_wait_time_str()
+        
+        cached = self.cards.get(order.order_id)
+        if cached and cached[0] == tier and cached[1] == wait_str:
+            return cached[2]
+        
+        # Only the wait time is patched onto the card base for this tier
+        base = self.card_bases.get(order.order_id)
+        if base is None or base[0] != tier:
+            base = (tier, self._compose_card_base(order, tier))
+            self.card_bases[order.order_id] = base
+        card = base[1].copy()
+        wait_text = Fonts.get(16).render(wait_str, True, YELLOW)
+        card.blit(wait_text, wait_text.get_rect(right=card.get_width() - 5, top=3))
+        
+        self.cards[order.order_id] = (tier, wait_str, card)
+        return card
+    
+    CARD_COLORS = ((60, 100, 60), (150, 120, 60), (150, 60, 60))
+    
+    def _compose_card_base(self, order, tier):
+        order_width = 120
+        order_height = 55
+        card = pygame.Surface((order_width, order_height), pygame.SRCALPHA)
+        
+        order_rect = card.get_rect()
+        pygame.draw.rect(card, self.CARD_COLORS[tier], order_rect, border_radius=5)
+        pygame.draw.rect(card, WHITE, order_rect, 2, border_radius=5)
+        
+        num_text = Fonts.get(16).render(f"#{order.order_id}", True, LIGHT_GRAY)
+        card.blit(num_text, (5, 3))
+        
+        name_text = Fonts.get(18).render(order.name.upper(), True, WHITE)
+        card.blit(name_text, name_text.get_rect(centerx=order_width//2, top=3))
+        
+        card.blit(order.get_image((30, 30)), (order_width//2 - 15, 18))
+        return card
+    
     def _draw_completed_orders(self, screen):
         if not self.completed_orders:
             return
         
-        font = pygame.font.Font(None, 28)
-        small_font = pygame.font.Font(None, 22)
+        font = Fonts.get(28)
+        small_font = Fonts.get(22)
         
         y = 75
+        if DirtyRects.enabled:
+            shown = tuple((co.order_name, co.reward, min(255, int(co.display_timer * 85))) for co in self.completed_orders)
+            DirtyRects.report((self, "completed"), (SCREEN_WIDTH // 2 - 100, y, 200, 45 * len(shown)), shown)
         for co in self.completed_orders:
             alpha = min(255, int(co.display_timer * 85))
             
@@ -212,11 +271,12 @@ class OrderManager:
             y += 45
     
     def _draw_stats(self, screen):
-        font = pygame.font.Font(None, 20)
+        font = Fonts.get(20)
         stats_text = f"Completed: {self.total_completed} | Total: ${self.total_reward}"
         text_surface = font.render(stats_text, True, LIGHT_GRAY)
         text_rect = text_surface.get_rect(right=SCREEN_WIDTH - 10, top=58)
         screen.blit(text_surface, text_rect)
+        DirtyRects.report((self, "stats"), text_rect, stats_text)
 
 
 ORDER_GUIDES = {
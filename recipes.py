@@ -0,0 +1,92 @@
+from itertools import product
+from settings import *
+
+# What a set of items on an assembly table amounts to
+MATCH = "match"  # exactly one dish's ingredients
+PARTIAL = "partial"  # part of at least one dish's ingredients
+NONE = "none"  # no dish can be made from these by adding more
+
+
+def signature(item_types):
+    """Canonical key of a multiset of item types: sorted (type, count) pairs."""
+    counts = {}
+    for item_type in item_types:
+        counts[item_type] = counts.get(item_type, 0) + 1
+    return tuple(sorted(counts.items()))
+
+
+def _sub_signatures(key):
+    # Every sub-multiset of a signature, the empty one and the whole included
+    types = [item_type for item_type, _ in key]
+    for counts in product(*(range(count + 1) for _, count in key)):
+        yield tuple((item_type, count) for item_type, count in zip(types, counts) if count)
+
+
+class RecipeIndex:
+    """Recipes compiled into lookups keyed by ingredient multisets.
+
+    ``match`` and ``status`` are one dictionary lookup on the signature of
+    the items, however many recipes there are; ``completable`` lists the
+    dishes the items could still become. ``contained`` finds a dish whose
+    ingredients are all among the items with others left over, checking
+    only the recipes that use what is there. Where several dishes qualify,
+    the one listed first in the recipe table wins.
+    """
+
+    def __init__(self, recipes):
+        self.order = {dish: index for index, dish in enumerate(recipes)}
+        self.dishes = {}  # full signature -> dish
+        self.completions = {}  # sub-signature -> dishes it can still become
+        self.uses = {}  # ingredient -> ((dish, count needed), ...)
+        self.distinct = {}  # dish -> number of different ingredients
+
+        for dish, recipe in recipes.items():
+            key = signature(recipe["ingredients"])
+            self.dishes.setdefault(key, dish)
+            for sub in _sub_signatures(key):
+                self.completions.setdefault(sub, []).append(dish)
+            for ingredient, count in key:
+                self.uses.setdefault(ingredient, []).append((dish, count))
+            self.distinct[dish] = len(key)
+
+        self.completions = {key: tuple(dishes) for key, dishes in self.completions.items()}
+        self.uses = {ingredient: tuple(uses) for ingredient, uses in self.uses.items()}
+
+    def match(self, item_types):
+        """The dish made of exactly these items, or None."""
+        return self.dishes.get(signature(item_types))
+
+    def completable(self, item_types):
+        """Dishes that have all of these items among their ingredients."""
+        return self.completions.get(signature(item_types), ())
+
+    def status(self, item_types):
+        key = signature(item_types)
+        if key in self.dishes:
+            return MATCH
+        if key in self.completions:
+            return PARTIAL
+        return NONE
+
+    def contained(self, item_types):
+        """The first dish whose ingredients are all among these items, or None."""
+        counts = dict(signature(item_types))
+        satisfied = {}
+        for ingredient, have in counts.items():
+            for dish, need in self.uses.get(ingredient, ()):
+                if have >= need:
+                    satisfied[dish] = satisfied.get(dish, 0) + 1
+        ready = [dish for dish, count in satisfied.items() if count == self.distinct[dish]]
+        if not ready:
+            return None
+        return min(ready, key=self.order.get)
+
+    def assemble(self, item_types):
+        # Exactly a dish is the usual case; otherwise look past the leftovers
+        dish = self.match(item_types)
+        if dish is None:
+            dish = self.contained(item_types)
+        return dish
+
+
+RECIPE_INDEX = RecipeIndex(RECIPES)
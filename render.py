@@ -0,0 +1,175 @@
+import pygame
+
+
+class StaticLayer:
+    """Pre-composed surface for scenery that never moves.
+
+    ``collect`` returns the (image, position) pairs to bake. The layer is
+    rebuilt whenever the key passed to ``draw`` changes, so callers can hand
+    in a cheap description of the layout and get a single blit per frame.
+    """
+
+    def __init__(self, collect, area=None, fill=None):
+        self.collect = collect
+        self.area = area
+        self.fill = fill
+        self.surface = None
+        self.rect = None
+        self._key = None
+
+    def invalidate(self):
+        self.surface = None
+
+    def draw(self, screen, key=None):
+        if self.surface is None or key != self._key:
+            self._build()
+            self._key = key
+        screen.blit(self.surface, self.rect)
+
+    def _build(self):
+        blits = self.collect()
+
+        if self.area is not None:
+            rect = pygame.Rect(self.area)
+        elif blits:
+            rects = [image.get_rect(topleft=(pos[0], pos[1])) for image, pos in blits]
+            rect = rects[0].unionall(rects[1:])
+        else:
+            rect = pygame.Rect(0, 0, 0, 0)
+
+        if self.fill is None:
+            surface = pygame.Surface(rect.size, pygame.SRCALPHA)
+        else:
+            surface = pygame.Surface(rect.size)
+            surface.fill(self.fill)
+
+        # Match the display format so the per-frame blit is a straight copy
+        if pygame.display.get_surface():
+            surface = surface.convert_alpha() if self.fill is None else surface.convert()
+
+        surface.blits([(image, (pos[0] - rect.x, pos[1] - rect.y)) for image, pos in blits],
+                      doreturn=False)
+
+        self.surface = surface
+        self.rect = rect
+
+
+class DirtyRects:
+    """Tracks which screen regions changed between frames.
+
+    Every drawable reports the area it covers plus a small state value. A
+    region is pushed to the display only when its area or state differs
+    from the previous frame, or when its owner stopped drawing. If the
+    dirty area grows past ``flip_ratio`` of the screen, ``collect`` returns
+    None and the caller falls back to a full flip.
+    """
+    enabled = False
+    flip_ratio = 0.4
+    _current = {}
+    _previous = {}
+    _full_redraw = True
+
+    @classmethod
+    def report(cls, owner, rect, state=None):
+        if cls.enabled:
+            cls._current[owner] = (pygame.Rect(rect), state)
+
+    @classmethod
+    def track(cls, sprite):
+        if cls.enabled:
+            cls._current[sprite] = (sprite.get_draw_bounds(), sprite.get_draw_state())
+
+    @classmethod
+    def invalidate(cls):
+        cls._full_redraw = True
+
+    @classmethod
+    def collect(cls, screen_rect):
+        previous = cls._previous
+        dirty = []
+        for owner, entry in cls._current.items():
+            old = previous.pop(owner, None)
+            if old is None:
+                dirty.append(entry[0])
+            elif old != entry:
+                dirty.append(old[0])
+                dirty.append(entry[0])
+        # Owners that stopped drawing leave their old area behind
+        dirty.extend(entry[0] for entry in previous.values())
+
+        cls._previous = cls._current
+        cls._current = {}
+
+        if cls._full_redraw:
+            cls._full_redraw = False
+            return None
+
+        dirty = _merge_rects([rect.clip(screen_rect) for rect in dirty if rect.colliderect(screen_rect)])
+        dirty_area = sum(rect.width * rect.height for rect in dirty)
+        if dirty_area > screen_rect.width * screen_rect.height * cls.flip_ratio:
+            return None
+        return dirty
+
+
+def _merge_rects(rects):
+    merged = []
+    for rect in rects:
+        # Fold every overlapping rect into this one until it stops growing
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect = rect.union(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+# Draw layers, back to front
+LAYER_FLOOR = 0  # dirt and dropped mops
+LAYER_WORLD = 1  # stations, furniture and people, sorted by where they stand
+LAYER_OVERLAY = 2  # bubbles, held items and tags that must stay readable
+
+
+class DrawQueue:
+    """Collects a frame's draw commands and submits them in depth order.
+
+    Entities queue (surface, position) pairs with a layer and a depth (usually
+    ``rect.bottom``). ``flush`` sorts by layer, depth and submission order and
+    hands each run of surfaces to a single ``Surface.blits`` call. Drawing that
+    cannot be expressed as a blit is queued as a callable and splits the run.
+    """
+
+    def __init__(self):
+        self.commands = []
+
+    def submit(self, surface, pos, layer, depth=0):
+        self.commands.append((layer, depth, len(self.commands), surface, pos))
+
+    def submit_call(self, draw, layer, depth=0):
+        self.commands.append((layer, depth, len(self.commands), None, draw))
+
+    def flush(self, screen):
+        self.commands.sort()
+        batch = []
+        for _, _, _, surface, target in self.commands:
+            if surface is None:
+                if batch:
+                    screen.blits(batch, doreturn=False)
+                    batch = []
+                target(screen)
+            else:
+                batch.append((surface, target))
+        if batch:
+            screen.blits(batch, doreturn=False)
+        self.commands.clear()
+
+
+def make_label(font, text, color, bg_color, padding, border_color=None):
+    """Text on a solid box, composed once instead of drawn every frame."""
+    text_surface = font.render(text, True, color)
+    pad_x, pad_y = padding
+    label = pygame.Surface((text_surface.get_width() + pad_x, text_surface.get_height() + pad_y))
+    label.fill(bg_color)
+    if border_color:
+        pygame.draw.rect(label, border_color, label.get_rect(), 1)
+    label.blit(text_surface, (pad_x // 2, pad_y // 2))
+    return label
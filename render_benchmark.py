@@ -0,0 +1,263 @@
+"""Frame times of the draw code, off screen, split into stages.
+
+    python render_benchmark.py
+    python render_benchmark.py --players 2 --orders 8 --dirt 5 --frames 1000
+    python render_benchmark.py --resolution 1920x1080 --resolution 960x540
+    python render_benchmark.py --profile                  # cProfile the slowest stage
+    python render_benchmark.py --profile render.prof      # ...and keep the stats
+
+The game runs on the dummy video driver, so the display surface is an
+off-screen buffer and nothing is presented. A kitchen is set up with the
+requested players, helpers, orders (their customers are let in first) and
+dirt, then ``Game._draw_gameplay`` draws it once per simulation step. The
+draw calls it makes (``Kitchen.draw`` and its background and depth-sorted
+queue, ``OrderManager.draw`` and each HUD part) are timed separately, as is
+every menu screen. Layouts are fixed at SCREEN_WIDTH x SCREEN_HEIGHT; any
+other ``--resolution`` adds the cost of scaling each frame to that size.
+"""
+import sys
+import time
+import pstats
+import cProfile
+import argparse
+
+from settings import *
+import headless
+from controls import KeyState
+from kitchen import Kitchen
+from ui import GameOverScreen
+from benchmark import Wander, SEED
+
+import pygame
+
+
+class StageTimer:
+    """Time spent inside wrapped draw calls, per stage.
+
+    ``wrap`` replaces a bound method with a ``timed`` one on that instance only,
+    so the code under test calls it exactly as it normally would. Stages
+    nest: a stage's time includes that of the stages it calls into.
+    """
+
+    def __init__(self):
+        self.totals = {}
+        self.profiled = None
+        self.profiler = None
+
+    def timed(self, draw, stage):
+        totals = self.totals
+        totals.setdefault(stage, 0.0)
+        clock = time.perf_counter
+
+        def timed(*args, **kwargs):
+            profiler = self.profiler if self.profiled == stage else None
+            if profiler is not None:
+                profiler.enable()
+            started = clock()
+            try:
+                return draw(*args, **kwargs)
+            finally:
+                totals[stage] += clock() - started
+                if profiler is not None:
+                    profiler.disable()
+
+        return timed
+
+    def wrap(self, owner, name, stage):
+        setattr(owner, name, self.timed(getattr(owner, name), stage))
+
+
+def _parse_resolution(text):
+    try:
+        width, height = (int(part) for part in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got {text!r}")
+    return width, height
+
+
+def _make_game():
+    from main import Game
+    headless.init()
+    return Game()
+
+
+def _counts(kitchen):
+    return (f"players {kitchen.num_players}, helpers {kitchen.helpers}, "
+            f"orders {len(kitchen.order_manager.get_active_orders())}, customers {len(kitchen.customers)}, "
+            f"dirt {len(kitchen.dirt_spots)}")
+
+
+def setup_kitchen(game, args):
+    kitchen = Kitchen(args.players, seed=SEED, helpers=args.helpers)
+    for _ in range(args.orders):
+        kitchen.order_manager._spawn_order()
+    while len(kitchen.dirt_spots) < args.dirt:
+        kitchen._spawn_dirt()
+
+    # Let the customers of the spawned orders walk in before anything is timed
+    keys = KeyState()
+    for _ in range(int(args.settle * SIM_HZ)):
+        kitchen.update(SIM_DT, keys)
+
+    kitchen.show_cooler_menu = args.cooler
+    game.kitchen = kitchen
+    game.num_players = args.players
+    game.state = "playing"
+    game.sim_alpha = 0.5
+    return kitchen
+
+
+def time_gameplay(game, args, timer):
+    """Draw ``args.frames`` gameplay frames; returns the entity counts before and after."""
+    kitchen = setup_kitchen(game, args)
+    before = _counts(kitchen)
+
+    timer.wrap(game, "_draw_gameplay", "frame")
+    timer.wrap(kitchen, "draw", "kitchen")
+    timer.wrap(kitchen.background_layer, "draw", "kitchen.background")
+    timer.wrap(kitchen.draw_queue, "flush", "kitchen.flush")
+    timer.wrap(kitchen, "_draw_cooler_menu", "kitchen.cooler_menu")
+    timer.wrap(kitchen.order_manager, "draw", "orders")
+    timer.wrap(game.ui, "draw_top_bar", "hud.top_bar")
+    timer.wrap(game.ui, "draw_order_guide", "hud.order_guide")
+    timer.wrap(game.ui, "draw_player_info", "hud.player_info")
+    timer.wrap(game.ui, "draw_message", "hud.message")
+
+    targets = [(f"scale {width}x{height}", pygame.Surface((width, height)).convert())
+               for width, height in args.resolution if (width, height) != (SCREEN_WIDTH, SCREEN_HEIGHT)]
+    for stage, _ in targets:
+        timer.totals.setdefault(stage, 0.0)
+
+    screen = game.screen
+    policy = Wander(args.players)
+    keys = KeyState()
+    clock = time.perf_counter
+    for frame in range(args.warmup + args.frames):
+        if frame == args.warmup:
+            # Caches are built; count from here
+            for stage in timer.totals:
+                timer.totals[stage] = 0.0
+        policy(kitchen, keys)
+        kitchen.update(SIM_DT, keys)
+        game._draw_gameplay()
+        for stage, target in targets:
+            started = clock()
+            pygame.transform.scale(screen, target.get_size(), target)
+            timer.totals[stage] += clock() - started
+    return before, _counts(kitchen)
+
+
+def menu_screens(game, score=1234):
+    """(stage, draw) for every screen outside the kitchen."""
+    game.game_session.end_game(score)
+    store = game.game_session.store
+    game_over = GameOverScreen(game.screen, score, game.num_players, True)
+    return [
+        ("menu.main", game.main_menu.draw),
+        ("menu.player_select", game.player_select.draw),
+        ("menu.how_to_play", game.how_to_play.draw),
+        ("menu.high_scores", game.high_score_screen.draw),
+        ("menu.game_over", game_over.draw),
+        ("menu.store", lambda: store.draw(game.screen)),
+    ]
+
+
+def time_menus(game, args, timer):
+    for stage, draw in menu_screens(game):
+        timed = timer.timed(draw, stage)
+        for frame in range(args.warmup + args.frames):
+            if frame == args.warmup:
+                timer.totals[stage] = 0.0
+            timed()
+
+
+def report(timer, frames, resolutions):
+    totals = timer.totals
+    frame_time = totals["frame"] / frames
+    print(f"{'stage':<22} {'ms/frame':>9} {'share':>7}")
+    for stage, total in totals.items():
+        if stage.startswith("menu."):
+            continue
+        per_frame = total / frames
+        share = f"{per_frame / frame_time:7.0%}" if not stage.startswith("scale") else ""
+        print(f"{stage:<22} {per_frame * 1e3:9.3f} {share}")
+
+    print()
+    print(f"gameplay {SCREEN_WIDTH}x{SCREEN_HEIGHT}: {1 / frame_time:7.0f} fps")
+    for width, height in resolutions:
+        stage = f"scale {width}x{height}"
+        if stage in totals:
+            print(f"gameplay {width}x{height}: {1 / (frame_time + totals[stage] / frames):7.0f} fps")
+
+    menus = [(stage, total) for stage, total in totals.items() if stage.startswith("menu.")]
+    if menus:
+        print()
+        for stage, total in menus:
+            print(f"{stage:<22} {total / frames * 1e3:9.3f} ms {frames / total:7.0f} fps")
+
+
+def slowest_stage(totals):
+    # The whole frame would only repeat the breakdown above, and scaling is one C call
+    return max((stage for stage in totals if stage != "frame" and not stage.startswith("scale")),
+               key=totals.get)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the draw code on an off-screen surface")
+    parser.add_argument("--players", type=int, choices=(1, 2), default=1)
+    parser.add_argument("--helpers", type=int, default=0, help="bot cooks in the kitchen")
+    parser.add_argument("--orders", type=int, default=6, help="orders spawned before timing")
+    parser.add_argument("--dirt", type=int, default=0, help="dirt spots on the floor (max %d)" % MAX_DIRT_SPOTS)
+    parser.add_argument("--cooler", action="store_true", help="keep the cooler menu open")
+    parser.add_argument("--settle", type=float, default=8.0,
+                        help="simulated seconds for customers to walk in before timing")
+    parser.add_argument("--frames", type=int, default=600, help="timed frames per screen")
+    parser.add_argument("--warmup", type=int, default=30, help="untimed frames before timing")
+    parser.add_argument("--resolution", type=_parse_resolution, action="append", default=[],
+                        metavar="WxH", help="also time scaling each frame to this size; repeat for several")
+    parser.add_argument("--no-menus", dest="menus", action="store_false", help="skip the menu screens")
+    parser.add_argument("--profile", nargs="?", const="", metavar="PATH",
+                        help="profile the slowest stage in a second pass; write the stats to PATH if given")
+    parser.add_argument("--profile-stage", metavar="STAGE", help="profile this stage instead of the slowest")
+    args = parser.parse_args(argv)
+    args.dirt = min(args.dirt, MAX_DIRT_SPOTS)
+
+    timer = StageTimer()
+    game = _make_game()
+    before, after = time_gameplay(game, args, timer)
+    if args.menus:
+        time_menus(game, args, timer)
+
+    print(f"{args.frames} frames after {args.warmup} warm-up; {before} at the start, {after} at the end")
+    report(timer, args.frames, args.resolution)
+
+    if args.profile is None:
+        return 0
+    stage = args.profile_stage or slowest_stage(timer.totals)
+    if stage not in timer.totals:
+        parser.error(f"unknown stage {stage!r}; choose from {', '.join(timer.totals)}")
+    if stage.startswith("scale"):
+        print(f"\n{stage} is a single pygame.transform.scale call; nothing to profile")
+        return 0
+
+    # Same frames again on a fresh game, with the profiler on only inside the stage
+    profiled = StageTimer()
+    profiled.profiled = stage
+    profiled.profiler = cProfile.Profile()
+    game = _make_game()
+    if stage.startswith("menu."):
+        time_menus(game, args, profiled)
+    else:
+        time_gameplay(game, args, profiled)
+
+    print(f"\nProfile of {stage}:")
+    stats = pstats.Stats(profiled.profiler)
+    stats.sort_stats("cumulative").print_stats(25)
+    if args.profile:
+        stats.dump_stats(args.profile)
+        print(f"Saved {args.profile}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,261 @@
+"""Record a shift's input and play it back.
+
+    python replay.py replays/shift.tkr              # rendered, real time
+    python replay.py replays/shift.tkr --rate 4     # rendered, 4x speed
+    python replay.py replays/shift.tkr --headless   # as fast as the CPU allows
+
+A recording holds the kitchen's seed, player and helper counts and perks,
+then the input of every simulation step: the held movement keys (a
+``controls.KeyState`` mask) and the actions applied before the step. Helper
+cooks decide from the kitchen's state, so their input is not stored. Only
+changes are stored, as (ticks since the last change, change) pairs in
+varints, so a 6-minute shift is a few kilobytes. The shift's final score
+closes the file, which lets playback report whether the simulation still
+matches the recording.
+"""
+import os
+import sys
+import time
+import argparse
+
+from settings import *
+from controls import KeyState
+from kitchen import Kitchen
+
+MAGIC = b"TKRP"
+VERSION = 3
+
+# Event codes; actions are packed as action << 2 | player slot (0 = none)
+EVENT_KEYS = 0x00
+EVENT_END = 0xFF
+
+# Perks in header order, with the value a shift without them has
+PERK_DEFAULTS = (("speed_boost", 0), ("holding_boost", 0), ("salary_multiplier", 1))
+
+
+def write_varint(out, value):
+    while value > 0x7F:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, offset):
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def _zigzag(value):
+    return value << 1 if value >= 0 else (-value << 1) - 1
+
+
+def _unzigzag(value):
+    return value >> 1 if not value & 1 else -(value >> 1) - 1
+
+
+class Recorder:
+    """Collects a kitchen's input as it runs; attach with ``kitchen.recorder``."""
+
+    def __init__(self, kitchen):
+        self.kitchen = kitchen
+        self.ticks = 0
+        self.mask = 0
+        self.last_event_tick = 0
+        self.body = bytearray()
+
+    def _event(self, code):
+        write_varint(self.body, self.ticks - self.last_event_tick)
+        self.body.append(code)
+        self.last_event_tick = self.ticks
+
+    def record_action(self, player_index, action):
+        # Applied before the step that has not run yet
+        self._event(action << 2 | (0 if player_index is None else player_index + 1))
+
+    def record_tick(self, keys):
+        mask = keys.mask if isinstance(keys, KeyState) else KeyState.from_pressed(keys).mask
+        if mask != self.mask:
+            self._event(EVENT_KEYS)
+            self.body.append(mask)
+            self.mask = mask
+        self.ticks += 1
+
+    def to_bytes(self):
+        kitchen = self.kitchen
+        out = bytearray(MAGIC)
+        out.append(VERSION)
+        write_varint(out, kitchen.seed)
+        write_varint(out, kitchen.num_players)
+        write_varint(out, kitchen.helpers)
+        write_varint(out, SIM_HZ)
+        for name, default in PERK_DEFAULTS:
+            write_varint(out, kitchen.perks.get(name, default))
+        out += self.body
+
+        write_varint(out, self.ticks - self.last_event_tick)
+        out.append(EVENT_END)
+        write_varint(out, _zigzag(kitchen.score))
+        write_varint(out, kitchen.order_manager.total_completed)
+        return bytes(out)
+
+    def save(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+        return path
+
+
+class Recording:
+    """A decoded recording: header, input events and the recorded result."""
+
+    def __init__(self, seed, num_players, helpers, perks, events, ticks, score, orders_completed):
+        self.seed = seed
+        self.num_players = num_players
+        self.helpers = helpers
+        self.perks = perks
+        self.events = events  # (tick, mask, actions) for every tick where input changed
+        self.ticks = ticks
+        self.score = score
+        self.orders_completed = orders_completed
+
+    @classmethod
+    def from_bytes(cls, data):
+        if data[:4] != MAGIC:
+            raise ValueError("not a replay file")
+        if data[4] != VERSION:
+            raise ValueError(f"unsupported replay version {data[4]}")
+
+        offset = 5
+        seed, offset = read_varint(data, offset)
+        num_players, offset = read_varint(data, offset)
+        helpers, offset = read_varint(data, offset)
+        sim_hz, offset = read_varint(data, offset)
+        if sim_hz != SIM_HZ:
+            raise ValueError(f"recorded at {sim_hz} Hz, simulation runs at {SIM_HZ} Hz")
+        perks = {}
+        for name, default in PERK_DEFAULTS:
+            value, offset = read_varint(data, offset)
+            if value != default:
+                perks[name] = value
+
+        events = []
+        tick = 0
+        mask = 0
+        while True:
+            delta, offset = read_varint(data, offset)
+            code = data[offset]
+            offset += 1
+            tick += delta
+            if code == EVENT_END:
+                break
+
+            # Held keys carry over into ticks that only add actions
+            if not events or events[-1][0] != tick:
+                events.append((tick, [mask], []))
+            if code == EVENT_KEYS:
+                mask = data[offset]
+                offset += 1
+                events[-1][1][0] = mask
+            else:
+                slot = code & 3
+                events[-1][2].append((slot - 1 if slot else None, code >> 2))
+        events = [(tick, masks[0], tuple(actions)) for tick, masks, actions in events]
+
+        score, offset = read_varint(data, offset)
+        orders_completed, offset = read_varint(data, offset)
+        return cls(seed, num_players, helpers, perks, events, tick, _unzigzag(score), orders_completed)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    def new_kitchen(self):
+        return Kitchen(self.num_players, self.perks, self.seed, self.helpers)
+
+
+class Replay:
+    """Feeds a recording into a kitchen one simulation step at a time."""
+
+    def __init__(self, recording):
+        self.recording = recording
+        self.keys = KeyState()
+        self.tick = 0
+        self._next_event = 0
+
+    @property
+    def finished(self):
+        return self.tick >= self.recording.ticks
+
+    def step(self, kitchen):
+        # Apply this tick's actions and held keys, then run the step
+        events = self.recording.events
+        if self._next_event < len(events) and events[self._next_event][0] == self.tick:
+            _, mask, actions = events[self._next_event]
+            self._next_event += 1
+            for player_index, action in actions:
+                kitchen.apply_action(player_index, action)
+            self.keys.mask = mask
+        kitchen.update(SIM_DT, self.keys)
+        self.tick += 1
+
+
+def play_headless(recording):
+    """Run a recording to its end without drawing and return the kitchen's stats."""
+    kitchen = recording.new_kitchen()
+    replay = Replay(recording)
+    started = time.perf_counter()
+    while not replay.finished:
+        replay.step(kitchen)
+
+    stats = kitchen.get_stats()
+    stats["steps"] = replay.tick
+    stats["wall_time"] = time.perf_counter() - started
+    stats["matches"] = (kitchen.score == recording.score
+                        and stats["orders_completed"] == recording.orders_completed)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play back a recorded shift")
+    parser.add_argument("path")
+    parser.add_argument("--rate", type=float, default=1.0,
+                        help="playback speed when rendering (default: real time)")
+    parser.add_argument("--headless", action="store_true",
+                        help="skip rendering and run as fast as possible")
+    args = parser.parse_args(argv)
+
+    recording = Recording.load(args.path)
+    size = os.path.getsize(args.path)
+    print(f"{args.path}: seed {recording.seed}, {recording.num_players} player(s), "
+          f"{recording.ticks} steps, {len(recording.events)} input changes, {size} bytes")
+
+    if args.headless:
+        import headless
+        headless.init()
+        stats = play_headless(recording)
+        sim_time = stats["steps"] * SIM_DT
+        print(f"score ${stats['score']} (recorded ${recording.score}), "
+              f"{stats['orders_completed']} orders, {stats['steps']} steps in {stats['wall_time']:.3f}s "
+              f"({sim_time / stats['wall_time']:.0f}x real time)")
+        if not stats["matches"]:
+            print("replay diverged from the recording")
+            return 1
+        return 0
+
+    from main import Game
+    game = Game()
+    game.start_replay(recording, args.rate)
+    game.run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+"""The last few seconds of a shift, kept for scrubbing back and spike dumps.
+
+    python rewind.py spikes/spike-20260101-120000-8123.tkrw
+    python rewind.py spikes/spike-20260101-120000-8123.tkrw --ticks 60
+
+While playing, ``RewindBuffer`` captures a ``Kitchen.snapshot`` every few
+ticks. Holding the rewind key scrubs back through them and releasing it
+plays on from the frame shown. When a gameplay frame takes longer than
+``SPIKE_DUMP_MS`` the buffer is written out, so the states leading up to
+the spike can be loaded here and stepped again under a timer.
+"""
+import os
+import re
+import sys
+import time
+import struct
+import argparse
+from array import array
+
+from settings import *
+
+DUMP_MAGIC = b"TKRW"
+DUMP_VERSION = 1
+
+# Delta record: older frame length, newer frame length, run count; then
+# per run its offset and length, followed by the XOR of the two frames there
+RECORD = struct.Struct("<IIH")
+RUN = struct.Struct("<IH")
+MAX_RUN = 0xFFFF
+
+# Unchanged stretches worth ending a run for; shorter gaps stay inside one.
+# Searching for the gaps skips the zero bytes in C instead of trying a run
+# at every one of them
+GAP = re.compile(rb"\x00{7,}")
+
+
+def _xor(a, b, size):
+    return (int.from_bytes(a, "little") ^ int.from_bytes(b, "little")).to_bytes(size, "little")
+
+
+def _changed_runs(diff):
+    # (start, stop) of every stretch between gaps, split to fit a run length
+    runs = []
+    position = 0
+    for gap in GAP.finditer(diff):
+        start, stop = gap.span()
+        if start > position:
+            runs.append((position, start))
+        position = stop
+    if position < len(diff):
+        runs.append((position, len(diff)))
+    return [(offset, min(stop, offset + MAX_RUN))
+            for start, stop in runs for offset in range(start, stop, MAX_RUN)]
+
+
+class RewindBuffer:
+    """Recent kitchen snapshots in one fixed block of memory.
+
+    Only the newest frame is kept whole. Each older frame is stored as the
+    runs of bytes where it differs from the frame after it, so a second of
+    a shift costs a few hundred bytes rather than a dozen full snapshots.
+    Records go into a ring allocated up front; when it or the time window
+    is full, the oldest frames make room. The same XOR runs turn a frame
+    into its neighbour either way, which is how ``step_back`` and
+    ``step_forward`` move the cursor.
+    """
+
+    def __init__(self, seconds=REWIND_SECONDS, interval=REWIND_INTERVAL, capacity=REWIND_BUFFER_BYTES):
+        self.interval = interval
+        self.max_records = max(1, int(seconds * SIM_HZ / interval))
+        self.ring = bytearray(capacity)
+        self.starts = array("I", [0]) * self.max_records
+        self.lengths = array("I", [0]) * self.max_records
+        self.first = 0  # slot of the oldest record
+        self.count = 0
+        self.end = 0  # ring offset just past the newest record
+
+        self.head = None  # newest frame
+        self.countdown = 0
+
+        # While scrubbing: frames behind the head and the frame there
+        self.cursor = 0
+        self.view = None
+
+    def __len__(self):
+        return self.count + (self.head is not None)
+
+    @property
+    def seconds(self):
+        # How far back the buffer reaches right now
+        return self.count * self.interval * SIM_DT
+
+    def tick(self, kitchen):
+        # Called after every simulation step
+        self.countdown -= 1
+        if self.countdown <= 0:
+            self.countdown = self.interval
+            self.capture(kitchen)
+
+    def capture(self, kitchen):
+        if self.cursor:
+            self.resume()
+        frame = kitchen.snapshot()
+        if self.head is not None:
+            self._push(self.head, frame)
+        self.head = frame
+
+    def clear(self):
+        self.first = self.count = self.end = 0
+        self.head = self.view = None
+        self.cursor = self.countdown = 0
+
+    # Ring storage
+
+    def _push(self, older, newer):
+        size = max(len(older), len(newer))
+        diff = _xor(older, newer, size)
+        runs = _changed_runs(diff)
+        length = RECORD.size + sum(RUN.size + stop - start for start, stop in runs)
+        ring = self.ring
+        if length > len(ring):
+            self.first = self.count = self.end = 0
+            return
+
+        at = self.end if self.end + length <= len(ring) else 0
+        while self.count and (self.count == self.max_records or not self._fits(at, length)):
+            self.first = (self.first + 1) % self.max_records
+            self.count -= 1
+        if not self.count:
+            at = 0
+
+        RECORD.pack_into(ring, at, len(older), len(newer), len(runs))
+        offset = at + RECORD.size
+        for start, stop in runs:
+            RUN.pack_into(ring, offset, start, stop - start)
+            offset += RUN.size
+            ring[offset:offset + stop - start] = diff[start:stop]
+            offset += stop - start
+
+        slot = (self.first + self.count) % self.max_records
+        self.starts[slot] = at
+        self.lengths[slot] = length
+        self.count += 1
+        self.end = at + length
+
+    def _fits(self, at, length):
+        oldest = self.starts[self.first]
+        if oldest >= self.end:
+            # Stored records wrap past the end of the ring; free space sits between
+            return at == self.end and at + length <= oldest
+        return at == self.end or at + length <= oldest
+
+    def _apply(self, frame, index, backward):
+        # The frame one step older (backward) or newer than ``frame`` through record ``index``
+        slot = (self.first + index) % self.max_records
+        ring = self.ring
+        at = self.starts[slot]
+        older_size, newer_size, run_count = RECORD.unpack_from(ring, at)
+        size = max(older_size, newer_size)
+        if len(frame) < size:
+            frame.extend(bytes(size - len(frame)))
+        offset = at + RECORD.size
+        for _ in range(run_count):
+            start, run_length = RUN.unpack_from(ring, offset)
+            offset += RUN.size
+            stop = start + run_length
+            frame[start:stop] = _xor(frame[start:stop], ring[offset:offset + run_length], run_length)
+            offset += run_length
+        del frame[older_size if backward else newer_size:]
+        return frame
+
+    # Scrubbing
+
+    def step_back(self):
+        """The frame one capture older than the cursor, or None at the oldest."""
+        if self.cursor >= self.count:
+            return None
+        if self.view is None:
+            self.view = bytearray(self.head)
+        self.cursor += 1
+        return self._apply(self.view, self.count - self.cursor, True)
+
+    def step_forward(self):
+        """The frame one capture newer than the cursor, or None at the newest."""
+        if not self.cursor:
+            return None
+        self._apply(self.view, self.count - self.cursor, False)
+        self.cursor -= 1
+        return self.view
+
+    def resume(self):
+        # Play on from the cursor: frames after it belong to a future that is gone
+        if self.cursor:
+            self.count -= self.cursor
+            self.head = bytes(self.view)
+            if self.count:
+                last = (self.first + self.count - 1) % self.max_records
+                self.end = self.starts[last] + self.lengths[last]
+            else:
+                self.end = 0
+        self.cursor = 0
+        self.view = None
+        self.countdown = self.interval
+
+    def frames(self):
+        """Every stored frame, oldest first."""
+        if self.head is None:
+            return []
+        frame = bytearray(self.head)
+        frames = [self.head]
+        for index in range(self.count - 1, -1, -1):
+            frames.append(bytes(self._apply(frame, index, True)))
+        frames.reverse()
+        return frames
+
+    def dump(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        frames = self.frames()
+        with open(path, "wb") as f:
+            f.write(DUMP_MAGIC + struct.pack("<BHI", DUMP_VERSION, self.interval, len(frames)))
+            for frame in frames:
+                f.write(struct.pack("<I", len(frame)))
+                f.write(frame)
+        return path
+
+
+def load_dump(path):
+    """(interval, frames) from a file written by ``RewindBuffer.dump``."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:4] != DUMP_MAGIC:
+        raise ValueError("not a rewind dump")
+    version, interval, count = struct.unpack_from("<BHI", data, 4)
+    if version != DUMP_VERSION:
+        raise ValueError(f"unsupported rewind dump version {version}")
+    offset = 4 + struct.calcsize("<BHI")
+    frames = []
+    for _ in range(count):
+        (length,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        frames.append(data[offset:offset + length])
+        offset += length
+    return interval, frames
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect the frames of a rewind dump")
+    parser.add_argument("path")
+    parser.add_argument("--ticks", type=int, default=0,
+                        help="also time this many idle simulation steps from every frame")
+    args = parser.parse_args(argv)
+
+    import headless
+    from controls import KeyState
+    from kitchen import Kitchen
+    headless.init()
+
+    interval, frames = load_dump(args.path)
+    print(f"{args.path}: {len(frames)} frames, one every {interval} steps")
+    for index, frame in enumerate(frames):
+        kitchen = Kitchen.from_snapshot(frame)
+        line = (f"{index:3d}  t={kitchen.clock.time:7.2f}s  score ${kitchen.score}  "
+                f"orders {len(kitchen.order_manager.orders)}  customers {len(kitchen.customers)}  "
+                f"dirt {len(kitchen.dirt_spots)}  {len(frame)} bytes")
+        if args.ticks:
+            keys = KeyState()
+            started = time.perf_counter()
+            for _ in range(args.ticks):
+                kitchen.update(SIM_DT, keys)
+            line += f"  {(time.perf_counter() - started) / args.ticks * 1e6:.0f} us/step"
+        print(line)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
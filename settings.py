@@ -4,6 +4,38 @@ SCREEN_HEIGHT = 720
 FPS = 120
 TITLE = "Time's Kitchen"
 
+# Frame pacing
+GAMEPLAY_FPS = FPS  # frame cap while playing; 0 leaves pacing to vsync
+VSYNC = False  # sync gameplay frames to the display refresh
+MENU_WAIT_TIMEOUT = 250  # ms a menu screen blocks waiting for input
+UNFOCUSED_FPS = 10  # frame rate while the window is in the background
+MAX_FRAME_TIME = 0.25  # longest step in seconds handed to the game
+FRAME_STATS = False  # print per-state frame times on exit
+
+# Bot cooks joining a one-player shift
+SOLO_HELPERS = 0
+
+# Replays
+RECORD_REPLAYS = False  # save every shift's input for replay.py
+REPLAY_DIR = "replays"
+
+# Rewind (debug and practice)
+REWIND_ENABLED = False  # hold Backspace while playing to scrub back, Shift+Backspace forward
+REWIND_SECONDS = 10  # how far back the rewind buffer reaches
+REWIND_INTERVAL = 12  # simulation steps between captured frames
+REWIND_BUFFER_BYTES = 1 << 20  # memory ceiling of the rewind buffer
+REWIND_SCRUB_RATE = 2.0  # shift seconds scrubbed per second the key is held
+SPIKE_DUMP_MS = 0  # dump the rewind buffer when a gameplay frame takes longer; 0 disables
+SPIKE_DIR = "spikes"
+
+# Simulation speed (debug and QA)
+SPEED_KEYS_ENABLED = False  # F1-F4 run the shift at 0.25x, 1x, 4x or 16x
+FAST_FORWARD_DRAW_FPS = 30  # screen refreshes per second while running faster than 1x
+
+# Rendering
+DIRTY_RECT_RENDERING = False  # push only changed screen regions instead of flipping
+DIRTY_RECT_FLIP_RATIO = 0.4  # fall back to a full flip above this share of the screen
+
 # Colors
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -28,6 +60,15 @@ ORDER_URGENT = (150, 50, 30)
 GAME_DURATION = 360  # 6 minutes = 360 seconds
 GAME_HOUR = 60  # 1 game hour = 60 real seconds (1 minute)
 ORDER_TIMEOUT = 30  # Seconds before order expires
+STORE_MESSAGE_DURATION = 1.0  # Seconds a store purchase message stays up
+MESSAGE_DURATION = 1.0  # Seconds a kitchen message stays up
+MESSAGE_FADE_RATE = 480  # Message alpha lost per second as it runs out
+CASHIER_MESSAGE_DURATION = 1.5  # Seconds the cashier's order bubble stays up
+CLEANING_DURATION = 0.5  # Seconds a player spends mopping a spot
+
+# Simulation runs on a fixed step, independent of the frame rate
+SIM_HZ = 60
+SIM_DT = 1.0 / SIM_HZ
 
 # Cooking times 
 COOK_TIME_MEAT = 5
@@ -45,14 +86,24 @@ REWARD_CLEANING = 3
 ORDERS_PER_HOUR_SINGLE = 5
 ORDERS_PER_HOUR_MULTI = 10
 
+# Store perk prices
+PERK_COST_SPEED = 100
+PERK_COST_HOLDING = 120
+PERK_COST_SALARY = 200
+
 # Player settings
-PLAYER_SPEED = 2.7
+PLAYER_SPEED = 324  # pixels per second
+PLAYER_SPEED_BOOST = 120  # added per speed perk
 PLAYER_SIZE = 80  
 PLAYER1_SIZE = 120 
 
 # Station settings
 STATION_SIZE = 90
 
+# Interaction reach and the grid that finds what is in reach
+INTERACT_DISTANCE = 80  # player centre to a mop, dirt spot or seated customer
+SPATIAL_CELL_SIZE = 160  # twice the reach, so a query covers at most 2x2 cells
+
 # Tile settings
 TILE_SIZE = 200
 
@@ -60,7 +111,8 @@ TILE_SIZE = 200
 ITEM_SIZE = 48
 
 # Customer settings
-CUSTOMER_SPEED = 3
+CUSTOMER_SPEED = 360  # pixels per second
+PEDESTRIAN_SPEED = 180
 
 # Dirt settings
 DIRT_SPAWN_INTERVAL = 60  
@@ -69,6 +121,12 @@ MAX_DIRT_SPOTS = 5
 # Asset paths
 ASSETS_PATH = "assets/"
 
+# Byte budget for scaled images kept in SpriteSheet's cache
+IMAGE_CACHE_BUDGET = 16 * 1024 * 1024
+
+# Number of rendered text surfaces kept by the font registry
+TEXT_CACHE_SIZE = 512
+
 # Item types
 class ItemType:
     # Raw ingredients
@@ -0,0 +1,485 @@
+"""Kitchen state as compact bytes, to save a shift mid-way and resume it.
+
+``save`` packs everything the simulation reads on later steps: players and
+what they hold, station contents and cooking times, orders, customers,
+dirt, the mop, score, clock, random generator, pending scheduler events and
+the helper bots' plans. Surfaces are never stored; items, dishes and
+bubbles are rebuilt from their type codes on ``load``. A restored kitchen
+continues exactly as the original would have, tick for tick.
+
+Objects that point at each other (a customer's order and table, the mop's
+holder, a cooking station's pending finish) are stored as indices into
+the kitchen's own groups, so ``load`` needs a kitchen built with the same
+players, helpers and perks; ``read_header`` returns those.
+"""
+import heapq
+import struct
+
+from settings import *
+from sprites import Item, Customer, DirtSpot, SpriteSheet
+from stations import CookingStation, AssemblyTable, ServeCounter
+from orders import Order, CompletedOrder
+from bots import Bot, NavGrid
+from timing import ScheduledEvent
+
+MAGIC = b"TKSS"
+VERSION = 1
+
+# Perks in header order, with the value a shift without them has
+PERK_DEFAULTS = (("speed_boost", 0), ("holding_boost", 0), ("salary_multiplier", 1))
+
+# Integer codes for types and states; 0 is nothing
+ITEM_TYPES = (
+    ItemType.BREAD, ItemType.MEAT, ItemType.SAUSAGE, ItemType.PASTA, ItemType.LETTUCE,
+    ItemType.SAUCE, ItemType.COOKED_MEAT, ItemType.COOKED_SAUSAGE, ItemType.BOILED_PASTA,
+    ItemType.BURGER, ItemType.HOTDOG, ItemType.PASTA_DISH, ItemType.SALAD_DISH, ItemType.MOP,
+)
+ITEM_CODES = {item_type: code for code, item_type in enumerate(ITEM_TYPES, 1)}
+DIRECTIONS = ("down", "up", "left", "right")
+DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+CUSTOMER_STATES = ("arriving", "going_to_table", "sitting", "waiting",
+                   "receiving_food", "eating", "leaving", "exiting")
+CUSTOMER_CODES = {state: code for code, state in enumerate(CUSTOMER_STATES)}
+STEP_KINDS = ("cooler", "take", "place", "collect", "assemble", "serve")
+STEP_CODES = {kind: code for code, kind in enumerate(STEP_KINDS)}
+
+# Scheduled callbacks by owner and method name
+OWNER_KITCHEN, OWNER_ORDERS, OWNER_CASHIER, OWNER_STATION, OWNER_CUSTOMER = range(5)
+EVENT_METHODS = ("_hourly_dirt", "_clear_message", "_spawn_due", "_expire_completed",
+                 "_finish_cooking", "_finish_eating")
+EVENT_CODES = {name: code for code, name in enumerate(EVENT_METHODS)}
+
+HEADER = struct.Struct("<4sBQBB3B")
+# clock time, ticks, time left, game hour, score, next dirt, message expiry,
+# cooler menu open, its player, scheduler counter
+KITCHEN = struct.Struct("<dQdBddd?bQ")
+RNG = struct.Struct("<625Id")
+# taking orders, next spawn, spawned, counter, total reward, completed
+ORDER_MANAGER = struct.Struct("<?dIIdI")
+COUNT = struct.Struct("<H")
+# pos, prev pos, direction, heading, mop, cleaning, collision rect, held count
+PLAYER = struct.Struct("<4dB?bb?b?dh2hB")
+COOKING = struct.Struct("<?ddB")
+# id, dish, in the active list, completed, timestamp, completion, reward, customer, table
+ORDER = struct.Struct("<IB??dddhb")
+BANNER = struct.Struct("<Bdd")
+# pos, prev pos, target, state, line, table, order, held food, done eating, spawned
+CUSTOMER = struct.Struct("<6dBhbh?dd")
+DIRT = struct.Struct("<hh")
+MOP = struct.Struct("<hh?b")
+PEDESTRIAN = struct.Struct("<4d")
+EVENT = struct.Struct("<dQBhBh")
+BOT = struct.Struct("<BBBIB")
+STEP = struct.Struct("<Bh")
+
+NAN = float("nan")
+
+
+def _optional(value):
+    return NAN if value is None else value
+
+
+def _present(value):
+    return None if value != value else value
+
+
+def _number(value):
+    # Scores are whole dollars unless a balance sweep made rewards fractional
+    return int(value) if value.is_integer() else value
+
+
+def _item_code(item):
+    return ITEM_CODES[item.item_type] if item else 0
+
+
+def _item(code):
+    return Item(ITEM_TYPES[code - 1]) if code else None
+
+
+def _write_text(out, text):
+    encoded = text.encode("utf-8")
+    out += COUNT.pack(len(encoded))
+    out += encoded
+
+
+def _read_count(data, offset):
+    return COUNT.unpack_from(data, offset)[0], offset + COUNT.size
+
+
+def _read_text(data, offset):
+    length, offset = _read_count(data, offset)
+    return data[offset:offset + length].decode("utf-8"), offset + length
+
+
+def read_header(data):
+    """(seed, num_players, helpers, perks) of a snapshot, to build a matching kitchen."""
+    magic, version, seed, num_players, helpers, *perk_values = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("not a kitchen snapshot")
+    if version != VERSION:
+        raise ValueError(f"unsupported snapshot version {version}")
+    perks = {name: value for (name, default), value in zip(PERK_DEFAULTS, perk_values)
+             if value != default}
+    return seed, num_players, helpers, perks
+
+
+def save(kitchen):
+    """The kitchen's state as bytes; see ``load``."""
+    clock = kitchen.clock
+    scheduler = kitchen.scheduler
+    order_manager = kitchen.order_manager
+    players = list(kitchen.players)
+    stations = list(kitchen.stations)
+    tables = list(kitchen.dining_tables)
+    customers = list(kitchen.customers)
+    table_index = {table: i for i, table in enumerate(tables)}
+    customer_index = {customer: i for i, customer in enumerate(customers)}
+
+    out = bytearray(HEADER.pack(MAGIC, VERSION, kitchen.seed, kitchen.num_players, kitchen.helpers,
+                                *(kitchen.perks.get(name, default) for name, default in PERK_DEFAULTS)))
+    cooler_player = kitchen.cooler_menu_player
+    out += KITCHEN.pack(clock.time, clock.ticks, kitchen.time_remaining, kitchen.game_hour,
+                        kitchen.score, kitchen.next_dirt_at, kitchen.message_expires_at,
+                        kitchen.show_cooler_menu, -1 if cooler_player is None else cooler_player,
+                        scheduler.counter)
+    _, state, gauss = kitchen.rng.getstate()
+    out += RNG.pack(*state, _optional(gauss))
+    _write_text(out, kitchen.message)
+    _write_text(out, kitchen.cashier.current_message)
+
+    mops = list(kitchen.mops)
+    mop_index = {mop: i for i, mop in enumerate(mops)}
+    out += COUNT.pack(len(players))
+    for player in players:
+        hx, hy = player.heading if player.heading is not None else (0, 0)
+        out += PLAYER.pack(player.pos.x, player.pos.y, player.prev_pos.x, player.prev_pos.y,
+                           DIRECTION_CODES[player.direction], player.heading is not None, hx, hy,
+                           player.holding_mop, mop_index.get(player.mop_object, -1),
+                           player.is_cleaning, player.cleaning_timer, player.clean_sway_offset,
+                           player.collision_rect.x, player.collision_rect.y, len(player.held_items))
+        out += bytes(_item_code(item) for item in player.held_items)
+
+    out += COUNT.pack(len(stations))
+    for station in stations:
+        out.append(_item_code(station.current_item))
+        if isinstance(station, CookingStation):
+            out += COOKING.pack(station.cooking, station.cook_duration, _optional(station.cook_done_at),
+                                ITEM_CODES.get(station.output_item_type, 0))
+        elif isinstance(station, AssemblyTable):
+            out.append(len(station.items_on_table))
+            out += bytes(_item_code(item) for item in station.items_on_table)
+        elif isinstance(station, ServeCounter):
+            out.append(_item_code(station.served_dish))
+    out += COUNT.pack(len(tables))
+    out += bytes(table.occupied for table in tables)
+
+    # Active orders, then finished ones; customers and events point into this list
+    orders = order_manager.orders + order_manager.all_completed
+    order_index = {order: i for i, order in enumerate(orders)}
+    out += ORDER_MANAGER.pack(order_manager.taking_orders, _optional(order_manager.next_spawn_at),
+                              order_manager.total_spawned, order_manager.order_counter,
+                              order_manager.total_reward, order_manager.total_completed)
+    out += COUNT.pack(len(orders))
+    active = len(order_manager.orders)
+    for i, order in enumerate(orders):
+        out += ORDER.pack(order.order_id, ITEM_CODES[order.dish_type], i < active, order.completed,
+                          order.timestamp, _optional(order.completion_time), order.reward,
+                          customer_index.get(order.customer, -1), table_index.get(order.dining_table, -1))
+    banners = order_manager.completed_orders
+    banner_index = {banner: i for i, banner in enumerate(banners)}
+    out += COUNT.pack(len(banners))
+    for banner in banners:
+        out += BANNER.pack(ITEM_CODES[_dish_named(banner.order_name)], banner.reward, banner.expires_at)
+
+    out += COUNT.pack(len(customers))
+    for customer in customers:
+        out += CUSTOMER.pack(customer.pos.x, customer.pos.y, customer.prev_pos.x, customer.prev_pos.y,
+                             customer.target_x, customer.target_y, CUSTOMER_CODES[customer.state],
+                             customer.line_position, table_index.get(customer.dining_table, -1),
+                             order_index.get(customer.order, -1), bool(customer.held_food),
+                             _optional(customer.done_eating_at), customer.spawned_at)
+
+    dirt_spots = list(kitchen.dirt_spots)
+    out += COUNT.pack(len(dirt_spots))
+    for dirt in dirt_spots:
+        out += DIRT.pack(dirt.rect.x, dirt.rect.y)
+    out += COUNT.pack(len(mops))
+    player_index = {player: i for i, player in enumerate(players)}
+    for mop in mops:
+        out += MOP.pack(mop.rect.x, mop.rect.y, mop.is_held, player_index.get(mop.holder, -1))
+    pedestrians = list(kitchen.pedestrians)
+    out += COUNT.pack(len(pedestrians))
+    for pedestrian in pedestrians:
+        out += PEDESTRIAN.pack(pedestrian.pos.x, pedestrian.pos.y, pedestrian.prev_pos.x, pedestrian.prev_pos.y)
+
+    # Pending events keep their sequence numbers, so ties fire in the same order;
+    # they are written sorted, since the heap's own layout depends on cancelled
+    # entries that are not stored
+    owners = {kitchen: (OWNER_KITCHEN, 0), order_manager: (OWNER_ORDERS, 0),
+              kitchen.cashier: (OWNER_CASHIER, 0)}
+    owners.update((station, (OWNER_STATION, i)) for i, station in enumerate(stations))
+    owners.update((customer, (OWNER_CUSTOMER, i)) for i, customer in enumerate(customers))
+    events = sorted(entry for entry in scheduler.queue if not entry[2].cancelled)
+    out += COUNT.pack(len(events))
+    for time, sequence, event in events:
+        callback = event.callback
+        owner = owners.get(getattr(callback, "__self__", None))
+        code = EVENT_CODES.get(callback.__name__)
+        if owner is None or code is None:
+            raise ValueError(f"cannot snapshot scheduled callback {callback!r}")
+        arg = banner_index[event.args[0]] if event.args else -1
+        out += EVENT.pack(time, sequence, owner[0], owner[1], code, arg)
+
+    policy = kitchen.helper_policy
+    bots = policy.bots if policy and policy.bots is not None else None
+    if bots is None:
+        out += COUNT.pack(0xFFFF)
+    else:
+        station_index = {station: i for i, station in enumerate(stations)}
+        out += COUNT.pack(len(bots))
+        for bot in bots:
+            out += BOT.pack(ITEM_CODES.get(bot.dish, 0), bot.held_count, bot.cooldown,
+                            bot.idle_ticks, len(bot.steps))
+            for kind, target in bot.steps:
+                if kind == "cooler":
+                    value = target
+                elif target is None:
+                    value = -1
+                else:
+                    value = station_index[target]
+                out += STEP.pack(STEP_CODES[kind], value)
+    return bytes(out)
+
+
+def load(kitchen, data):
+    """Put a kitchen built with the snapshot's header back into the saved state."""
+    seed, num_players, helpers, perks = read_header(data)
+    kitchen_perks = {name: value for name, value in kitchen.perks.items()
+                     if value != dict(PERK_DEFAULTS).get(name)}
+    if (num_players, helpers, perks) != (kitchen.num_players, kitchen.helpers, kitchen_perks):
+        raise ValueError("snapshot is for a kitchen with different players, helpers or perks")
+    offset = HEADER.size
+    kitchen.seed = seed
+
+    clock = kitchen.clock
+    scheduler = kitchen.scheduler
+    order_manager = kitchen.order_manager
+    (clock.time, clock.ticks, kitchen.time_remaining, kitchen.game_hour, score,
+     kitchen.next_dirt_at, kitchen.message_expires_at, kitchen.show_cooler_menu,
+     cooler_player, scheduler.counter) = KITCHEN.unpack_from(data, offset)
+    offset += KITCHEN.size
+    kitchen.score = _number(score)
+    kitchen.cooler_menu_player = None if cooler_player < 0 else cooler_player
+
+    *state, gauss = RNG.unpack_from(data, offset)
+    offset += RNG.size
+    kitchen.rng.setstate((3, tuple(state), _present(gauss)))
+    kitchen.message, offset = _read_text(data, offset)
+    cashier = kitchen.cashier
+    message, offset = _read_text(data, offset)
+    if message != cashier.current_message:
+        cashier.current_message = message
+        cashier.bubble_image = cashier._compose_bubble(message) if message else None
+
+    players = list(kitchen.players)
+    mops = list(kitchen.mops)
+    offset = _check_count(data, offset, players, "players")
+    for player in players:
+        (player.pos.x, player.pos.y, player.prev_pos.x, player.prev_pos.y, direction, steered, hx, hy,
+         player.holding_mop, mop, player.is_cleaning, player.cleaning_timer, player.clean_sway_offset,
+         player.collision_rect.x, player.collision_rect.y, held) = PLAYER.unpack_from(data, offset)
+        offset += PLAYER.size
+        player.direction = DIRECTIONS[direction]
+        player.heading = (hx, hy) if steered else None
+        player.mop_object = mops[mop] if mop >= 0 else None
+        player.held_items = [_item(code) for code in data[offset:offset + held]]
+        offset += held
+        player.sync_rect()
+
+    stations = list(kitchen.stations)
+    offset = _check_count(data, offset, stations, "stations")
+    for station in stations:
+        station.current_item = _item(data[offset])
+        offset += 1
+        if isinstance(station, CookingStation):
+            cooking, station.cook_duration, done_at, output = COOKING.unpack_from(data, offset)
+            offset += COOKING.size
+            station.cooking = cooking
+            station.cook_done_at = _present(done_at)
+            station.output_item_type = ITEM_TYPES[output - 1] if output else None
+        elif isinstance(station, AssemblyTable):
+            count = data[offset]
+            station.items_on_table = [_item(code) for code in data[offset + 1:offset + 1 + count]]
+            offset += 1 + count
+        elif isinstance(station, ServeCounter):
+            station.served_dish = _item(data[offset])
+            offset += 1
+    tables = list(kitchen.dining_tables)
+    offset = _check_count(data, offset, tables, "dining tables")
+    for table in tables:
+        table.occupied = bool(data[offset])
+        offset += 1
+
+    (order_manager.taking_orders, next_spawn_at, order_manager.total_spawned, order_manager.order_counter,
+     total_reward, order_manager.total_completed) = ORDER_MANAGER.unpack_from(data, offset)
+    offset += ORDER_MANAGER.size
+    order_manager.next_spawn_at = _present(next_spawn_at)
+    order_manager.total_reward = _number(total_reward)
+    count, offset = _read_count(data, offset)
+    # Objects the kitchen already has are reused, so rewinding a few seconds
+    # rebuilds almost nothing
+    known_orders = {order.order_id: order for order in order_manager.orders + order_manager.all_completed}
+    orders = []
+    order_links = []
+    order_manager.orders = []
+    order_manager.all_completed = []
+    for _ in range(count):
+        (order_id, dish, active, completed, timestamp, completion_time, reward,
+         customer, table) = ORDER.unpack_from(data, offset)
+        offset += ORDER.size
+        dish_type = ITEM_TYPES[dish - 1]
+        order = known_orders.get(order_id)
+        if order is None or order.dish_type != dish_type:
+            order = Order(dish_type, order_id, clock)
+        order.completed = completed
+        order.timestamp = timestamp
+        order.completion_time = _present(completion_time)
+        order.reward = _number(reward)
+        order.dining_table = tables[table] if table >= 0 else None
+        orders.append(order)
+        order_links.append(customer)
+        (order_manager.orders if active else order_manager.all_completed).append(order)
+    count, offset = _read_count(data, offset)
+    banners = []
+    for _ in range(count):
+        dish, reward, expires_at = BANNER.unpack_from(data, offset)
+        offset += BANNER.size
+        dish_type = ITEM_TYPES[dish - 1]
+        banner = CompletedOrder.__new__(CompletedOrder)
+        banner.order_name = RECIPES[dish_type]["name"]
+        banner.reward = _number(reward)
+        banner.dish_image = SpriteSheet.load_image(Order.IMAGE_FILES[dish_type], (40, 40))
+        banner.clock = clock
+        banner.expires_at = expires_at
+        banners.append(banner)
+    order_manager.completed_orders = banners
+    order_manager.cards.clear()
+    order_manager.card_bases.clear()
+
+    count, offset = _read_count(data, offset)
+    # One customer arrives per order spawn, so the spawn time identifies them
+    known_customers = {customer.spawned_at: customer for customer in kitchen.customers}
+    customers = []
+    for _ in range(count):
+        (x, y, prev_x, prev_y, target_x, target_y, state, line_position, table, order,
+         held_food, done_eating_at, spawned_at) = CUSTOMER.unpack_from(data, offset)
+        offset += CUSTOMER.size
+        order = orders[order] if order >= 0 else None
+        customer = known_customers.get(spawned_at)
+        if customer is None or customer.order is not order:
+            customer = Customer(target_x, target_y, scheduler, order)
+            customer.spawned_at = spawned_at
+        customer.target_x = target_x
+        customer.target_y = target_y
+        customer.line_position = line_position
+        customer.dining_table = tables[table] if table >= 0 else None
+        customer.pos.update(x, y)
+        customer.prev_pos.update(prev_x, prev_y)
+        customer.sync_rect()
+        customer.state = CUSTOMER_STATES[state]
+        customer.done_eating_at = _present(done_eating_at)
+        if not held_food:
+            customer.held_food = customer.food_image = customer.food_badge = None
+        elif not customer.held_food:
+            customer.held_food = True
+            customer.food_image = Item(customer.ordered_item).image
+            customer.food_badge = customer._compose_food_badge(customer.food_image)
+        customers.append(customer)
+    kitchen.customers.empty()
+    kitchen.customers.add(*customers)
+    for order, customer in zip(orders, order_links):
+        order.customer = customers[customer] if customer >= 0 else None
+
+    count, offset = _read_count(data, offset)
+    for dirt in kitchen.dirt_spots:
+        dirt.kill()
+    for _ in range(count):
+        x, y = DIRT.unpack_from(data, offset)
+        offset += DIRT.size
+        dirt = DirtSpot(x, y)
+        kitchen.dirt_spots.add(dirt)
+        kitchen.all_sprites.add(dirt)
+    offset = _check_count(data, offset, mops, "mops")
+    for mop in mops:
+        mop.rect.x, mop.rect.y, mop.is_held, holder = MOP.unpack_from(data, offset)
+        offset += MOP.size
+        mop.holder = players[holder] if holder >= 0 else None
+    pedestrians = list(kitchen.pedestrians)
+    offset = _check_count(data, offset, pedestrians, "pedestrians")
+    for pedestrian in pedestrians:
+        x, y, prev_x, prev_y = PEDESTRIAN.unpack_from(data, offset)
+        offset += PEDESTRIAN.size
+        pedestrian.pos.update(x, y)
+        pedestrian.prev_pos.update(prev_x, prev_y)
+        pedestrian.sync_rect()
+
+    owners = ((kitchen,), (order_manager,), (cashier,), stations, customers)
+    count, offset = _read_count(data, offset)
+    queue = []
+    kitchen.message_event = None
+    cashier.message_event = None
+    for _ in range(count):
+        time, sequence, owner_kind, owner, code, arg = EVENT.unpack_from(data, offset)
+        offset += EVENT.size
+        owner = owners[owner_kind][owner]
+        name = EVENT_METHODS[code]
+        event = ScheduledEvent(time, getattr(owner, name), (banners[arg],) if arg >= 0 else ())
+        queue.append((time, sequence, event))
+        if name == "_clear_message":
+            owner.message_event = event
+    heapq.heapify(queue)
+    scheduler.queue = queue
+
+    count, offset = _read_count(data, offset)
+    policy = kitchen.helper_policy
+    if count != 0xFFFF:
+        bots = []
+        for _ in range(count):
+            dish, held_count, cooldown, idle_ticks, step_count = BOT.unpack_from(data, offset)
+            offset += BOT.size
+            index = policy.player_indices[len(bots)]
+            bot = Bot(index, NavGrid.for_player(kitchen, players[index]))
+            bot.dish = ITEM_TYPES[dish - 1] if dish else None
+            bot.held_count = held_count
+            bot.cooldown = cooldown
+            bot.idle_ticks = idle_ticks
+            for _ in range(step_count):
+                kind, value = STEP.unpack_from(data, offset)
+                offset += STEP.size
+                kind = STEP_KINDS[kind]
+                if kind == "cooler":
+                    target = value
+                else:
+                    target = stations[value] if value >= 0 else None
+                bot.steps.append((kind, target))
+            bots.append(bot)
+        policy.bots = bots
+    elif policy:
+        policy.bots = None
+
+
+def _check_count(data, offset, items, name):
+    count, offset = _read_count(data, offset)
+    if count != len(items):
+        raise ValueError(f"snapshot has {count} {name}, the kitchen has {len(items)}")
+    return offset
+
+
+_DISHES_BY_NAME = {}
+
+
+def _dish_named(name):
+    # Completed-order banners keep only the dish's display name
+    if not _DISHES_BY_NAME:
+        _DISHES_BY_NAME.update((recipe["name"], dish) for dish, recipe in RECIPES.items())
+    return _DISHES_BY_NAME[name]
@@ -0,0 +1,178 @@
+import pygame
+from settings import *
+
+
+def _cells(box, size):
+    # Every cell a (left, top, right, bottom) box touches
+    left, top, right, bottom = box
+    return tuple((column, row)
+                 for column in range(int(left // size), int(right // size) + 1)
+                 for row in range(int(top // size), int(bottom // size) + 1))
+
+
+class SpatialHash:
+    """Uniform grid of cells for "what is near here" queries.
+
+    Items are placed by a box (left, top, right, bottom) in every cell it
+    touches. ``query`` gathers the items of the cells a box touches, so the
+    caller's exact test only runs over what is close by. Every item keeps
+    the order it was inserted in, and results come back in that order, so
+    "first match wins" loops pick the same item a full scan would.
+    """
+
+    def __init__(self, cell_size=SPATIAL_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}  # (column, row) -> {item: order}
+        self.placed = {}  # item -> (order, cells)
+        self.next_order = 0
+
+    def __len__(self):
+        return len(self.placed)
+
+    def insert(self, item, box):
+        order = self.next_order
+        self.next_order += 1
+        self._place(item, order, _cells(box, self.cell_size))
+
+    def remove(self, item):
+        entry = self.placed.pop(item, None)
+        if entry is not None:
+            self._unplace(item, entry[1])
+
+    def move(self, item, box):
+        # Only items that crossed into other cells touch the grid
+        entry = self.placed.get(item)
+        if entry is None:
+            return
+        order, old = entry
+        cells = _cells(box, self.cell_size)
+        if cells != old:
+            self._unplace(item, old)
+            self._place(item, order, cells)
+
+    def query(self, box):
+        found = {}
+        cells = self.cells
+        for cell in _cells(box, self.cell_size):
+            bucket = cells.get(cell)
+            if bucket:
+                found.update(bucket)
+        if len(found) > 1:
+            return sorted(found, key=found.get)
+        return list(found)
+
+    def near(self, point, radius):
+        # Candidates only; whether they are within ``radius`` is the caller's test
+        x, y = point
+        return self.query((x - radius, y - radius, x + radius, y + radius))
+
+    def _place(self, item, order, cells):
+        for cell in cells:
+            bucket = self.cells.get(cell)
+            if bucket is None:
+                bucket = self.cells[cell] = {}
+            bucket[item] = order
+        self.placed[item] = (order, cells)
+
+    def _unplace(self, item, cells):
+        for cell in cells:
+            bucket = self.cells[cell]
+            del bucket[item]
+            if not bucket:
+                del self.cells[cell]
+
+
+def within(a, b, radius):
+    # Squared distances order the same as distances, without the square root
+    dx = a[0] - b[0]
+    dy = a[1] - b[1]
+    return dx * dx + dy * dy < radius * radius
+
+
+def center_box(sprite):
+    x, y = sprite.rect.center
+    return x, y, x, y
+
+
+def collision_box(sprite):
+    rect = sprite.collision_rect
+    return rect.left, rect.top, rect.right, rect.bottom
+
+
+class IndexedGroup(pygame.sprite.Group):
+    """Sprite group that keeps its members in a SpatialHash.
+
+    Adding and removing (``kill``, ``empty`` and the rest) go through the
+    group, so membership is always current; after a member moves, the
+    owner calls ``moved`` and the grid re-homes it if it changed cells.
+    ``box`` gives the area a member is indexed by. Iterating the group
+    still visits every member in insertion order.
+    """
+
+    def __init__(self, box, *sprites):
+        self.box = box
+        self.grid = SpatialHash()
+        super().__init__(*sprites)
+
+    def copy(self):
+        return self.__class__(self.box, *self.sprites())
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self.grid.insert(sprite, self.box(sprite))
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.grid.remove(sprite)
+
+    def moved(self, sprite):
+        self.grid.move(sprite, self.box(sprite))
+
+    def reindex(self):
+        for sprite in self.spritedict:
+            self.grid.move(sprite, self.box(sprite))
+
+    def near(self, point, radius):
+        """Members whose box may lie within ``radius`` of ``point``, in group order."""
+        return self.grid.near(point, radius)
+
+    def overlapping(self, rect):
+        """Members whose box may overlap ``rect``, in group order."""
+        return self.grid.query((rect.left, rect.top, rect.right, rect.bottom))
+
+
+class StaticColliders:
+    """Furniture collision rects bucketed on a grid, for moving boxes to test against.
+
+    The furniture never moves during a shift, so the buckets are built once
+    per layout and shared by every kitchen with that layout. ``collides``
+    only tests the rects in the cells the box touches.
+    """
+    _compiled = {}
+
+    @classmethod
+    def for_layout(cls, rects):
+        key = tuple(tuple(rect) for rect in rects)
+        colliders = cls._compiled.get(key)
+        if colliders is None:
+            colliders = cls._compiled[key] = cls(key)
+        return colliders
+
+    def __init__(self, rects, cell_size=SPATIAL_CELL_SIZE):
+        self.cell_size = cell_size
+        self.rects = [pygame.Rect(rect) for rect in rects]
+        buckets = {}
+        for rect in self.rects:
+            for cell in _cells((rect.left, rect.top, rect.right, rect.bottom), cell_size):
+                buckets.setdefault(cell, []).append(rect)
+        self.cells = {cell: tuple(bucket) for cell, bucket in buckets.items()}
+
+    def collides(self, rect):
+        size = self.cell_size
+        cells = self.cells
+        for column in range(rect.left // size, rect.right // size + 1):
+            for row in range(rect.top // size, rect.bottom // size + 1):
+                bucket = cells.get((column, row))
+                if bucket and rect.collidelist(bucket) != -1:
+                    return True
+        return False
@@ -1,28 +1,120 @@
 import pygame
 import os
+import math
+from collections import OrderedDict
 from settings import *
+from fonts import Fonts
+from render import LAYER_FLOOR, LAYER_WORLD, LAYER_OVERLAY
 
 
 class SpriteSheet:
+    # Full-resolution originals by filename
     _cache = {}
+    # Scaled/transformed variants by (filename, size, transform), oldest first
+    _variants = OrderedDict()
+    _variant_bytes = 0
+    
+    budget_bytes = IMAGE_CACHE_BUDGET
+    hits = 0
+    misses = 0
+    evictions = 0
+    
+    TRANSFORMS = {
+        "rotate90": lambda img: pygame.transform.rotate(img, 90),
+        "flip_x": lambda img: pygame.transform.flip(img, True, False),
+        "flip_y": lambda img: pygame.transform.flip(img, False, True),
+    }
     
     @classmethod
-    def load_image(cls, filename, size=None):
-        if filename in cls._cache:
-            img = cls._cache[filename]
+    def load_image(cls, filename, size=None, transform=None):
+        """Return a shared surface; callers must copy before modifying it."""
+        if size:
+            size = (int(size[0]), int(size[1]))
         else:
-            path = os.path.join(ASSETS_PATH, filename)
-            try:
-                img = pygame.image.load(path).convert_alpha()
-                cls._cache[filename] = img
-            except pygame.error as e:
-                print(f"Cannot load image: {path}")
-                img = pygame.Surface((64, 64))
-                img.fill(RED)
-                
+            size = None
+        
+        if size is None and transform is None:
+            if filename in cls._cache:
+                cls.hits += 1
+            else:
+                cls.misses += 1
+            return cls._load_original(filename)
+        
+        key = (filename, size, transform)
+        img = cls._variants.get(key)
+        if img is not None:
+            cls._variants.move_to_end(key)
+            cls.hits += 1
+            return img
+        
+        cls.misses += 1
+        img = cls._load_original(filename)
         if size:
             img = pygame.transform.scale(img, size)
+        if transform:
+            img = cls.TRANSFORMS[transform](img)
+        
+        cls._variants[key] = img
+        cls._variant_bytes += cls._surface_bytes(img)
+        cls._evict()
+        return img
+    
+    @classmethod
+    def _load_original(cls, filename):
+        img = cls._cache.get(filename)
+        if img is not None:
+            return img
+        
+        path = os.path.join(ASSETS_PATH, filename)
+        try:
+            img = pygame.image.load(path).convert_alpha()
+            cls._cache[filename] = img
+        except (pygame.error, FileNotFoundError):
+            print(f"Cannot load image: {path}")
+            img = pygame.Surface((64, 64))
+            img.fill(RED)
         return img
+    
+    @classmethod
+    def _evict(cls):
+        # Least recently used variants go first; the newest one always stays
+        while cls._variant_bytes > cls.budget_bytes and len(cls._variants) > 1:
+            _, img = cls._variants.popitem(last=False)
+            cls._variant_bytes -= cls._surface_bytes(img)
+            cls.evictions += 1
+    
+    @staticmethod
+    def _surface_bytes(img):
+        return img.get_pitch() * img.get_height()
+    
+    @classmethod
+    def preload(cls, variants):
+        for filename, size, *transform in variants:
+            cls.load_image(filename, size, transform[0] if transform else None)
+    
+    @classmethod
+    def release_originals(cls, filenames=None):
+        """Drop full-resolution originals once their variants are cached.
+        
+        A later request for an uncached variant reloads the file from disk.
+        """
+        if filenames is None:
+            cls._cache.clear()
+        else:
+            for filename in filenames:
+                cls._cache.pop(filename, None)
+    
+    @classmethod
+    def get_stats(cls):
+        return {
+            "hits": cls.hits,
+            "misses": cls.misses,
+            "evictions": cls.evictions,
+            "variants": len(cls._variants),
+            "variant_bytes": cls._variant_bytes,
+            "original_bytes": sum(cls._surface_bytes(img) for img in cls._cache.values()),
+            "budget_bytes": cls.budget_bytes,
+        }
 
 
 class Item(pygame.sprite.Sprite):
@@ -52,8 +144,11 @@ class Item(pygame.sprite.Sprite):
         self.rect.y = y
         
     def _load_image(self):
+        return self.get_image((ITEM_SIZE, ITEM_SIZE))
+    
+    def get_image(self, size):
         filename = self.ITEM_IMAGES.get(self.item_type, "bread.png")
-        return SpriteSheet.load_image(filename, (ITEM_SIZE, ITEM_SIZE))
+        return SpriteSheet.load_image(filename, size)
     
     def get_display_name(self):
         names = {
@@ -75,11 +170,33 @@ class Item(pygame.sprite.Sprite):
         return names.get(self.item_type, "Unknown")
 
 
-class Player(pygame.sprite.Sprite):
+class MovingSprite(pygame.sprite.Sprite):
+    """Sprite that moves in float coordinates on the fixed simulation step.
+
+    ``pos`` is the authoritative top-left; ``rect`` follows it rounded to
+    whole pixels. ``prev_pos`` holds the position at the start of the last
+    tick so drawing can interpolate between the two.
+    """
+    
+    def set_position(self, x, y):
+        self.pos = pygame.math.Vector2(x, y)
+        self.prev_pos = pygame.math.Vector2(x, y)
+        self.sync_rect()
+    
+    def sync_rect(self):
+        self.rect.topleft = (round(self.pos.x), round(self.pos.y))
+    
+    def interpolate(self, alpha):
+        # Only moves the rect; sync_rect puts it back after drawing
+        pos = self.prev_pos.lerp(self.pos, alpha)
+        self.rect.topleft = (round(pos.x), round(pos.y))
+
+
+class Player(MovingSprite):
     def __init__(self, player_num=1, x=0, y=0, speed_boost=0, holding_boost=0):
         super().__init__()
         self.player_num = player_num
-        self.speed = PLAYER_SPEED + speed_boost  
+        self.speed = PLAYER_SPEED + speed_boost * PLAYER_SPEED_BOOST
         self.max_items = 3 + holding_boost  
         
         # Load appropriate sprite
@@ -89,8 +206,7 @@ class Player(pygame.sprite.Sprite):
             self.image = SpriteSheet.load_image("player2.png", (PLAYER_SIZE, PLAYER_SIZE))
             
         self.rect = self.image.get_rect()
-        self.rect.x = x
-        self.rect.y = y
+        self.set_position(x, y)
         
         # Item being held
         self.held_item = None
@@ -103,19 +219,24 @@ class Player(pygame.sprite.Sprite):
         # Cleaning animation
         self.is_cleaning = False
         self.cleaning_timer = 0
-        self.cleaning_duration = 60  
+        self.cleaning_duration = CLEANING_DURATION
         self.clean_sway_offset = 0
+        self.tag_background = None
         self.sway_direction = 1
         
         # Movement direction for rendering
         self.direction = "down"
         
+        # Helper cooks are steered by a bot through (dx, dy) instead of keys
+        self.heading = None
+        
         if player_num == 1:
             collision_offset_x = 45  
             collision_offset_y = 25  
         else:
             collision_offset_x = 15  
             collision_offset_y = 15  
+        self.collision_offset = (collision_offset_x, collision_offset_y)
             
         self.collision_rect = pygame.Rect(
             self.rect.x + collision_offset_x,
@@ -124,11 +245,11 @@ class Player(pygame.sprite.Sprite):
             self.rect.height - (collision_offset_y * 2)
         )
         
-    def update(self, keys, obstacles=None):
+    def update(self, keys, colliders=None, dt=SIM_DT):
         if self.is_cleaning:
-            self.cleaning_timer += 1
+            self.cleaning_timer += dt
             # Sway animation move left and right
-            self.clean_sway_offset = int(10 * pygame.math.Vector2(1, 0).rotate(self.cleaning_timer * 10).x)
+            self.clean_sway_offset = int(10 * pygame.math.Vector2(1, 0).rotate(self.cleaning_timer * 1200).x)
             
             if self.cleaning_timer >= self.cleaning_duration:
                 # Cleaning animation complete
@@ -137,85 +258,75 @@ class Player(pygame.sprite.Sprite):
                 self.clean_sway_offset = 0
             return  # Don't allow movement during cleaning
         
+        step = self.speed * dt
         dx, dy = 0, 0
         
-        if self.player_num == 1:
+        if self.heading is not None:
+            hx, hy = self.heading
+            if hy:
+                dy = hy * step
+                self.direction = "up" if hy < 0 else "down"
+            if hx:
+                dx = hx * step
+                self.direction = "left" if hx < 0 else "right"
+        elif self.player_num == 1:
             # WASD controls
             if keys[pygame.K_w]:
-                dy = -self.speed
+                dy = -step
                 self.direction = "up"
             if keys[pygame.K_s]:
-                dy = self.speed
+                dy = step
                 self.direction = "down"
             if keys[pygame.K_a]:
-                dx = -self.speed
+                dx = -step
                 self.direction = "left"
             if keys[pygame.K_d]:
-                dx = self.speed
+                dx = step
                 self.direction = "right"
         else:
             # Arrow keys for player 2
             if keys[pygame.K_UP]:
-                dy = -self.speed
+                dy = -step
                 self.direction = "up"
             if keys[pygame.K_DOWN]:
-                dy = self.speed
+                dy = step
                 self.direction = "down"
             if keys[pygame.K_LEFT]:
-                dx = -self.speed
+                dx = -step
                 self.direction = "left"
             if keys[pygame.K_RIGHT]:
-                dx = self.speed
+                dx = step
                 self.direction = "right"
         
-        # Store old position
-        old_x, old_y = self.rect.x, self.rect.y
-        
-        # Move
-        self.rect.x += dx
-        self.rect.y += dy
-        
-        # Get collision offsets based on player number
-        if self.player_num == 1:
-            collision_offset_x = 45
-            collision_offset_y = 25
-        else:
-            collision_offset_x = 15
-            collision_offset_y = 15
-        
-        # Update collision rect with proper offsets
-        self.collision_rect.x = self.rect.x + collision_offset_x
-        self.collision_rect.y = self.rect.y + collision_offset_y
-        
-        # Check boundaries 
-        if self.rect.x < 0:
-            self.rect.x = 0
-        if self.rect.x > SCREEN_WIDTH - self.rect.width:
-            self.rect.x = SCREEN_WIDTH - self.rect.width
-        if self.rect.y < 70:  
-            self.rect.y = 70
-        if self.rect.y > SCREEN_HEIGHT - self.rect.height - 10:
-            self.rect.y = SCREEN_HEIGHT - self.rect.height - 10
-            
-        # Check obstacle collisions
-        if obstacles:
-            self.collision_rect.x = self.rect.x + collision_offset_x
-            self.collision_rect.y = self.rect.y + collision_offset_y
-            for obstacle in obstacles:
-                if hasattr(obstacle, 'collision_rect'):
-                    if self.collision_rect.colliderect(obstacle.collision_rect):
-                        self.rect.x = old_x
-                        self.rect.y = old_y
-                        break
-                elif hasattr(obstacle, 'rect'):
-                    if self.collision_rect.colliderect(obstacle.rect):
-                        self.rect.x = old_x
-                        self.rect.y = old_y
-                        break
-        
-        # Final collision rect update
-        self.collision_rect.x = self.rect.x + collision_offset_x
-        self.collision_rect.y = self.rect.y + collision_offset_y
+        if not dx and not dy:
+            return
+        
+        # One axis at a time, so a move blocked on one axis still slides
+        # along the furniture on the other
+        if dx:
+            old_x = self.pos.x
+            self.pos.x = max(0, min(self.pos.x + dx, SCREEN_WIDTH - self.rect.width))
+            if self._blocked(colliders):
+                self.pos.x = old_x
+        if dy:
+            old_y = self.pos.y
+            self.pos.y = max(70, min(self.pos.y + dy, SCREEN_HEIGHT - self.rect.height - 10))
+            if self._blocked(colliders):
+                self.pos.y = old_y
+        
+        self.sync_rect()
+        self._place_collision_rect()
+    
+    def _blocked(self, colliders):
+        if colliders is None:
+            return False
+        self.sync_rect()
+        self._place_collision_rect()
+        return colliders.collides(self.collision_rect)
+    
+    def _place_collision_rect(self):
+        offset_x, offset_y = self.collision_offset
+        self.collision_rect.topleft = (self.rect.x + offset_x, self.rect.y + offset_y)
     
     def start_cleaning(self):
         if self.holding_mop and not self.is_cleaning:
@@ -265,67 +376,81 @@ class Player(pygame.sprite.Sprite):
     def get_held_item_names(self):
         return [item.get_display_name() for item in self.held_items]
     
-    def draw(self, screen):
+    def get_draw_bounds(self):
+        # Sprite with its sway, the mop, held items above and the label below
+        spread = max(self.rect.width // 2 + 40, len(self.held_items) * 35 // 2 + ITEM_SIZE)
+        return pygame.Rect(self.rect.centerx - spread - 10, self.rect.top - 45,
+                           (spread + 10) * 2, self.rect.height + 70)
+    
+    def get_draw_state(self):
+        held = tuple(item.item_type for item in self.held_items)
+        return (self.clean_sway_offset, self.holding_mop, self.is_cleaning, held)
+    
+    def submit_draw(self, queue):
+        depth = self.rect.bottom
         draw_x = self.rect.x + self.clean_sway_offset
-        draw_rect = pygame.Rect(draw_x, self.rect.y, self.rect.width, self.rect.height)
         
-        # Draw player sprite
-        screen.blit(self.image, draw_rect)
+        # Player sprite
+        queue.submit(self.image, (draw_x, self.rect.y), LAYER_WORLD, depth)
         
-        # Draw mop if holding it
+        # Mop next to player if holding it
         if self.holding_mop and self.mop_object:
-            # Draw mop next to player
             mop_x = draw_x + self.rect.width - 10
             mop_y = self.rect.y + self.rect.height // 2
-            mop_img = SpriteSheet.load_image("mop.png", (30, 50))
-            screen.blit(mop_img, (mop_x, mop_y))
+            queue.submit(SpriteSheet.load_image("mop.png", (30, 50)), (mop_x, mop_y), LAYER_WORLD, depth)
             
             if self.is_cleaning:
-                font = pygame.font.Font(None, 18)
-                clean_text = font.render("Cleaning...", True, (255, 255, 0))
-                screen.blit(clean_text, (self.rect.centerx - 30, self.rect.top - 15))
+                clean_text = Fonts.get(18).render("Cleaning...", True, (255, 255, 0))
+                queue.submit(clean_text, (self.rect.centerx - 30, self.rect.top - 15), LAYER_OVERLAY, depth)
         
-        # Draw held items above player head
+        # Held items above player head
         if self.held_items:
             total_width = len(self.held_items) * 35
             start_x = self.rect.centerx - total_width // 2
-            
+            item_y = self.rect.top - 40
             for i, item in enumerate(self.held_items):
                 item_x = start_x + i * 35
-                item_y = self.rect.top - 40
-                
-                # Draw item background circle for visibility
-                pygame.draw.circle(screen, (255, 255, 255), 
-                                 (item_x + ITEM_SIZE//2, item_y + ITEM_SIZE//2), 
-                                 ITEM_SIZE//2 + 2)
-                pygame.draw.circle(screen, (100, 100, 100), 
-                                 (item_x + ITEM_SIZE//2, item_y + ITEM_SIZE//2), 
-                                 ITEM_SIZE//2 + 2, 2)
-                
-                # Draw the item
-                item_img = pygame.transform.scale(item.image, (ITEM_SIZE - 8, ITEM_SIZE - 8))
-                screen.blit(item_img, (item_x + 4, item_y + 4))
-        
-        # Draw player number indicator
-        font = pygame.font.Font(None, 20)
-        p_text = font.render(f"P{self.player_num}", True, (255, 255, 255))
-        p_bg = pygame.Surface((p_text.get_width() + 4, p_text.get_height() + 2))
-        p_bg.fill((0, 0, 0))
-        p_bg.set_alpha(150)
-        screen.blit(p_bg, (self.rect.centerx - p_text.get_width()//2 - 2, self.rect.bottom + 2))
-        screen.blit(p_text, (self.rect.centerx - p_text.get_width()//2, self.rect.bottom + 3))
-
+                queue.submit(self._item_badge(item), (item_x - 2, item_y - 2), LAYER_OVERLAY, depth)
+        
+        # Player number indicator
+        p_text = Fonts.get(20).render(f"P{self.player_num}", True, (255, 255, 255))
+        if self.tag_background is None:
+            self.tag_background = pygame.Surface((p_text.get_width() + 4, p_text.get_height() + 2))
+            self.tag_background.fill((0, 0, 0))
+            self.tag_background.set_alpha(150)
+        queue.submit(self.tag_background, (self.rect.centerx - p_text.get_width()//2 - 2, self.rect.bottom + 2),
+                     LAYER_OVERLAY, depth)
+        queue.submit(p_text, (self.rect.centerx - p_text.get_width()//2, self.rect.bottom + 3), LAYER_OVERLAY, depth)
+    
+    _badges = {}
+    
+    @classmethod
+    def _item_badge(cls, item):
+        # Held item on a white circle, composed once per item type
+        badge = cls._badges.get(item.item_type)
+        if badge is None:
+            size = ITEM_SIZE + 4
+            center = (size // 2, size // 2)
+            badge = pygame.Surface((size, size), pygame.SRCALPHA)
+            pygame.draw.circle(badge, (255, 255, 255), center, ITEM_SIZE//2 + 2)
+            pygame.draw.circle(badge, (100, 100, 100), center, ITEM_SIZE//2 + 2, 2)
+            badge.blit(item.get_image((ITEM_SIZE - 8, ITEM_SIZE - 8)), (6, 6))
+            cls._badges[item.item_type] = badge
+        return badge
 
-class Customer(pygame.sprite.Sprite):
-    def __init__(self, target_x, target_y, order=None, line_position=0, dining_table=None):
+class Customer(MovingSprite):
+    # States with nothing to do per tick; they end by an event or by the kitchen
+    IDLE_STATES = ("waiting", "sitting", "eating")
+    
+    def __init__(self, target_x, target_y, scheduler, order=None, line_position=0, dining_table=None):
         super().__init__()
+        self.scheduler = scheduler
         self.base_image = SpriteSheet.load_image("customer.png", (PLAYER_SIZE, PLAYER_SIZE))
         self.image = self.base_image.copy()
         self.rect = self.image.get_rect()
         
         # Start from right side of screen
-        self.rect.x = SCREEN_WIDTH + 50
-        self.rect.y = target_y
+        self.set_position(SCREEN_WIDTH + 50, target_y)
         
         self.target_x = target_x
         self.target_y = target_y
@@ -338,30 +463,33 @@ class Customer(pygame.sprite.Sprite):
         self.state = "arriving"
         self.speed = CUSTOMER_SPEED
         
-        # Eating timer
-        self.eating_timer = 0
+        # Eating ends at a scheduled time
         self.eating_duration = 3.0  
+        self.done_eating_at = None
         
         # Animation properties
-        self.bob_timer = 0
-        self.bob_offset = 0
-        self.wait_animation_speed = 0.08
+        self.spawned_at = scheduler.clock.time
+        self.wait_animation_speed = 9.6
         
         # Food holding
         self.held_food = None
         self.food_image = None
+        self.food_badge = None
+        self.bubble_image = None
         
         # Corner exit position
         self.corner_x = SCREEN_WIDTH - 60
         self.corner_y = SCREEN_HEIGHT - 100
         
-    def update(self, dt=1/60):
+    def update(self, dt=SIM_DT):
+        step = self.speed * dt
+        
         if self.state == "arriving":
             # Walk to cashier first
-            if self.rect.x > self.target_x:
-                self.rect.x -= self.speed
+            if self.pos.x > self.target_x:
+                self.pos.x = max(self.target_x, self.pos.x - step)
             else:
-                self.rect.x = self.target_x
+                self.pos.x = self.target_x
                 # After arriving at cashier, go to table
                 if self.dining_table:
                     self.state = "going_to_table"
@@ -371,81 +499,78 @@ class Customer(pygame.sprite.Sprite):
         elif self.state == "going_to_table":
             # Walk to assigned dining table
             if self.dining_table:
-                table_x = self.dining_table.rect.x
-                table_y = self.dining_table.rect.y - 20  
-                
-                dx = table_x - self.rect.x
-                dy = table_y - self.rect.y
-                dist = (dx**2 + dy**2)**0.5
+                table = pygame.math.Vector2(self.dining_table.seat)
                 
-                if dist > self.speed:
+                dist = self.pos.distance_to(table)
+                if dist > step:
                     # Move towards table
-                    self.rect.x += int(dx / dist * self.speed)
-                    self.rect.y += int(dy / dist * self.speed)
+                    self.pos += (table - self.pos) * (step / dist)
                 else:
-                    self.rect.x = table_x
-                    self.rect.y = table_y
+                    self.pos.update(table)
                     self.state = "sitting"
             else:
                 self.state = "waiting"
                 
-        elif self.state == "sitting":
-            # Bobbing animation while waiting for food
-            self.bob_timer += self.wait_animation_speed
-            self.bob_offset = int(2 * abs(pygame.math.Vector2(0, 1).rotate(self.bob_timer * 60).y))
-            
-        elif self.state == "eating":
-            # stay at table
-            self.eating_timer += dt
-            self.bob_timer += self.wait_animation_speed * 1.5
-            self.bob_offset = int(4 * abs(pygame.math.Vector2(0, 1).rotate(self.bob_timer * 60).y))
-            
-            if self.eating_timer >= self.eating_duration:
-                self.state = "leaving"
-                
-        elif self.state == "waiting":
-            # Bobbing animation while waiting 
-            self.bob_timer += self.wait_animation_speed
-            self.bob_offset = int(3 * abs(pygame.math.Vector2(0, 1).rotate(self.bob_timer * 60).y))
-            
         elif self.state == "receiving_food":
             # Brief pause to show receiving food
             self.state = "eating"
-            self.eating_timer = 0
+            self.done_eating_at = self.scheduler.clock.time + self.eating_duration
+            self.scheduler.at(self.done_eating_at, self._finish_eating)
             
         elif self.state == "leaving":
             # Walk to corner before exiting
-            dx = self.corner_x - self.rect.x
-            dy = self.corner_y - self.rect.y
+            dx = self.corner_x - self.pos.x
+            dy = self.corner_y - self.pos.y
             dist = max(abs(dx), abs(dy))
             
-            if dist > self.speed:
+            if dist > step:
                 # Move towards corner
-                if abs(dx) > self.speed:
-                    self.rect.x += self.speed if dx > 0 else -self.speed
-                if abs(dy) > self.speed:
-                    self.rect.y += self.speed if dy > 0 else -self.speed
+                if abs(dx) > step:
+                    self.pos.x += step if dx > 0 else -step
+                if abs(dy) > step:
+                    self.pos.y += step if dy > 0 else -step
             else:
                 # Reached corner, now exit
-                self.rect.x = self.corner_x
-                self.rect.y = self.corner_y
+                self.pos.update(self.corner_x, self.corner_y)
                 # Start exiting to the right
                 self.state = "exiting"
                 
         elif self.state == "exiting":
             # Exit to the right
-            if self.rect.x < SCREEN_WIDTH + 100:
-                self.rect.x += self.speed
+            if self.pos.x < SCREEN_WIDTH + 100:
+                self.pos.x += step
             else:
                 # Release dining table when leaving
                 if self.dining_table:
                     self.dining_table.occupied = False
                     self.dining_table = None
                 self.kill()
+        
+        if self.pos != self.prev_pos:
+            self.sync_rect()
+    
+    def _finish_eating(self):
+        self.done_eating_at = None
+        self.state = "leaving"
+    
+    # Bobbing height per state; only drawing needs the offset, so it is derived on demand
+    BOB_HEIGHTS = {"sitting": 2, "eating": 4, "waiting": 3}
+    
+    @property
+    def bob_timer(self):
+        # Animation phase from the clock, so idle customers need no updates
+        speed = self.wait_animation_speed * (1.5 if self.state == "eating" else 1)
+        return (self.scheduler.clock.time - self.spawned_at) * speed
+    
+    @property
+    def bob_offset(self):
+        height = self.BOB_HEIGHTS.get(self.state, 0)
+        return int(height * abs(math.cos(math.radians(self.bob_timer * 60))))
     
     def serve(self, food_image=None):
         self.held_food = True
         self.food_image = food_image
+        self.food_badge = self._compose_food_badge(food_image) if food_image else None
         self.state = "receiving_food"
     
     def is_waiting(self):
@@ -457,76 +582,79 @@ class Customer(pygame.sprite.Sprite):
     def receive_delivery(self, food_image=None):
         self.held_food = True
         self.food_image = food_image
+        self.food_badge = self._compose_food_badge(food_image) if food_image else None
         self.state = "receiving_food"
         return True
     
+    def get_draw_bounds(self):
+        # Order bubble and held food sit above the sprite
+        return pygame.Rect(self.rect.x - 10, self.rect.top - 70, self.rect.width + 20, self.rect.height + 70)
+    
+    def get_draw_state(self):
+        return (self.state, self.bob_offset, bool(self.held_food and self.food_image))
+    
     def update_line_position(self, new_position, new_target_x):
         self.line_position = new_position
         self.target_x = new_target_x
-        if self.state == "waiting" and self.rect.x != new_target_x:
+        if self.state == "waiting" and self.pos.x != new_target_x:
             self.state = "arriving"  
     
-    def draw(self, screen):
+    def submit_draw(self, queue):
+        depth = self.rect.bottom
         draw_y = self.rect.y - self.bob_offset if self.state == "waiting" else self.rect.y
         
-        # Draw customer
-        screen.blit(self.image, (self.rect.x, draw_y))
+        # Customer
+        queue.submit(self.image, (self.rect.x, draw_y), LAYER_WORLD, depth)
         
-        # Draw order bubble above customer when sitting at table
+        # Order bubble above customer when sitting at table
         if self.state == "sitting" and self.order and self.ordered_item:
-            # Draw speech bubble background
-            bubble_width = 50
-            bubble_height = 50
-            bubble_x = self.rect.centerx - bubble_width // 2
-            bubble_y = self.rect.top - bubble_height - 10
-            
-            # Draw white bubble with border
-            bubble_rect = pygame.Rect(bubble_x, bubble_y, bubble_width, bubble_height)
-            pygame.draw.rect(screen, (255, 255, 255), bubble_rect, border_radius=8)
-            pygame.draw.rect(screen, (100, 100, 100), bubble_rect, 2, border_radius=8)
-            
-            # Draw small triangle pointing down to customer
-            triangle_points = [
-                (self.rect.centerx - 5, bubble_y + bubble_height),
-                (self.rect.centerx + 5, bubble_y + bubble_height),
-                (self.rect.centerx, bubble_y + bubble_height + 8)
-            ]
-            pygame.draw.polygon(screen, (255, 255, 255), triangle_points)
-            pygame.draw.lines(screen, (100, 100, 100), False, triangle_points[:2], 2)
-            
-            # Draw the ordered dish image in the bubble
-            if self.order.image:
-                dish_img = pygame.transform.scale(self.order.image, (40, 40))
-                screen.blit(dish_img, (bubble_x + 5, bubble_y + 5))
+            if self.bubble_image is None:
+                self.bubble_image = self._compose_order_bubble()
+            bubble_x = self.rect.centerx - self.bubble_image.get_width() // 2
+            bubble_y = self.rect.top - 60
+            queue.submit(self.bubble_image, (bubble_x, bubble_y), LAYER_OVERLAY, depth)
         
-        # Draw held food above head if carrying 
+        # Held food above head if carrying 
         if self.held_food and self.food_image:
             food_x = self.rect.centerx - 15
             food_y = draw_y - 35
-            
-            # Draw background circle
-            pygame.draw.circle(screen, (255, 255, 255), 
-                             (food_x + 15, food_y + 15), 18)
-            pygame.draw.circle(screen, (100, 200, 100), 
-                             (food_x + 15, food_y + 15), 18, 2)
-            
-            # Draw food
-            small_food = pygame.transform.scale(self.food_image, (30, 30))
-            screen.blit(small_food, (food_x, food_y))
+            queue.submit(self.food_badge, (food_x - 5, food_y - 5), LAYER_OVERLAY, depth)
         
-        # Draw waiting indicator 
+        # Order number above customer while waiting in line
         if self.state == "waiting" and self.order:
-            # Draw order number above customer
-            font = pygame.font.Font(None, 18)
-            order_text = font.render(f"#{self.order.order_id}", True, (255, 255, 0))
+            order_text = Fonts.get(18).render(f"#{self.order.order_id}", True, (255, 255, 0))
             text_x = self.rect.centerx - order_text.get_width() // 2
-            text_y = draw_y - 15
-            screen.blit(order_text, (text_x, text_y))
-
+            queue.submit(order_text, (text_x, draw_y - 15), LAYER_OVERLAY, depth)
+    
+    def _compose_order_bubble(self):
+        # White 50x50 bubble with a small triangle pointing down to the customer
+        bubble = pygame.Surface((50, 59), pygame.SRCALPHA)
+        bubble_rect = pygame.Rect(0, 0, 50, 50)
+        pygame.draw.rect(bubble, (255, 255, 255), bubble_rect, border_radius=8)
+        pygame.draw.rect(bubble, (100, 100, 100), bubble_rect, 2, border_radius=8)
+        
+        triangle_points = [(20, 50), (30, 50), (25, 58)]
+        pygame.draw.polygon(bubble, (255, 255, 255), triangle_points)
+        pygame.draw.lines(bubble, (100, 100, 100), False, triangle_points[:2], 2)
+        
+        # Ordered dish in the bubble
+        if self.order.image:
+            bubble.blit(self.order.get_image((40, 40)), (5, 5))
+        return bubble
+    
+    @staticmethod
+    def _compose_food_badge(food_image):
+        # Food scaled once onto its background circle
+        badge = pygame.Surface((40, 40), pygame.SRCALPHA)
+        pygame.draw.circle(badge, (255, 255, 255), (20, 20), 18)
+        pygame.draw.circle(badge, (100, 200, 100), (20, 20), 18, 2)
+        badge.blit(pygame.transform.scale(food_image, (30, 30)), (5, 5))
+        return badge
 
 class Cashier(pygame.sprite.Sprite):
-    def __init__(self, x, y):
+    def __init__(self, x, y, scheduler):
         super().__init__()
+        self.scheduler = scheduler
         self.image = SpriteSheet.load_image("NPC.png", (PLAYER_SIZE, PLAYER_SIZE))
         self.rect = self.image.get_rect()
         self.rect.x = x
@@ -534,36 +662,44 @@ class Cashier(pygame.sprite.Sprite):
         
         # Speech bubble for announcing orders
         self.current_message = ""
-        self.message_timer = 0
+        self.bubble_image = None
+        self.message_event = None
         
     def announce_order(self, order_name):
         self.current_message = f"Order: {order_name}!"
-        self.message_timer = 180  
-        
-    def update(self):
-        if self.message_timer > 0:
-            self.message_timer -= 1
+        self.bubble_image = self._compose_bubble(self.current_message)
+        if self.message_event:
+            self.message_event.cancel()
+        self.message_event = self.scheduler.after(CASHIER_MESSAGE_DURATION, self._clear_message)
+    
+    def _clear_message(self):
+        self.current_message = ""
+        self.bubble_image = None
+        self.message_event = None
+    
+    def get_draw_bounds(self):
+        return pygame.Rect(self.rect.centerx - 120, self.rect.top - 40, 240, self.rect.height + 40)
+    
+    def get_draw_state(self):
+        return self.current_message or None
             
-    def draw(self, screen):
-        screen.blit(self.image, self.rect)
+    def _compose_bubble(self, message):
+        text = Fonts.get(24).render(message, True, BLACK)
+        padding = 8
+        bubble = pygame.Surface((text.get_width() + padding * 2, text.get_height() + padding * 2), pygame.SRCALPHA)
+        bg_rect = bubble.get_rect()
+        pygame.draw.rect(bubble, WHITE, bg_rect, border_radius=5)
+        pygame.draw.rect(bubble, BLACK, bg_rect, 2, border_radius=5)
+        bubble.blit(text, (padding, padding))
+        return bubble
+    
+    def submit_draw(self, queue):
+        queue.submit(self.image, self.rect, LAYER_WORLD, self.rect.bottom)
         
-        # Draw speech bubble if there's a message
-        if self.message_timer > 0 and self.current_message:
-            font = pygame.font.Font(None, 24)
-            text = font.render(self.current_message, True, BLACK)
-            
-            # Bubble background
-            bubble_rect = text.get_rect()
-            bubble_rect.centerx = self.rect.centerx
-            bubble_rect.bottom = self.rect.top - 5
-            
-            padding = 8
-            bg_rect = bubble_rect.inflate(padding * 2, padding * 2)
-            
-            pygame.draw.rect(screen, WHITE, bg_rect, border_radius=5)
-            pygame.draw.rect(screen, BLACK, bg_rect, 2, border_radius=5)
-            
-            screen.blit(text, bubble_rect)
+        # Speech bubble if there's a message
+        if self.bubble_image:
+            bubble_rect = self.bubble_image.get_rect(centerx=self.rect.centerx, bottom=self.rect.top - 5 + 8)
+            queue.submit(self.bubble_image, bubble_rect, LAYER_OVERLAY, self.rect.bottom)
 
 class LongTable(pygame.sprite.Sprite):
     def __init__(self, x, y, width=None):
@@ -611,9 +747,15 @@ class Mop(pygame.sprite.Sprite):
             self.rect.x = self.holder.rect.x + self.holder.rect.width - 10
             self.rect.y = self.holder.rect.y + self.holder.rect.height // 2
     
-    def draw(self, screen):
+    def submit_draw(self, queue):
         if not self.is_held:
-            screen.blit(self.image, self.rect)
+            queue.submit(self.image, self.rect, LAYER_FLOOR, self.rect.bottom)
+    
+    def get_draw_bounds(self):
+        return self.rect.copy()
+    
+    def get_draw_state(self):
+        return self.is_held
 
 class DirtSpot(pygame.sprite.Sprite):
     def __init__(self, x, y):
@@ -626,33 +768,50 @@ class DirtSpot(pygame.sprite.Sprite):
     def clean(self):
         self.kill()
         return REWARD_CLEANING
+    
+    def submit_draw(self, queue):
+        queue.submit(self.image, self.rect, LAYER_FLOOR, self.rect.bottom)
+    
+    def get_draw_bounds(self):
+        return self.rect.copy()
+    
+    def get_draw_state(self):
+        return None
 
 
-class Pedestrian(pygame.sprite.Sprite):
+class Pedestrian(MovingSprite):
     def __init__(self, x, y, direction="down"):
         super().__init__()
         self.image = SpriteSheet.load_image("customer.png", (PLAYER_SIZE, PLAYER_SIZE))
         self.rect = self.image.get_rect()
-        self.rect.x = x
-        self.rect.y = y
+        self.set_position(x, y)
         
         self.direction = direction  
-        self.speed = 1.5
+        self.speed = PEDESTRIAN_SPEED
         
-    def update(self, dt=1/60):
+    def update(self, dt=SIM_DT):
         if self.direction == "down":
-            self.rect.y += self.speed
+            self.pos.y += self.speed * dt
             # Reset to top when reaching bottom
-            if self.rect.y > SCREEN_HEIGHT:
-                self.rect.y = 50
+            if self.pos.y > SCREEN_HEIGHT:
+                self.pos.y = 50
+                self.prev_pos.y = 50
         else:  
-            self.rect.y -= self.speed
+            self.pos.y -= self.speed * dt
             # Reset to bottom when reaching top
-            if self.rect.y < 50:
-                self.rect.y = SCREEN_HEIGHT
+            if self.pos.y < 50:
+                self.pos.y = SCREEN_HEIGHT
+                self.prev_pos.y = SCREEN_HEIGHT
+        self.sync_rect()
     
-    def draw(self, screen):
-        screen.blit(self.image, self.rect)
+    def submit_draw(self, queue):
+        queue.submit(self.image, self.rect, LAYER_WORLD, self.rect.bottom)
+    
+    def get_draw_bounds(self):
+        return self.rect.copy()
+    
+    def get_draw_state(self):
+        return None
 
 
 class Tenant(pygame.sprite.Sprite):
@@ -1,6 +1,9 @@
 import pygame
 from settings import *
+from fonts import Fonts
 from sprites import SpriteSheet, Item
+from render import LAYER_WORLD, make_label
+from recipes import RECIPE_INDEX
 
 
 class Station(pygame.sprite.Sprite):
@@ -34,12 +37,26 @@ class Station(pygame.sprite.Sprite):
     def update(self, dt=1/60):
         pass
     
-    def draw(self, screen):
-        screen.blit(self.image, self.rect)
+    def get_draw_bounds(self):
+        # Items shown above, label, progress bar and timer text below
+        return pygame.Rect(self.rect.x - 10, self.rect.top - ITEM_SIZE - 10,
+                           self.rect.width + 60, self.rect.height + ITEM_SIZE + 46)
+    
+    def get_draw_state(self):
+        return self.current_item.item_type if self.current_item else None
+    
+    def _make_label(self, text, padding=(6, 2), border_color=None):
+        # Label box centred just under the station, composed once
+        image = make_label(Fonts.get(18), text, WHITE, (40, 40, 40), padding, border_color)
+        rect = image.get_rect(centerx=self.rect.centerx, top=self.rect.bottom + 2 - padding[1] // 2)
+        return image, rect
+    
+    def submit_draw(self, queue):
+        queue.submit(self.image, self.rect, LAYER_WORLD, self.rect.bottom)
         if self.current_item:
             item_x = self.rect.centerx - ITEM_SIZE // 2
             item_y = self.rect.top - ITEM_SIZE // 2
-            screen.blit(self.current_item.image, (item_x, item_y))
+            queue.submit(self.current_item.image, (item_x, item_y), LAYER_WORLD, self.rect.bottom)
 
 
 class Cooler(Station):    
@@ -59,6 +76,7 @@ class Cooler(Station):
         # Load preview image for this ingredient
         preview_file = self.ITEM_IMAGES.get(item_type, "bread.png")
         self.preview_image = SpriteSheet.load_image(preview_file, (40, 40)) 
+        self.label_image, self.label_rect = self._make_label(self.label, (8, 4), (100, 100, 100))
         
     def _get_label(self):
         labels = {
@@ -76,35 +94,30 @@ class Cooler(Station):
             return True, f"Picked up {self.label}"
         return False, "Hands full!"
     
-    def draw(self, screen):
-        screen.blit(self.image, self.rect)
+    def submit_draw(self, queue):
+        depth = self.rect.bottom
+        queue.submit(self.image, self.rect, LAYER_WORLD, depth)
         
-        # Draw ingredient preview on cooler
+        # Ingredient preview on cooler
         preview_x = self.rect.centerx - 20  
         preview_y = self.rect.centery - 20
-        screen.blit(self.preview_image, (preview_x, preview_y))
-        
-        # Draw label with background
-        font = pygame.font.Font(None, 18)
-        text = font.render(self.label, True, WHITE)
-        text_rect = text.get_rect(centerx=self.rect.centerx, top=self.rect.bottom + 2)
-        
-        # Background 
-        bg_rect = text_rect.inflate(8, 4)
-        pygame.draw.rect(screen, (40, 40, 40), bg_rect)
-        pygame.draw.rect(screen, (100, 100, 100), bg_rect, 1)
-        screen.blit(text, text_rect)
+        queue.submit(self.preview_image, (preview_x, preview_y), LAYER_WORLD, depth)
+        
+        # Label with background
+        queue.submit(self.label_image, self.label_rect, LAYER_WORLD, depth)
 
 
 class CookingStation(Station):
-    def __init__(self, station_type, x, y, image_file, recipes, label="", size=None):
+    def __init__(self, station_type, x, y, image_file, recipes, scheduler, label="", size=None):
         super().__init__(station_type, x, y, image_file, size=size)
         self.recipes = recipes  
+        self.scheduler = scheduler
         self.cooking = False
-        self.cook_timer = 0
         self.cook_duration = 0
+        self.cook_done_at = None
         self.output_item_type = None
         self.label = label
+        self.label_image, self.label_rect = self._make_label(label)
         
     def interact(self, player):
         if self.current_item and not self.cooking:
@@ -125,7 +138,8 @@ class CookingStation(Station):
                     output_type, cook_time = self.recipes[item.item_type]
                     self.output_item_type = output_type
                     self.cook_duration = cook_time
-                    self.cook_timer = 0
+                    self.cook_done_at = self.scheduler.clock.time + cook_time
+                    self.scheduler.at(self.cook_done_at, self._finish_cooking)
                     self.cooking = True
                     return True, f"Cooking {item.get_display_name()}... ({int(cook_time)}s)"
             return False, "No cookable items!"
@@ -136,74 +150,83 @@ class CookingStation(Station):
         
         return False, "Station busy"
     
-    def update(self, dt=1/60):
+    @property
+    def cook_timer(self):
+        # Seconds cooked so far; the finish itself is a scheduled event
+        if not self.cooking:
+            return 0
+        return self.cook_duration - (self.cook_done_at - self.scheduler.clock.time)
+    
+    def _finish_cooking(self):
+        self.cooking = False
+        self.cook_done_at = None
+        self.current_item = Item(self.output_item_type)
+        self.output_item_type = None
+    
+    def get_draw_state(self):
         if self.cooking:
-            self.cook_timer += dt
-            if self.cook_timer >= self.cook_duration:
-                # Cooking complete
-                self.cooking = False
-                self.current_item = Item(self.output_item_type)
-                self.output_item_type = None
+            progress = self.cook_timer / self.cook_duration
+            return (self.cooking, int((STATION_SIZE - 10) * progress), f"{self.cook_duration - self.cook_timer:.1f}")
+        return super().get_draw_state()
                 
-    def draw(self, screen):
-        screen.blit(self.image, self.rect)
+    def submit_draw(self, queue):
+        depth = self.rect.bottom
+        queue.submit(self.image, self.rect, LAYER_WORLD, depth)
         
-        # Draw item on station
+        # Item on station
         if self.current_item:
             item_x = self.rect.centerx - ITEM_SIZE // 2
             item_y = self.rect.centery - ITEM_SIZE // 2
-            screen.blit(self.current_item.image, (item_x, item_y))
-        
-        # Draw label
-        font = pygame.font.Font(None, 18)
-        text = font.render(self.label, True, WHITE)
-        text_rect = text.get_rect(centerx=self.rect.centerx, top=self.rect.bottom + 2)
+            queue.submit(self.current_item.image, (item_x, item_y), LAYER_WORLD, depth)
         
-        # Label background
-        bg_rect = text_rect.inflate(6, 2)
-        pygame.draw.rect(screen, (40, 40, 40), bg_rect)
-        screen.blit(text, text_rect)
+        # Label
+        queue.submit(self.label_image, self.label_rect, LAYER_WORLD, depth)
         
-        # Draw cooking progress bar
+        # Cooking progress bar
         if self.cooking:
             bar_width = STATION_SIZE - 10
-            bar_height = 10
             bar_x = self.rect.x + 5
             bar_y = self.rect.bottom + 18
             
-            # Background
-            pygame.draw.rect(screen, DARK_GRAY, (bar_x, bar_y, bar_width, bar_height))
-            
-            # Progress
             progress = self.cook_timer / self.cook_duration
             color = GREEN if progress < 0.7 else (YELLOW if progress < 0.9 else ORANGE)
-            pygame.draw.rect(screen, color, (bar_x, bar_y, int(bar_width * progress), bar_height))
-            
-            # Border
-            pygame.draw.rect(screen, WHITE, (bar_x, bar_y, bar_width, bar_height), 1)
+            queue.submit(self._progress_bar(int(bar_width * progress), color), (bar_x, bar_y), LAYER_WORLD, depth)
             
             # Timer text
             remaining = self.cook_duration - self.cook_timer
-            timer_font = pygame.font.Font(None, 16)
-            timer_text = timer_font.render(f"{remaining:.1f}s", True, WHITE)
-            screen.blit(timer_text, (bar_x + bar_width + 5, bar_y))
+            timer_text = Fonts.get(16).render(f"{remaining:.1f}s", True, WHITE)
+            queue.submit(timer_text, (bar_x + bar_width + 5, bar_y), LAYER_WORLD, depth)
         
         # Show "READY!" when cooked
         elif self.current_item:
-            ready_font = pygame.font.Font(None, 20)
-            ready_text = ready_font.render("READY!", True, GREEN)
+            ready_text = Fonts.get(20).render("READY!", True, GREEN)
             ready_rect = ready_text.get_rect(centerx=self.rect.centerx, top=self.rect.bottom + 18)
-            screen.blit(ready_text, ready_rect)
+            queue.submit(ready_text, ready_rect, LAYER_WORLD, depth)
+    
+    _bar_cache = {}
+    
+    @classmethod
+    def _progress_bar(cls, fill_width, color):
+        bar = cls._bar_cache.get((fill_width, color))
+        if bar is None:
+            bar_width = STATION_SIZE - 10
+            bar_height = 10
+            bar = pygame.Surface((bar_width, bar_height))
+            bar.fill(DARK_GRAY)
+            pygame.draw.rect(bar, color, (0, 0, fill_width, bar_height))
+            pygame.draw.rect(bar, WHITE, (0, 0, bar_width, bar_height), 1)
+            cls._bar_cache[(fill_width, color)] = bar
+        return bar
 
 
 class Stove(CookingStation):
-    def __init__(self, x, y):
-        super().__init__(StationType.STOVE, x, y, "stove.png", COOKING_STOVE, "Stove", size=(95, 90))
+    def __init__(self, x, y, scheduler):
+        super().__init__(StationType.STOVE, x, y, "stove.png", COOKING_STOVE, scheduler, "Stove", size=(95, 90))
 
 
 class Boiler(CookingStation):
-    def __init__(self, x, y):
-        super().__init__(StationType.BOILER, x, y, "boiler.png", COOKING_BOILER, "Boiler", size=(95, 90))
+    def __init__(self, x, y, scheduler):
+        super().__init__(StationType.BOILER, x, y, "boiler.png", COOKING_BOILER, scheduler, "Boiler", size=(95, 90))
 
 
 class AssemblyTable(Station):
@@ -211,6 +234,7 @@ class AssemblyTable(Station):
         # Pass custom size directly to parent - no override needed!
         super().__init__(StationType.ASSEMBLY, x, y, "assemble.png", size=(90, 120))
         self.items_on_table = []
+        self.label_image, self.label_rect = self._make_label("Assembly")
         
     def interact(self, player):
         assembled = self._try_assemble()
@@ -250,48 +274,39 @@ class AssemblyTable(Station):
         return False, "Nothing to do"
     
     def _try_assemble(self):
-        table_items = [item.item_type for item in self.items_on_table]
+        dish = RECIPE_INDEX.assemble([item.item_type for item in self.items_on_table])
+        if dish is None:
+            return None
         
-        for dish_type, recipe in RECIPES.items():
-            recipe_items = recipe["ingredients"].copy()
-            
-            # Check if we have all required items
-            can_make = True
-            for ingredient in recipe_items:
-                if ingredient not in table_items:
-                    can_make = False
-                    break
-            
-            if can_make:
-                # Remove used items
-                for ingredient in recipe_items:
-                    for i, item in enumerate(self.items_on_table):
-                        if item.item_type == ingredient:
-                            self.items_on_table.pop(i)
-                            break
-                
-                return Item(dish_type)
-        
-        return None
+        # Use up one item per ingredient; anything else stays on the table
+        needed = list(RECIPES[dish]["ingredients"])
+        kept = []
+        for item in self.items_on_table:
+            if item.item_type in needed:
+                needed.remove(item.item_type)
+            else:
+                kept.append(item)
+        self.items_on_table = kept
+        return Item(dish)
     
-    def draw(self, screen):
-        screen.blit(self.image, self.rect)
-        
-        # Draw label
-        font = pygame.font.Font(None, 18)
-        text = font.render("Assembly", True, WHITE)
-        text_rect = text.get_rect(centerx=self.rect.centerx, top=self.rect.bottom + 2)
-        bg_rect = text_rect.inflate(6, 2)
-        pygame.draw.rect(screen, (40, 40, 40), bg_rect)
-        screen.blit(text, text_rect)
-        
-        # Draw items on table
+    def get_draw_state(self):
+        on_table = tuple(item.item_type for item in self.items_on_table[:4])
+        return (super().get_draw_state(), on_table)
+    
+    def submit_draw(self, queue):
+        depth = self.rect.bottom
+        queue.submit(self.image, self.rect, LAYER_WORLD, depth)
+        
+        # Label
+        queue.submit(self.label_image, self.label_rect, LAYER_WORLD, depth)
+        
+        # Items on table
         for i, item in enumerate(self.items_on_table[:4]):  
             offset_x = (i % 2) * 30 - 15
             offset_y = (i // 2) * 30 - 15
             item_x = self.rect.centerx - ITEM_SIZE // 2 + offset_x
             item_y = self.rect.centery - ITEM_SIZE // 2 + offset_y
-            screen.blit(item.image, (item_x, item_y))
+            queue.submit(item.image, (item_x, item_y), LAYER_WORLD, depth)
 
 
 class IngredientTable(Station):
@@ -310,6 +325,7 @@ class IngredientTable(Station):
         from sprites import SpriteSheet
         preview_file = self.ITEM_IMAGES.get(item_type, "bread.png")
         self.preview_image = SpriteSheet.load_image(preview_file, (50, 50))  
+        self.label_image, self.label_rect = self._make_label(self.label, (8, 4), (100, 100, 100))
     
     def _get_label(self):
         labels = {
@@ -326,41 +342,33 @@ class IngredientTable(Station):
             return True, f"Picked up {self.label}"
         return False, "Hands full!"
     
-    def draw(self, screen):
-        screen.blit(self.image, self.rect)
+    def submit_draw(self, queue):
+        depth = self.rect.bottom
+        queue.submit(self.image, self.rect, LAYER_WORLD, depth)
         
-        # Draw ingredient preview on table 
+        # Ingredient preview on table 
         preview_x = self.rect.centerx - 25  
         preview_y = self.rect.centery - 38  
-        screen.blit(self.preview_image, (preview_x, preview_y))
-        
-        # Draw label with background
-        font = pygame.font.Font(None, 18)
-        text = font.render(self.label, True, WHITE)
-        text_rect = text.get_rect(centerx=self.rect.centerx, top=self.rect.bottom + 2)
-        
-        # Background 
-        bg_rect = text_rect.inflate(8, 4)
-        pygame.draw.rect(screen, (40, 40, 40), bg_rect)
-        pygame.draw.rect(screen, (100, 100, 100), bg_rect, 1)
-        screen.blit(text, text_rect)
+        queue.submit(self.preview_image, (preview_x, preview_y), LAYER_WORLD, depth)
+        
+        # Label with background
+        queue.submit(self.label_image, self.label_rect, LAYER_WORLD, depth)
 
-        # Draw assembled item if present
+        # Assembled item if present
         if self.current_item:
             item_x = self.rect.centerx - ITEM_SIZE // 2
             item_y = self.rect.top - ITEM_SIZE - 5
             
             # Highlight ready dish
-            pygame.draw.circle(screen, GREEN, 
-                             (item_x + ITEM_SIZE//2, item_y + ITEM_SIZE//2), 
-                             ITEM_SIZE//2 + 3, 2)
-            screen.blit(self.current_item.image, (item_x, item_y))
+            center = (item_x + ITEM_SIZE//2, item_y + ITEM_SIZE//2)
+            queue.submit_call(lambda screen: pygame.draw.circle(screen, GREEN, center, ITEM_SIZE//2 + 3, 2),
+                              LAYER_WORLD, depth)
+            queue.submit(self.current_item.image, (item_x, item_y), LAYER_WORLD, depth)
             
             # Ready text
-            ready_font = pygame.font.Font(None, 18)
-            ready_text = ready_font.render("READY!", True, GREEN)
+            ready_text = Fonts.get(18).render("READY!", True, GREEN)
             ready_rect = ready_text.get_rect(centerx=self.rect.centerx, top=self.rect.bottom + 18)
-            screen.blit(ready_text, ready_rect)
+            queue.submit(ready_text, ready_rect, LAYER_WORLD, depth)
 
 
 class ServeCounter(Station):
@@ -386,14 +394,17 @@ class ServeCounter(Station):
         
         return False, "No dish to serve!"
     
-    def draw(self, screen):
-        screen.blit(self.image, self.rect)
+    def submit_draw(self, queue):
+        queue.submit(self.image, self.rect, LAYER_WORLD, self.rect.bottom)
         
-        # Draw served dish
+        # Served dish
         if self.served_dish:
             item_x = self.rect.centerx - ITEM_SIZE // 2
             item_y = self.rect.centery - ITEM_SIZE // 2
-            screen.blit(self.served_dish.image, (item_x, item_y))
+            queue.submit(self.served_dish.image, (item_x, item_y), LAYER_WORLD, self.rect.bottom)
+    
+    def get_draw_state(self):
+        return self.served_dish.item_type if self.served_dish else None
     
     def get_served_dish(self):
         dish = self.served_dish
@@ -405,28 +416,14 @@ class MopStation(Station):
     def __init__(self, x, y):
         super().__init__(StationType.MOP, x, y, "mop.png", size=(60, 60))
         self.has_mop = True
+        self.label_image, self.label_rect = self._make_label("Mop")
         
     def interact(self, player):
         return True, "Ready to clean! Walk to dirt spots."
     
-    def draw(self, screen):
-        screen.blit(self.image, self.rect)
-        
-        # Draw label
-        font = pygame.font.Font(None, 18)
-        text = font.render("Mop", True, WHITE)
-        text_rect = text.get_rect(centerx=self.rect.centerx, top=self.rect.bottom + 2)
-        bg_rect = text_rect.inflate(6, 2)
-        pygame.draw.rect(screen, (40, 40, 40), bg_rect)
-        screen.blit(text, text_rect)
-    
-    def can_clean(self, player, dirt_spots):
-        for dirt in dirt_spots:
-            distance = ((dirt.rect.centerx - player.rect.centerx) ** 2 + 
-                       (dirt.rect.centery - player.rect.centery) ** 2) ** 0.5
-            if distance < 60:
-                return dirt
-        return None
+    def submit_draw(self, queue):
+        queue.submit(self.image, self.rect, LAYER_WORLD, self.rect.bottom)
+        queue.submit(self.label_image, self.label_rect, LAYER_WORLD, self.rect.bottom)
 
 
 class LettuceStation(Station):
@@ -436,6 +433,7 @@ class LettuceStation(Station):
         # Load lettuce preview image
         from sprites import SpriteSheet
         self.preview_image = SpriteSheet.load_image("lettuce.png", (50, 50))
+        self.label_image, self.label_rect = self._make_label("Lettuce")
         
     def interact(self, player):
         """Pick up lettuce"""
@@ -446,21 +444,17 @@ class LettuceStation(Station):
             return True, "Picked up Lettuce"
         return False, "Hands full!"
     
-    def draw(self, screen):
-        screen.blit(self.image, self.rect)
+    def submit_draw(self, queue):
+        depth = self.rect.bottom
+        queue.submit(self.image, self.rect, LAYER_WORLD, depth)
         
-        # Draw preview image on table
+        # Preview image on table
         preview_x = self.rect.centerx - 25
         preview_y = self.rect.centery - 40
-        screen.blit(self.preview_image, (preview_x, preview_y))
-        
-        # Draw label
-        font = pygame.font.Font(None, 18)
-        text = font.render("Lettuce", True, WHITE)
-        text_rect = text.get_rect(centerx=self.rect.centerx, top=self.rect.bottom + 2)
-        bg_rect = text_rect.inflate(6, 2)
-        pygame.draw.rect(screen, (40, 40, 40), bg_rect)
-        screen.blit(text, text_rect)
+        queue.submit(self.preview_image, (preview_x, preview_y), LAYER_WORLD, depth)
+        
+        # Label
+        queue.submit(self.label_image, self.label_rect, LAYER_WORLD, depth)
 
 
 class SauceStation(Station):
@@ -470,6 +464,7 @@ class SauceStation(Station):
         # Load sauce preview image
         from sprites import SpriteSheet
         self.preview_image = SpriteSheet.load_image("sauce.png", (50, 50))
+        self.label_image, self.label_rect = self._make_label("Sauce")
         
     def interact(self, player):
         if len(player.held_items) < 3:
@@ -479,26 +474,24 @@ class SauceStation(Station):
             return True, "Picked up Sauce"
         return False, "Hands full!"
     
-    def draw(self, screen):
-        screen.blit(self.image, self.rect)
+    def submit_draw(self, queue):
+        depth = self.rect.bottom
+        queue.submit(self.image, self.rect, LAYER_WORLD, depth)
         
-        # Draw preview image on table
+        # Preview image on table
         preview_x = self.rect.centerx - 25
         preview_y = self.rect.centery - 40
-        screen.blit(self.preview_image, (preview_x, preview_y))
-        
-        # Draw label
-        font = pygame.font.Font(None, 18)
-        text = font.render("Sauce", True, WHITE)
-        text_rect = text.get_rect(centerx=self.rect.centerx, top=self.rect.bottom + 2)
-        bg_rect = text_rect.inflate(6, 2)
-        pygame.draw.rect(screen, (40, 40, 40), bg_rect)
-        screen.blit(text, text_rect)
+        queue.submit(self.preview_image, (preview_x, preview_y), LAYER_WORLD, depth)
+        
+        # Label
+        queue.submit(self.label_image, self.label_rect, LAYER_WORLD, depth)
 
 class DiningTable(Station):
     def __init__(self, x, y):
         super().__init__("dining", x, y, "diningtable.png")
         self.occupied = False  
+        # Where a seated customer stands (top-left)
+        self.seat = (self.rect.x, self.rect.y - 20)
         collision_margin = 15  
         self.collision_rect = pygame.Rect(
             self.rect.x + collision_margin,
@@ -515,14 +508,9 @@ class DiningTable(Station):
     
 class LongTable(Station):
     def __init__(self, x, y, width=None, vertical=False):
-        if width:
-            base_img = SpriteSheet.load_image("longtable.png", (width, 64))
-        else:
-            base_img = SpriteSheet.load_image("longtable.png", None)
-        if vertical:
-            self.image = pygame.transform.rotate(base_img, 90)
-        else:
-            self.image = base_img
+        size = (width, 64) if width else None
+        transform = "rotate90" if vertical else None
+        self.image = SpriteSheet.load_image("longtable.png", size, transform)
         
         pygame.sprite.Sprite.__init__(self)
         self.station_type = "longtable"
@@ -1,5 +1,7 @@
 import pygame
 from settings import *
+from fonts import Fonts
+from render import DirtyRects
 
 
 class Perk:
@@ -21,9 +23,9 @@ class Store:
     def __init__(self, money):
         self.money = money
         self.perks = [
-            Perk("+1 Speed", "Increase player movement speed by 1", 100, "speed"),
-            Perk("+1 Holding", "Hold one more item (max 4)", 120, "holding"),
-            Perk("2x Salary", "Double all order rewards", 200, "salary")
+            Perk("+1 Speed", "Increase player movement speed by 1", PERK_COST_SPEED, "speed"),
+            Perk("+1 Holding", "Hold one more item (max 4)", PERK_COST_HOLDING, "holding"),
+            Perk("2x Salary", "Double all order rewards", PERK_COST_SALARY, "salary")
         ]
         self.selected_index = 0
         self.active = True
@@ -33,6 +35,9 @@ class Store:
         self.message_timer = 0
         self.message_color = (255, 255, 255)
         
+        # Gameplay frame with the store box on top, composed on first draw
+        self.backdrop = None
+        
     def handle_input(self, event):
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_UP:
@@ -41,7 +46,7 @@ class Store:
                 self.selected_index = (self.selected_index + 1) % len(self.perks)
             elif event.key == pygame.K_RETURN or event.key == pygame.K_SPACE:
                 # Try to purchase selected perk
-                return self._purchase_perk(self.selected_index)
+                return self.purchase_perk(self.selected_index)
             elif event.key == pygame.K_r:
                 # Ready to play with purchased perks
                 self.active = False
@@ -52,26 +57,35 @@ class Store:
         return None
     
     # try purchase perk
-    def _purchase_perk(self, index):
+    def purchase_perk(self, index):
         perk = self.perks[index]
         if perk.purchased:
             self.message = "Already owned!"
-            self.message_timer = 120
+            self.message_timer = STORE_MESSAGE_DURATION
             self.message_color = (255, 200, 100)
             return "already_owned"
         elif perk.can_afford(self.money):
             perk.purchase()
             self.money -= perk.cost
             self.message = f"Purchased {perk.name}!"
-            self.message_timer = 120
+            self.message_timer = STORE_MESSAGE_DURATION
             self.message_color = (100, 255, 100)
             return "purchased"
         else:
             self.message = "Not enough money!"
-            self.message_timer = 120
+            self.message_timer = STORE_MESSAGE_DURATION
             self.message_color = (255, 100, 100)
             return "cannot_afford"
     
+    def update(self, dt):
+        if self.message_timer > 0:
+            self.message_timer -= dt
+    
+    def view_state(self):
+        owned = tuple(perk.purchased for perk in self.perks)
+        message = self.message if self.message_timer > 0 else None
+        return (self.selected_index, self.money, owned, message)
+    
     def get_active_perks(self):
         active = {}
         for perk in self.perks:
@@ -86,42 +100,21 @@ class Store:
     
     def draw(self, screen):
         WIDTH, HEIGHT = SCREEN_WIDTH, SCREEN_HEIGHT
-        
-        # Draw semi-transparent background
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 200))
-        screen.blit(overlay, (0, 0))
-        
-        # Store box
         box_width, box_height = 600, 500
         box_x, box_y = WIDTH//2 - box_width//2, HEIGHT//2 - box_height//2
         
-        # Shadow
-        shadow = pygame.Surface((box_width + 10, box_height + 10), pygame.SRCALPHA)
-        pygame.draw.rect(shadow, (0, 0, 0, 150), shadow.get_rect(), border_radius=20)
-        screen.blit(shadow, (box_x - 5, box_y + 5))
-        
-        # Main box
-        box = pygame.Surface((box_width, box_height), pygame.SRCALPHA)
-        pygame.draw.rect(box, (30, 30, 30, 250), (0, 0, box_width, box_height), border_radius=20)
-        pygame.draw.rect(box, (255, 215, 0), (0, 0, box_width, box_height), 3, border_radius=20)
-        screen.blit(box, (box_x, box_y))
-        
-        # Title
-        title_font = pygame.font.Font(None, 70)
-        title = title_font.render("PERKS STORE", True, (255, 215, 0))
-        screen.blit(title, (WIDTH//2 - title.get_width()//2, box_y + 25))
+        # The screen holds the last gameplay frame the first time through
+        if self.backdrop is None:
+            self._draw_box(screen, box_x, box_y, box_width, box_height)
+            self.backdrop = screen.copy()
+        else:
+            screen.blit(self.backdrop, (0, 0))
         
         # Money display
-        money_font = pygame.font.Font(None, 40)
+        money_font = Fonts.get(40)
         money_text = money_font.render(f"Money: ${self.money}", True, (100, 255, 100))
         screen.blit(money_text, (WIDTH//2 - money_text.get_width()//2, box_y + 90))
         
-        # Draw line
-        pygame.draw.line(screen, (255, 215, 0), 
-                        (box_x + 50, box_y + 130), 
-                        (box_x + box_width - 50, box_y + 130), 2)
-        
         # Draw perks
         perk_start_y = box_y + 160
         for i, perk in enumerate(self.perks):
@@ -129,13 +122,10 @@ class Store:
             
             # Selection highlight
             if i == self.selected_index:
-                highlight = pygame.Surface((box_width - 60, 80), pygame.SRCALPHA)
-                pygame.draw.rect(highlight, (255, 215, 0, 50), (0, 0, box_width - 60, 80), border_radius=10)
-                pygame.draw.rect(highlight, (255, 215, 0, 150), (0, 0, box_width - 60, 80), 2, border_radius=10)
-                screen.blit(highlight, (box_x + 30, perk_y - 5))
+                screen.blit(self._highlight(box_width - 60), (box_x + 30, perk_y - 5))
             
             # Perk name and cost
-            name_font = pygame.font.Font(None, 36)
+            name_font = Fonts.get(36)
             if perk.purchased:
                 name_color = (100, 255, 100)
                 name = name_font.render(f"✓ {perk.name} - OWNED", True, name_color)
@@ -145,20 +135,14 @@ class Store:
             screen.blit(name, (box_x + 50, perk_y + 5))
             
             # Description
-            desc_font = pygame.font.Font(None, 28)
+            desc_font = Fonts.get(28)
             desc_color = (200, 200, 200) if not perk.purchased else (150, 200, 150)
             desc = desc_font.render(perk.description, True, desc_color)
             screen.blit(desc, (box_x + 50, perk_y + 40))
         
-        # Instructions
-        inst_y = box_y + box_height - 60
-        inst_font = pygame.font.Font(None, 30)
-        inst1 = inst_font.render("ENTER: Buy  R: Play Again  ESC: Main Menu", True, (200, 200, 200))
-        screen.blit(inst1, (WIDTH//2 - inst1.get_width()//2, inst_y))
-        
         # Draw message notification
         if self.message_timer > 0:
-            msg_font = pygame.font.Font(None, 40)
+            msg_font = Fonts.get(40)
             msg_surface = msg_font.render(self.message, True, self.message_color)
             
             # Message background
@@ -173,9 +157,55 @@ class Store:
             
             screen.blit(msg_bg, (msg_x, msg_y))
             screen.blit(msg_surface, (msg_x + 20, msg_y + 10))
-            
-            # Decrease timer
-            self.message_timer -= 1
+        
+        DirtyRects.report(self, screen.get_rect(), self.view_state())
+    
+    def _draw_box(self, screen, box_x, box_y, box_width, box_height):
+        WIDTH, HEIGHT = SCREEN_WIDTH, SCREEN_HEIGHT
+        
+        # Draw semi-transparent background
+        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 200))
+        screen.blit(overlay, (0, 0))
+        
+        # Shadow
+        shadow = pygame.Surface((box_width + 10, box_height + 10), pygame.SRCALPHA)
+        pygame.draw.rect(shadow, (0, 0, 0, 150), shadow.get_rect(), border_radius=20)
+        screen.blit(shadow, (box_x - 5, box_y + 5))
+        
+        # Main box
+        box = pygame.Surface((box_width, box_height), pygame.SRCALPHA)
+        pygame.draw.rect(box, (30, 30, 30, 250), (0, 0, box_width, box_height), border_radius=20)
+        pygame.draw.rect(box, (255, 215, 0), (0, 0, box_width, box_height), 3, border_radius=20)
+        screen.blit(box, (box_x, box_y))
+        
+        # Title
+        title_font = Fonts.get(70)
+        title = title_font.render("PERKS STORE", True, (255, 215, 0))
+        screen.blit(title, (WIDTH//2 - title.get_width()//2, box_y + 25))
+        
+        # Draw line
+        pygame.draw.line(screen, (255, 215, 0), 
+                        (box_x + 50, box_y + 130), 
+                        (box_x + box_width - 50, box_y + 130), 2)
+        
+        # Instructions
+        inst_y = box_y + box_height - 60
+        inst_font = Fonts.get(30)
+        inst1 = inst_font.render("ENTER: Buy  R: Play Again  ESC: Main Menu", True, (200, 200, 200))
+        screen.blit(inst1, (WIDTH//2 - inst1.get_width()//2, inst_y))
+    
+    _highlights = {}
+    
+    @classmethod
+    def _highlight(cls, width):
+        highlight = cls._highlights.get(width)
+        if highlight is None:
+            highlight = pygame.Surface((width, 80), pygame.SRCALPHA)
+            pygame.draw.rect(highlight, (255, 215, 0, 50), (0, 0, width, 80), border_radius=10)
+            pygame.draw.rect(highlight, (255, 215, 0, 150), (0, 0, width, 80), 2, border_radius=10)
+            cls._highlights[width] = highlight
+        return highlight
 
 # manage money and perks between games
 class GameSession:
@@ -0,0 +1,18 @@
+import os
+import sys
+
+import pytest
+
+# Tests run headless, from the repo root so asset paths resolve
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.chdir(ROOT)
+sys.path.insert(0, ROOT)
+
+import headless
+
+
+@pytest.fixture(scope="session", autouse=True)
+def display():
+    headless.init()
@@ -0,0 +1,41 @@
+import pytest
+
+import balance
+import headless
+from bots import ScriptedPolicy
+
+
+@pytest.fixture
+def overrides():
+    # Sets tunables for one test and puts the shipped values back after
+    yield lambda **values: balance.apply_overrides({**balance.BASELINE, **values})
+    balance.apply_overrides(balance.BASELINE)
+
+
+def completion(stats):
+    return stats["orders_completed"] / stats["orders_spawned"]
+
+
+@pytest.mark.parametrize("seed", [0, 3])
+def test_long_cooks_do_not_make_bots_drop_their_dishes(overrides, seed):
+    overrides(COOK_TIME_PASTA=25)
+    stats = headless.run_shift(1, {}, ScriptedPolicy(), None, seed * 1000)
+    assert completion(stats) > 0.6
+
+
+def test_completion_falls_gradually_with_cook_time(overrides):
+    rates = []
+    for cook_time in (7, 15, 21, 25):
+        overrides(COOK_TIME_PASTA=cook_time)
+        stats = headless.run_shift(1, {}, ScriptedPolicy(), None, 0)
+        rates.append(completion(stats))
+    assert rates[0] > 0.9
+    assert min(rates) > rates[0] - 0.3
+
+
+@pytest.mark.parametrize("seed", [0, 3])
+def test_helpers_keep_serving_through_long_cooks(overrides, seed):
+    # The player stands still; two helper cooks run the whole shift
+    overrides(COOK_TIME_PASTA=25)
+    stats = headless.run_shift(1, {}, headless.idle_policy, None, seed * 1000, helpers=2)
+    assert completion(stats) > 0.9
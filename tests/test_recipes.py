@@ -0,0 +1,68 @@
+import random
+
+from settings import *
+from recipes import RecipeIndex, RECIPE_INDEX, MATCH, PARTIAL, NONE, signature
+from sprites import Item
+from stations import AssemblyTable
+
+
+def first_in_menu_order(item_types):
+    # How assembly tables picked a dish before the index
+    for dish, recipe in RECIPES.items():
+        if all(item in item_types for item in recipe["ingredients"]):
+            return dish
+    return None
+
+
+def test_assemble_matches_first_in_menu_order():
+    pool = [ItemType.BREAD, ItemType.COOKED_MEAT, ItemType.COOKED_SAUSAGE, ItemType.BOILED_PASTA,
+            ItemType.SAUCE, ItemType.LETTUCE, ItemType.MEAT, ItemType.PASTA, ItemType.BURGER]
+    rng = random.Random(1)
+    for _ in range(20000):
+        items = [rng.choice(pool) for _ in range(rng.randint(0, 6))]
+        assert RECIPE_INDEX.assemble(items) == first_in_menu_order(items)
+
+
+def test_overlapping_recipes_pick_the_first_listed():
+    # Bread, meat, sausage: both burger and hotdog are there; burger is listed first
+    items = [ItemType.COOKED_SAUSAGE, ItemType.BREAD, ItemType.COOKED_MEAT]
+    assert RECIPE_INDEX.assemble(items) == ItemType.BURGER
+
+
+def test_signature_ignores_order_and_counts_duplicates():
+    assert signature(["b", "a", "b"]) == signature(["b", "b", "a"]) == (("a", 1), ("b", 2))
+    assert signature(["a", "b"]) != signature(["a", "b", "b"])
+
+
+def test_ingredient_counts_are_respected():
+    index = RecipeIndex({
+        "club": {"ingredients": ["bread", "bread", "meat"]},
+        "toast": {"ingredients": ["bread"]},
+        "double": {"ingredients": ["bread", "bread"]},
+    })
+    assert index.match(["bread", "meat", "bread"]) == "club"
+    assert index.match(["bread", "meat"]) is None
+    # One slice is not two, so only toast fits
+    assert index.contained(["bread", "meat"]) == "toast"
+    assert index.contained(["meat", "bread", "bread", "cheese"]) == "club"
+    assert index.completable(["bread", "bread"]) == ("club", "double")
+    assert index.completable(["bread", "bread", "bread"]) == ()
+
+
+def test_status():
+    assert RECIPE_INDEX.status([ItemType.SAUCE, ItemType.LETTUCE]) == MATCH
+    assert RECIPE_INDEX.status([ItemType.BREAD]) == PARTIAL
+    assert RECIPE_INDEX.status([]) == PARTIAL
+    assert RECIPE_INDEX.status([ItemType.MEAT]) == NONE
+    assert RECIPE_INDEX.status([ItemType.SAUCE, ItemType.SAUCE]) == NONE
+    assert set(RECIPE_INDEX.completable([ItemType.SAUCE])) == {ItemType.PASTA_DISH, ItemType.SALAD_DISH}
+
+
+def test_assembly_table_uses_one_item_per_ingredient():
+    table = AssemblyTable(0, 0)
+    table.items_on_table = [Item(item_type) for item_type in
+                            (ItemType.BREAD, ItemType.LETTUCE, ItemType.BREAD, ItemType.COOKED_MEAT)]
+    dish = table._try_assemble()
+    assert dish.item_type == ItemType.BURGER
+    assert [item.item_type for item in table.items_on_table] == [ItemType.LETTUCE, ItemType.BREAD]
+    assert table._try_assemble() is None
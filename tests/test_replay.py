@@ -0,0 +1,69 @@
+import headless
+import replay
+from bots import ScriptedPolicy
+
+
+def test_varints_round_trip():
+    values = [0, 1, 0x7F, 0x80, 0x3FFF, 0x4000, 2 ** 32 - 1, 2 ** 63]
+    out = bytearray()
+    for value in values:
+        replay.write_varint(out, value)
+    offset = 0
+    for value in values:
+        decoded, offset = replay.read_varint(out, offset)
+        assert decoded == value
+    assert offset == len(out)
+
+
+def test_varints_use_seven_bits_a_byte():
+    for value, size in ((0, 1), (0x7F, 1), (0x80, 2), (0x3FFF, 2), (0x4000, 3)):
+        out = bytearray()
+        replay.write_varint(out, value)
+        assert len(out) == size
+
+
+def test_zigzag_round_trips_negative_scores():
+    for value in (0, 1, -1, 63, -64, 1000, -1000):
+        encoded = replay._zigzag(value)
+        assert encoded >= 0
+        assert replay._unzigzag(encoded) == value
+
+
+def record_shift(num_players, helpers, seed):
+    # Full shifts only; a recording does not store a shortened duration
+    policy = ScriptedPolicy(range(num_players))
+    recorded = []
+
+    def recording_policy(kitchen, keys):
+        if kitchen.recorder is None:
+            kitchen.recorder = replay.Recorder(kitchen)
+            recorded.append(kitchen)
+        return policy(kitchen, keys)
+
+    headless.run_shift(num_players, {}, recording_policy, None, seed, helpers)
+    return recorded[0]
+
+
+def test_recorded_shift_reproduces_its_score():
+    kitchen = record_shift(2, 1, 11)
+    assert kitchen.score > 0
+    data = kitchen.recorder.to_bytes()
+
+    recording = replay.Recording.from_bytes(data)
+    assert (recording.seed, recording.num_players, recording.helpers) == (11, 2, 1)
+    assert recording.ticks == kitchen.clock.ticks
+    assert recording.score == kitchen.score
+
+    stats = replay.play_headless(recording)
+    assert stats["matches"]
+    assert stats["score"] == kitchen.score
+    assert stats["steps"] == recording.ticks
+
+
+def test_only_input_changes_are_stored():
+    kitchen = record_shift(1, 0, 5)
+    recording = replay.Recording.from_bytes(kitchen.recorder.to_bytes())
+    # One event per change, never one per tick
+    assert len(recording.events) < recording.ticks / 4
+    for (_, before, _), (_, mask, actions) in zip(recording.events, recording.events[1:]):
+        assert actions or mask != before
@@ -0,0 +1,67 @@
+import pytest
+
+import headless
+import snapshot
+from settings import SIM_DT
+from controls import KeyState
+from kitchen import Kitchen
+from bots import ScriptedPolicy
+
+
+def busy_kitchen(ticks, helpers=1):
+    # Two bot players and a helper, so stations, orders and customers are all in use
+    kitchen = Kitchen(2, {"speed_boost": 1}, 5, helpers)
+    policy = ScriptedPolicy(range(2))
+    keys = KeyState()
+    run(kitchen, policy, keys, ticks)
+    return kitchen, policy, keys
+
+
+def run(kitchen, policy, keys, ticks):
+    for _ in range(ticks):
+        for player_index, action in policy(kitchen, keys):
+            kitchen.apply_action(player_index, action)
+        kitchen.update(SIM_DT, keys)
+
+
+@pytest.mark.parametrize("ticks", [0, 1, 1800, 5400])
+def test_snapshot_restore_snapshot_is_equal(ticks):
+    kitchen, _, _ = busy_kitchen(ticks)
+    data = kitchen.snapshot()
+    assert Kitchen.from_snapshot(data).snapshot() == data
+
+
+def test_restored_kitchen_continues_tick_for_tick():
+    # Helpers only: their plans travel in the snapshot, the player stands still
+    kitchen = Kitchen(1, {}, 8, 2)
+    keys = KeyState()
+    run(kitchen, headless.idle_policy, keys, 2400)
+    copy = Kitchen.from_snapshot(kitchen.snapshot())
+
+    run(kitchen, headless.idle_policy, keys, 1800)
+    run(copy, headless.idle_policy, KeyState(), 1800)
+    assert kitchen.score > 0
+    assert copy.score == kitchen.score
+    assert copy.snapshot() == kitchen.snapshot()
+
+
+def test_restore_in_place_rewinds():
+    kitchen, policy, keys = busy_kitchen(1200, helpers=0)
+    data = kitchen.snapshot()
+    run(kitchen, policy, keys, 600)
+    assert kitchen.snapshot() != data
+    kitchen.restore(data)
+    assert kitchen.snapshot() == data
+
+
+def test_header_describes_the_kitchen():
+    kitchen, _, _ = busy_kitchen(0)
+    assert snapshot.read_header(kitchen.snapshot()) == (5, 2, 1, {"speed_boost": 1})
+
+
+def test_mismatched_kitchens_are_refused():
+    data = busy_kitchen(60)[0].snapshot()
+    with pytest.raises(ValueError):
+        Kitchen(1, {}, 5, 0).restore(data)
+    with pytest.raises(ValueError):
+        snapshot.read_header(b"XXXX" + data[4:])
@@ -0,0 +1,97 @@
+import random
+
+import pygame
+
+from spatial import SpatialHash, IndexedGroup, StaticColliders, center_box, within
+
+
+def point_box(x, y):
+    return x, y, x, y
+
+
+def test_query_returns_items_in_insertion_order():
+    grid = SpatialHash(cell_size=100)
+    # Inserted right to left, so cell order and insertion order disagree
+    for name, x in (("c", 250), ("b", 150), ("a", 50)):
+        grid.insert(name, point_box(x, 50))
+    assert grid.query((0, 0, 300, 100)) == ["c", "b", "a"]
+
+
+def test_near_matches_a_full_scan():
+    rng = random.Random(7)
+    grid = SpatialHash(cell_size=64)
+    points = [(rng.uniform(0, 1000), rng.uniform(0, 700)) for _ in range(300)]
+    for index, point in enumerate(points):
+        grid.insert(index, point_box(*point))
+
+    for _ in range(200):
+        center = (rng.uniform(0, 1000), rng.uniform(0, 700))
+        radius = rng.uniform(5, 150)
+        found = [i for i in grid.near(center, radius) if within(points[i], center, radius)]
+        expected = [i for i, point in enumerate(points) if within(point, center, radius)]
+        assert found == expected
+
+
+def test_move_keeps_order_and_remove_forgets():
+    grid = SpatialHash(cell_size=100)
+    grid.insert("first", point_box(50, 50))
+    grid.insert("second", point_box(450, 50))
+    grid.move("first", point_box(460, 60))
+    assert grid.near((450, 50), 20) == ["first", "second"]
+    assert grid.near((50, 50), 20) == []
+
+    grid.remove("first")
+    grid.move("first", point_box(50, 50))  # no longer indexed, so ignored
+    assert grid.near((450, 50), 20) == ["second"]
+    assert len(grid) == 1
+    assert all(grid.cells.values())
+
+
+def test_box_spanning_cells_is_found_from_each():
+    grid = SpatialHash(cell_size=100)
+    grid.insert("table", (80, 80, 220, 120))
+    for point in ((90, 90), (150, 100), (210, 110)):
+        assert grid.near(point, 1) == ["table"]
+    assert grid.near((350, 100), 1) == []
+
+
+class Dot(pygame.sprite.Sprite):
+    def __init__(self, x, y):
+        super().__init__()
+        self.rect = pygame.Rect(x - 5, y - 5, 10, 10)
+
+
+def test_indexed_group_follows_membership_and_moves():
+    group = IndexedGroup(center_box)
+    a, b = Dot(100, 100), Dot(900, 500)
+    group.add(a, b)
+    assert group.near((100, 100), 10) == [a]
+
+    b.rect.center = (110, 100)
+    group.moved(b)
+    assert group.near((100, 100), 20) == [a, b]
+
+    a.kill()
+    assert group.near((100, 100), 20) == [b]
+    assert group.overlapping(pygame.Rect(0, 0, 200, 200)) == [b]
+
+    copy = group.copy()
+    assert copy.near((100, 100), 20) == [b]
+    group.empty()
+    assert group.near((100, 100), 20) == []
+
+
+def test_static_colliders_match_a_full_scan():
+    rng = random.Random(3)
+    rects = [pygame.Rect(rng.randrange(0, 1200), rng.randrange(0, 650),
+                         rng.randrange(20, 250), rng.randrange(20, 120)) for _ in range(25)]
+    colliders = StaticColliders(rects, cell_size=160)
+    for _ in range(500):
+        box = pygame.Rect(rng.randrange(-50, 1280), rng.randrange(-50, 720), 50, 30)
+        assert colliders.collides(box) == (box.collidelist(rects) != -1)
+
+
+def test_static_colliders_are_shared_per_layout():
+    layout = [pygame.Rect(0, 0, 10, 10), pygame.Rect(50, 50, 10, 10)]
+    assert StaticColliders.for_layout(layout) is StaticColliders.for_layout(list(layout))
+    assert StaticColliders.for_layout(layout[:1]) is not StaticColliders.for_layout(layout)
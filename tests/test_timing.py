@@ -0,0 +1,65 @@
+from settings import SIM_DT
+from timing import SimClock, Scheduler
+
+
+def test_equal_times_fire_in_scheduling_order():
+    clock = SimClock()
+    scheduler = Scheduler(clock)
+    fired = []
+    for name in "abcde":
+        scheduler.at(1.0, fired.append, name)
+    scheduler.at(0.5, fired.append, "early")
+    clock.advance(1.0)
+    scheduler.run()
+    assert fired == ["early", "a", "b", "c", "d", "e"]
+    assert len(scheduler) == 0
+
+
+def test_nothing_fires_before_it_is_due():
+    clock = SimClock()
+    scheduler = Scheduler(clock)
+    fired = []
+    scheduler.after(0.5, fired.append, "half")
+    clock.advance(0.25)
+    scheduler.run()
+    assert fired == []
+    assert len(scheduler) == 1
+
+
+def test_durations_summed_from_steps_land_on_their_tick():
+    clock = SimClock()
+    scheduler = Scheduler(clock)
+    fired = []
+    scheduler.after(5.0, lambda: fired.append(clock.ticks))
+    while not fired:
+        clock.advance(SIM_DT)
+        scheduler.run()
+    assert fired == [round(5.0 / SIM_DT)]
+
+
+def test_cancelled_events_are_skipped():
+    clock = SimClock()
+    scheduler = Scheduler(clock)
+    fired = []
+    keep = scheduler.at(1.0, fired.append, "keep")
+    drop = scheduler.at(1.0, fired.append, "drop")
+    drop.cancel()
+    clock.advance(1.0)
+    scheduler.run()
+    assert fired == ["keep"]
+    assert not keep.cancelled
+
+
+def test_callbacks_scheduling_for_now_fire_in_the_same_run():
+    clock = SimClock()
+    scheduler = Scheduler(clock)
+    fired = []
+
+    def chain():
+        fired.append("first")
+        scheduler.after(0, fired.append, "second")
+
+    scheduler.at(1.0, chain)
+    clock.advance(1.0)
+    scheduler.run()
+    assert fired == ["first", "second"]
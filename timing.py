@@ -0,0 +1,168 @@
+import time
+import heapq
+import pygame
+from settings import *
+
+
+class SimClock:
+    # Simulation time in seconds, advanced only by simulation steps
+    def __init__(self, time=0.0):
+        self.time = time
+        self.ticks = 0
+
+    def advance(self, dt):
+        self.time += dt
+        self.ticks += 1
+
+
+# Due times this close to the clock count as reached, so a duration summed
+# from SIM_DT steps lands on the tick it means
+DUE_EPSILON = 1e-9
+
+
+class ScheduledEvent:
+    # A callback waiting in a Scheduler; cancel() keeps it from firing
+    __slots__ = ("time", "callback", "args", "cancelled")
+
+    def __init__(self, time, callback, args):
+        self.time = time
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Scheduler:
+    """Callbacks due at simulation times, kept in a min-heap.
+
+    Anything that finishes at a known time (a dish cooking, the next order,
+    a message fading) schedules itself here instead of counting down every
+    tick, so an idle kitchen costs one heap peek per step. ``run`` fires
+    what is due after the clock advances, earliest first and in scheduling
+    order on ties; events a callback schedules for now fire in the same run.
+    """
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.queue = []
+        self.counter = 0
+
+    def __len__(self):
+        return len(self.queue)
+
+    def at(self, time, callback, *args):
+        event = ScheduledEvent(time, callback, args)
+        heapq.heappush(self.queue, (time, self.counter, event))
+        self.counter += 1
+        return event
+
+    def after(self, delay, callback, *args):
+        return self.at(self.clock.time + delay, callback, *args)
+
+    def run(self):
+        queue = self.queue
+        due = self.clock.time + DUE_EPSILON
+        while queue and queue[0][0] <= due:
+            event = heapq.heappop(queue)[2]
+            if not event.cancelled:
+                event.callback(*event.args)
+
+
+class FrameStats:
+    # Frame times for one game state, in milliseconds
+    def __init__(self):
+        self.frames = 0
+        self.frame_ms = 0.0
+        self.busy_ms = 0.0
+        self.worst_ms = 0.0
+
+    def add(self, frame_ms, busy_ms):
+        self.frames += 1
+        self.frame_ms += frame_ms
+        self.busy_ms += busy_ms
+        self.worst_ms = max(self.worst_ms, frame_ms)
+
+    def summary(self):
+        frames = max(self.frames, 1)
+        mean_ms = self.frame_ms / frames
+        return {
+            "frames": self.frames,
+            "fps": 1000.0 / mean_ms if mean_ms else 0.0,
+            "mean_frame_ms": mean_ms,
+            "mean_busy_ms": self.busy_ms / frames,
+            "worst_frame_ms": self.worst_ms,
+        }
+
+
+class FramePacer:
+    """Decides how long the loop waits between frames in each game state.
+
+    States in ``active_states`` run at ``GAMEPLAY_FPS`` (0 leaves pacing
+    to vsync). Every other state is event driven: the loop blocks on the
+    event queue for up to ``MENU_WAIT_TIMEOUT`` ms, so timers still tick
+    without spinning. An unfocused window drops active states to
+    ``UNFOCUSED_FPS`` and ``paused`` tells the caller to stop simulating.
+    """
+
+    def __init__(self, clock, active_states=("playing",)):
+        self.clock = clock
+        self.active_states = active_states
+        self.focused = True
+        self.stats = {}
+        self._frame_start = time.perf_counter()
+        self._frame_state = None
+        self.last_frame_ms = 0.0
+
+    @property
+    def paused(self):
+        return not self.focused
+
+    def handle_event(self, event):
+        if event.type == pygame.WINDOWFOCUSLOST:
+            self.focused = False
+        elif event.type == pygame.WINDOWFOCUSGAINED:
+            self.focused = True
+
+    def next_frame(self, state):
+        # Time spent updating and drawing the frame that just ended
+        busy_ms = (time.perf_counter() - self._frame_start) * 1000.0
+
+        if state in self.active_states:
+            frame_ms = self.clock.tick(GAMEPLAY_FPS if self.focused else UNFOCUSED_FPS)
+            events = pygame.event.get()
+        else:
+            first = pygame.event.wait(MENU_WAIT_TIMEOUT)
+            events = pygame.event.get()
+            if first.type != pygame.NOEVENT:
+                events.insert(0, first)
+            frame_ms = self.clock.tick()
+
+        if self._frame_state is not None:
+            self.stats.setdefault(self._frame_state, FrameStats()).add(frame_ms, busy_ms)
+        self._frame_state = state
+        self._frame_start = time.perf_counter()
+        self.last_frame_ms = frame_ms
+
+        # Stalls (window drags, loading) must not arrive as one huge step
+        return events, min(frame_ms / 1000.0, MAX_FRAME_TIME)
+
+    def get_stats(self):
+        return {state: stats.summary() for state, stats in self.stats.items()}
+
+    def report(self):
+        for state, summary in self.get_stats().items():
+            print(f"{state}: {summary['frames']} frames, {summary['fps']:.1f} fps, "
+                  f"{summary['mean_frame_ms']:.2f} ms/frame ({summary['mean_busy_ms']:.2f} ms busy), "
+                  f"worst {summary['worst_frame_ms']:.1f} ms")
+
+
+def create_display(size, vsync=False):
+    # vsync needs a renderer-backed window; fall back if the driver refuses
+    if vsync:
+        try:
+            return pygame.display.set_mode(size, pygame.SCALED, vsync=1)
+        except pygame.error:
+            pass
+    return pygame.display.set_mode(size)
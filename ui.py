@@ -1,129 +1,217 @@
 import pygame
 from settings import *
+from fonts import Fonts
+from render import DirtyRects, make_label
+
+
+class HudWidget:
+    """A composed HUD surface bound to a value.
+
+    ``build`` turns the value into a (surface, position) pair. ``update``
+    calls it only when the value differs from the last one and reports
+    whether anything changed, so callers can re-compose what contains it.
+    """
+
+    def __init__(self, build):
+        self.build = build
+        self.value = None
+        self.surface = None
+        self.pos = (0, 0)
+
+    def update(self, value):
+        if self.surface is not None and value == self.value:
+            return False
+        self.surface, self.pos = self.build(value)
+        self.value = value
+        return True
+
+    def draw(self, screen):
+        screen.blit(self.surface, self.pos)
+
+
+TOP_BAR_COLOR = (30, 30, 30)
 
 
 class GameUI:
     def __init__(self, screen):
         self.screen = screen
-        self.font_large = pygame.font.Font(None, 48)
-        self.font_medium = pygame.font.Font(None, 32)
-        self.font_small = pygame.font.Font(None, 22)
-        self.font_tiny = pygame.font.Font(None, 18)
+        self.font_large = Fonts.get(48)
+        self.font_medium = Fonts.get(32)
+        self.font_small = Fonts.get(22)
+        self.font_tiny = Fonts.get(18)
+        
+        # Retained HUD: each widget re-renders only when its value changes
+        self.score_widget = HudWidget(self._build_score)
+        self.time_widget = HudWidget(self._build_time)
+        self.hour_widget = HudWidget(self._build_hour)
+        self.salary_widget = HudWidget(self._build_salary)
+        self.speed_widget = HudWidget(self._build_speed)
+        self.top_bar = None
+        self.player_panels = {}
         
     def draw_top_bar(self, time_remaining, score, game_hour):
-        # Background 
-        pygame.draw.rect(self.screen, (30, 30, 30), (0, 0, SCREEN_WIDTH, 70))
-        pygame.draw.line(self.screen, (60, 60, 60), (0, 70), (SCREEN_WIDTH, 70), 2)
-        
-        # Left side - Score
-        score_label = self.font_small.render("Score:", True, WHITE)
-        self.screen.blit(score_label, (15, 8))
-        
-        score_text = f"{score}"
-        score_surface = self.font_large.render(score_text, True, WHITE)
-        self.screen.blit(score_surface, (15, 25))
-        
-        # Left side - Time with progress bar
-        time_label = self.font_small.render("Time:", True, WHITE)
-        self.screen.blit(time_label, (120, 8))
-        
-        # Time value
-        time_val = f"{int(time_remaining)}s"
-        time_surface = self.font_medium.render(time_val, True, WHITE)
-        self.screen.blit(time_surface, (120, 25))
-        
         # Time progress bar
         bar_width = 120
-        bar_height = 12
-        bar_x = 185
-        bar_y = 30
         progress = time_remaining / GAME_DURATION
-        
-        # Bar background
-        pygame.draw.rect(self.screen, (60, 60, 60), (bar_x, bar_y, bar_width, bar_height))
-        # Bar fill - green to yellow to red based on time
         if progress > 0.5:
             bar_color = GREEN
         elif progress > 0.25:
             bar_color = YELLOW
         else:
             bar_color = RED
-        pygame.draw.rect(self.screen, bar_color, (bar_x, bar_y, int(bar_width * progress), bar_height))
-        pygame.draw.rect(self.screen, WHITE, (bar_x, bar_y, bar_width, bar_height), 1)
+        time_value = (int(time_remaining), int(bar_width * progress), bar_color)
         
-        # Right side - Game hour
-        hour_text = f"Hour {game_hour}/6"
-        hour_surface = self.font_small.render(hour_text, True, LIGHT_GRAY)
-        hour_rect = hour_surface.get_rect(right=SCREEN_WIDTH - 15, top=8)
-        self.screen.blit(hour_surface, hour_rect)
+        changed = self.score_widget.update(score)
+        changed |= self.time_widget.update(time_value)
+        changed |= self.hour_widget.update(game_hour)
+        changed |= self.salary_widget.update(score)
+        if changed or self.top_bar is None:
+            self.top_bar = self._compose_top_bar()
         
+        self.screen.blit(self.top_bar, (0, 0))
+        DirtyRects.report((self, "top_bar"), (0, 0, SCREEN_WIDTH, 72), (time_value, score, game_hour))
+    
+    def _compose_top_bar(self):
+        bar = pygame.Surface((SCREEN_WIDTH, 72))
+        pygame.draw.rect(bar, TOP_BAR_COLOR, (0, 0, SCREEN_WIDTH, 70))
+        pygame.draw.line(bar, (60, 60, 60), (0, 70), (SCREEN_WIDTH, 70), 2)
+        for widget in (self.score_widget, self.time_widget, self.hour_widget, self.salary_widget):
+            widget.draw(bar)
+        if pygame.display.get_surface():
+            bar = bar.convert()
+        return bar
+    
+    def _compose_block(self, parts, area=None):
+        # Pieces at absolute top bar positions, composed on the bar colour
+        rects = [rect for _, rect in parts]
+        if area is not None:
+            rects.append(pygame.Rect(area))
+        area = rects[0].unionall(rects[1:])
+        block = pygame.Surface(area.size)
+        block.fill(TOP_BAR_COLOR)
+        for surface, rect in parts:
+            block.blit(surface, (rect.x - area.x, rect.y - area.y))
+        return block, area
+    
+    def _build_score(self, score):
+        # Left side - Score
+        score_label = self.font_small.render("Score:", True, WHITE)
+        score_surface = self.font_large.render(f"{score}", True, WHITE)
+        block, area = self._compose_block([(score_label, score_label.get_rect(topleft=(15, 8))),
+                                           (score_surface, score_surface.get_rect(topleft=(15, 25)))])
+        return block, area.topleft
+    
+    def _build_time(self, value):
+        seconds, fill_width, bar_color = value
+        bar_rect = pygame.Rect(185, 30, 120, 12)
+        
+        # Left side - Time with progress bar
+        time_label = self.font_small.render("Time:", True, WHITE)
+        time_surface = self.font_medium.render(f"{seconds}s", True, WHITE)
+        block, area = self._compose_block([(time_label, time_label.get_rect(topleft=(120, 8))),
+                                           (time_surface, time_surface.get_rect(topleft=(120, 25)))],
+                                          bar_rect)
+        
+        # Bar background, fill (green to yellow to red) and border
+        bar_rect.move_ip(-area.x, -area.y)
+        pygame.draw.rect(block, (60, 60, 60), bar_rect)
+        pygame.draw.rect(block, bar_color, (bar_rect.x, bar_rect.y, fill_width, bar_rect.height))
+        pygame.draw.rect(block, WHITE, bar_rect, 1)
+        return block, area.topleft
+    
+    def _build_hour(self, game_hour):
+        # Right side - Game hour
+        hour_surface = self.font_small.render(f"Hour {game_hour}/6", True, LIGHT_GRAY)
+        return hour_surface, hour_surface.get_rect(right=SCREEN_WIDTH - 15, top=8).topleft
+    
+    def _build_salary(self, score):
         # Right side - Salary display
         salary_label = self.font_small.render("Salary:", True, WHITE)
-        salary_rect = salary_label.get_rect(right=SCREEN_WIDTH - 60, top=35)
-        self.screen.blit(salary_label, salary_rect)
-        
-        salary_text = f"${score}"
-        salary_surface = self.font_medium.render(salary_text, True, GREEN)
-        salary_val_rect = salary_surface.get_rect(right=SCREEN_WIDTH - 15, top=30)
-        self.screen.blit(salary_surface, salary_val_rect)
+        salary_surface = self.font_medium.render(f"${score}", True, GREEN)
+        block, area = self._compose_block([(salary_label, salary_label.get_rect(right=SCREEN_WIDTH - 60, top=35)),
+                                           (salary_surface, salary_surface.get_rect(right=SCREEN_WIDTH - 15, top=30))])
+        return block, area.topleft
+        
+    def draw_time_scale(self, scale):
+        # Badge under the top bar while the shift runs faster or slower than real time
+        self.speed_widget.update(scale)
+        self.speed_widget.draw(self.screen)
+        DirtyRects.report((self, "speed"), self.speed_widget.surface.get_rect(topleft=self.speed_widget.pos), scale)
+    
+    def _build_speed(self, scale):
+        label = make_label(self.font_small, f"{scale:g}x speed", YELLOW, (40, 40, 40), (12, 6))
+        return label, label.get_rect(right=SCREEN_WIDTH - 15, top=78).topleft
         
     def draw_player_info(self, players, y_offset=0):
         for i, player in enumerate(players):
             x = 15
             y = SCREEN_HEIGHT - 80 - (i * 85) + y_offset
             
-            # Background - dark panel
-            info_rect = pygame.Rect(x, y, 200, 75)
-            pygame.draw.rect(self.screen, (30, 30, 30), info_rect, border_radius=5)
-            pygame.draw.rect(self.screen, (80, 80, 80), info_rect, 2, border_radius=5)
-            
-            # Player label with color indicator
-            player_color = (100, 200, 100) if player.player_num == 1 else (100, 100, 200)
-            pygame.draw.rect(self.screen, player_color, (x + 5, y + 5, 6, 25))
-            
-            player_label = f"Player {player.player_num}"
-            label_text = self.font_small.render(player_label, True, WHITE)
-            self.screen.blit(label_text, (x + 15, y + 5))
-            
-            # Controls hint
-            if player.player_num == 1:
-                controls = "WASD + Space/E/Q"
-            else:
-                controls = "Arrows + Enter/./,"
-            ctrl_text = self.font_tiny.render(controls, True, LIGHT_GRAY)
-            self.screen.blit(ctrl_text, (x + 15, y + 22))
-            
-            # Holding label
-            holding_label = self.font_tiny.render("Holding:", True, WHITE)
-            self.screen.blit(holding_label, (x + 8, y + 40))
-            
             # Held items display
             if player.held_items:
                 items_text = ", ".join(player.get_held_item_names()[:2])
                 if len(player.held_items) > 2:
                     items_text += f" +{len(player.held_items) - 2}"
-                items_color = YELLOW
             else:
                 items_text = "None"
-                items_color = GRAY
             
-            items_surface = self.font_tiny.render(items_text, True, items_color)
-            self.screen.blit(items_surface, (x + 60, y + 40))
+            panel = self.player_panels.get(i)
+            if panel is None:
+                panel = self.player_panels[i] = HudWidget(self._build_player_panel)
+            panel.update((player.player_num, player.heading is not None, items_text))
+            self.screen.blit(panel.surface, (x, y))
             
-            # Stamina bar (visual placeholder)
-            bar_width = 185
-            bar_height = 10
-            bar_x = x + 8
-            bar_y = y + 58
-            
-            pygame.draw.rect(self.screen, (40, 40, 40), (bar_x, bar_y, bar_width, bar_height))
-            pygame.draw.rect(self.screen, GREEN, (bar_x, bar_y, bar_width, bar_height))
-            pygame.draw.rect(self.screen, WHITE, (bar_x, bar_y, bar_width, bar_height), 1)
+            DirtyRects.report((self, "player", i), (x, y, 200, 75), panel.value)
+    
+    def _build_player_panel(self, value):
+        player_num, helper, items_text = value
+        panel = pygame.Surface((200, 75), pygame.SRCALPHA)
+        
+        # Background - dark panel
+        info_rect = panel.get_rect()
+        pygame.draw.rect(panel, (30, 30, 30), info_rect, border_radius=5)
+        pygame.draw.rect(panel, (80, 80, 80), info_rect, 2, border_radius=5)
+        
+        # Player label with color indicator
+        player_color = (100, 200, 100) if player_num == 1 else (100, 100, 200)
+        pygame.draw.rect(panel, player_color, (5, 5, 6, 25))
+        
+        label_text = self.font_small.render(f"Player {player_num}", True, WHITE)
+        panel.blit(label_text, (15, 5))
+        
+        # Controls hint
+        if helper:
+            controls = "Helper bot"
+        elif player_num == 1:
+            controls = "WASD + Space/E/Q"
+        else:
+            controls = "Arrows + Enter/./,"
+        ctrl_text = self.font_tiny.render(controls, True, LIGHT_GRAY)
+        panel.blit(ctrl_text, (15, 22))
+        
+        # Holding label
+        holding_label = self.font_tiny.render("Holding:", True, WHITE)
+        panel.blit(holding_label, (8, 40))
+        
+        items_color = GRAY if items_text == "None" else YELLOW
+        items_surface = self.font_tiny.render(items_text, True, items_color)
+        panel.blit(items_surface, (60, 40))
+        
+        # Stamina bar (visual placeholder)
+        bar_rect = (8, 58, 185, 10)
+        pygame.draw.rect(panel, (40, 40, 40), bar_rect)
+        pygame.draw.rect(panel, GREEN, bar_rect)
+        pygame.draw.rect(panel, WHITE, bar_rect, 1)
+        
+        if pygame.display.get_surface():
+            panel = panel.convert_alpha()
+        return panel, (0, 0)
     
     # draw temporary message
     def draw_message(self, message, duration_alpha=255):
         if message:
-            text_surface = self.font_medium.render(message, True, WHITE)
+            # Cached text is shared, so fade a copy
+            text_surface = self.font_medium.render(message, True, WHITE).copy()
             text_surface.set_alpha(duration_alpha)
             text_rect = text_surface.get_rect(centerx=SCREEN_WIDTH // 2, centery=SCREEN_HEIGHT - 120)
             
@@ -137,6 +225,8 @@ class GameUI:
             
             self.screen.blit(bg_surface, bg_rect)
             self.screen.blit(text_surface, text_rect)
+            
+            DirtyRects.report((self, "message"), bg_rect, (message, duration_alpha))
     
     def draw_controls_hint(self):
         hints = [
@@ -184,14 +274,16 @@ class GameUI:
         # Ingredients 
         ingredients_surface = self.font_medium.render(guide['ingredients'], True, WHITE)
         self.screen.blit(ingredients_surface, (panel_x + 10, panel_y + 45))
+        
+        DirtyRects.report((self, "guide"), (panel_x, panel_y, panel_width, panel_height), first_order.dish_type)
 
 
 class MainMenu:
     def __init__(self, screen):
         self.screen = screen
-        self.font_title = pygame.font.Font(None, 72)
-        self.font_menu = pygame.font.Font(None, 48)
-        self.font_small = pygame.font.Font(None, 32)
+        self.font_title = Fonts.get(72)
+        self.font_menu = Fonts.get(48)
+        self.font_small = Fonts.get(32)
         
         self.options = ["Start Game", "How to Play", "High Scores", "Quit"]
         self.selected = 0
@@ -202,6 +294,7 @@ class MainMenu:
             self.background = SpriteSheet.load_image("mainmenu.png", (SCREEN_WIDTH, SCREEN_HEIGHT))
         except:
             self.background = None
+        self.backdrop = None
         
     def handle_input(self, event):
         if event.type == pygame.KEYDOWN:
@@ -213,48 +306,47 @@ class MainMenu:
                 return self.options[self.selected]
         return None
     
-    def draw(self):
-        # Background
+    def view_state(self):
+        return self.selected
+    
+    def _compose_backdrop(self):
+        # Background, title and instructions never change
+        backdrop = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
         if self.background:
-            self.screen.blit(self.background, (0, 0))
+            backdrop.blit(self.background, (0, 0))
         else:
-            self.screen.fill(DARK_BROWN)
+            backdrop.fill(DARK_BROWN)
         
         # Title
         title = self.font_title.render("TIME'S KITCHEN", True, YELLOW)
-        title_rect = title.get_rect(centerx=SCREEN_WIDTH // 2, y=100)
-        self.screen.blit(title, title_rect)
+        backdrop.blit(title, title.get_rect(centerx=SCREEN_WIDTH // 2, y=100))
         
         # Subtitle
         subtitle = self.font_small.render("A Cooking Simulator", True, WHITE)
-        subtitle_rect = subtitle.get_rect(centerx=SCREEN_WIDTH // 2, y=170)
-        self.screen.blit(subtitle, subtitle_rect)
-        
-        # Menu options
-        for i, option in enumerate(self.options):
-            if i == self.selected:
-                color = YELLOW
-                prefix = ""
-            else:
-                color = WHITE
-                prefix = "  "
-            
-            text = self.font_menu.render(prefix + option, True, color)
-            text_rect = text.get_rect(centerx=SCREEN_WIDTH // 2, y=280 + i * 60)
-            self.screen.blit(text, text_rect)
+        backdrop.blit(subtitle, subtitle.get_rect(centerx=SCREEN_WIDTH // 2, y=170))
         
         # Instructions
         inst = self.font_small.render("Use Arrow Keys to Navigate, Enter to Select", True, LIGHT_GRAY)
-        inst_rect = inst.get_rect(centerx=SCREEN_WIDTH // 2, y=SCREEN_HEIGHT - 50)
-        self.screen.blit(inst, inst_rect)
+        backdrop.blit(inst, inst.get_rect(centerx=SCREEN_WIDTH // 2, y=SCREEN_HEIGHT - 50))
+        return backdrop
+    
+    def draw(self):
+        if self.backdrop is None:
+            self.backdrop = self._compose_backdrop()
+        self.screen.blit(self.backdrop, (0, 0))
+        
+        # Menu options
+        _draw_options(self.screen, self.font_menu, self.options, self.selected)
+        
+        DirtyRects.report(self, self.screen.get_rect(), self.view_state())
 
 
 class PlayerSelectMenu:
     def __init__(self, screen):
         self.screen = screen
-        self.font_title = pygame.font.Font(None, 56)
-        self.font_menu = pygame.font.Font(None, 42)
-        self.font_small = pygame.font.Font(None, 28)
+        self.font_title = Fonts.get(56)
+        self.font_menu = Fonts.get(42)
+        self.font_small = Fonts.get(28)
         
         self.options = ["1 Player", "2 Players", "Back"]
         self.selected = 0
@@ -265,6 +357,7 @@ class PlayerSelectMenu:
             self.background = SpriteSheet.load_image("selectmenu.png", (SCREEN_WIDTH, SCREEN_HEIGHT))
         except:
             self.background = None
+        self.backdrop = None
         
     def handle_input(self, event):
         if event.type == pygame.KEYDOWN:
@@ -278,35 +371,15 @@ class PlayerSelectMenu:
                 return "Back"
         return None
     
-    def draw(self):
-        if self.background:
-            self.screen.blit(self.background, (0, 0))
-        else:
-            self.screen.fill(DARK_BROWN)
-        
-        # Semi-transparent overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.fill(BLACK)
-        overlay.set_alpha(150)
-        self.screen.blit(overlay, (0, 0))
+    def view_state(self):
+        return self.selected
+    
+    def _compose_backdrop(self):
+        backdrop = _dimmed_background(self.background)
         
         # Title
         title = self.font_title.render("SELECT PLAYERS", True, YELLOW)
-        title_rect = title.get_rect(centerx=SCREEN_WIDTH // 2, y=150)
-        self.screen.blit(title, title_rect)
-        
-        # Options
-        for i, option in enumerate(self.options):
-            if i == self.selected:
-                color = YELLOW
-                prefix = ""
-            else:
-                color = WHITE
-                prefix = "  "
-            
-            text = self.font_menu.render(prefix + option, True, color)
-            text_rect = text.get_rect(centerx=SCREEN_WIDTH // 2, y=280 + i * 60)
-            self.screen.blit(text, text_rect)
+        backdrop.blit(title, title.get_rect(centerx=SCREEN_WIDTH // 2, y=150))
         
         # Player info
         info_1p = "1 Player: WASD to move, SPACE to interact, E to serve, Q to drop"
@@ -315,16 +388,28 @@ class PlayerSelectMenu:
         info1 = self.font_small.render(info_1p, True, LIGHT_GRAY)
         info2 = self.font_small.render(info_2p, True, LIGHT_GRAY)
         
-        self.screen.blit(info1, (SCREEN_WIDTH // 2 - info1.get_width() // 2, 500))
-        self.screen.blit(info2, (SCREEN_WIDTH // 2 - info2.get_width() // 2, 540))
+        backdrop.blit(info1, (SCREEN_WIDTH // 2 - info1.get_width() // 2, 500))
+        backdrop.blit(info2, (SCREEN_WIDTH // 2 - info2.get_width() // 2, 540))
+        return backdrop
+    
+    def draw(self):
+        if self.backdrop is None:
+            self.backdrop = self._compose_backdrop()
+        self.screen.blit(self.backdrop, (0, 0))
+        
+        # Options
+        _draw_options(self.screen, self.font_menu, self.options, self.selected)
+        
+        DirtyRects.report(self, self.screen.get_rect(), self.view_state())
 
 
 class HowToPlayScreen:
     def __init__(self, screen):
         self.screen = screen
-        self.font_title = pygame.font.Font(None, 56)
-        self.font_text = pygame.font.Font(None, 28)
-        self.font_small = pygame.font.Font(None, 24)
+        self.font_title = Fonts.get(56)
+        self.font_text = Fonts.get(28)
+        self.font_small = Fonts.get(24)
+        self.backdrop = None
         
     def handle_input(self, event):
         if event.type == pygame.KEYDOWN:
@@ -332,13 +417,24 @@ class HowToPlayScreen:
                 return "Back"
         return None
     
+    def view_state(self):
+        return None
+    
     def draw(self):
-        self.screen.fill(DARK_BROWN)
+        # The whole page is static, so it is composed once
+        if self.backdrop is None:
+            self.backdrop = self._compose_backdrop()
+        self.screen.blit(self.backdrop, (0, 0))
+        
+        DirtyRects.report(self, self.screen.get_rect())
+    
+    def _compose_backdrop(self):
+        backdrop = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        backdrop.fill(DARK_BROWN)
         
         # Title
         title = self.font_title.render("HOW TO PLAY", True, YELLOW)
-        title_rect = title.get_rect(centerx=SCREEN_WIDTH // 2, y=30)
-        self.screen.blit(title, title_rect)
+        backdrop.blit(title, title.get_rect(centerx=SCREEN_WIDTH // 2, y=30))
         
         instructions = [
             "",
@@ -384,17 +480,19 @@ class HowToPlayScreen:
                 color = WHITE
             
             text = self.font_small.render(line, True, color)
-            self.screen.blit(text, (100, y))
+            backdrop.blit(text, (100, y))
             y += 22
+        return backdrop
 
 
 class HighScoreScreen:
     def __init__(self, screen, scores):
         self.screen = screen
         self.scores = scores
-        self.font_title = pygame.font.Font(None, 56)
-        self.font_score = pygame.font.Font(None, 36)
-        self.font_small = pygame.font.Font(None, 28)
+        self.font_title = Fonts.get(56)
+        self.font_score = Fonts.get(36)
+        self.font_small = Fonts.get(28)
+        self.backdrop = None
         
     def handle_input(self, event):
         if event.type == pygame.KEYDOWN:
@@ -402,17 +500,28 @@ class HighScoreScreen:
                 return "Back"
         return None
     
+    def view_state(self):
+        return None
+    
     def draw(self):
-        self.screen.fill(DARK_BROWN)
+        # Scores are fixed for the lifetime of this screen
+        if self.backdrop is None:
+            self.backdrop = self._compose_backdrop()
+        self.screen.blit(self.backdrop, (0, 0))
+        
+        DirtyRects.report(self, self.screen.get_rect())
+    
+    def _compose_backdrop(self):
+        backdrop = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        backdrop.fill(DARK_BROWN)
         
         # Title
         title = self.font_title.render("HIGH SCORES", True, YELLOW)
-        title_rect = title.get_rect(centerx=SCREEN_WIDTH // 2, y=80)
-        self.screen.blit(title, title_rect)
+        backdrop.blit(title, title.get_rect(centerx=SCREEN_WIDTH // 2, y=80))
         
         if not self.scores:
             no_scores = self.font_score.render("No high scores yet!", True, WHITE)
-            self.screen.blit(no_scores, (SCREEN_WIDTH // 2 - no_scores.get_width() // 2, 250))
+            backdrop.blit(no_scores, (SCREEN_WIDTH // 2 - no_scores.get_width() // 2, 250))
         else:
             # Display top 10 scores
             for i, score_entry in enumerate(self.scores[:10]):
@@ -427,15 +536,15 @@ class HighScoreScreen:
                 date_text = self.font_small.render(date, True, GRAY)
                 
                 y = 180 + i * 45
-                self.screen.blit(rank_text, (SCREEN_WIDTH // 2 - 150, y))
-                self.screen.blit(score_text, (SCREEN_WIDTH // 2 - 80, y))
-                self.screen.blit(players_text, (SCREEN_WIDTH // 2 + 50, y + 5))
-                self.screen.blit(date_text, (SCREEN_WIDTH // 2 + 120, y + 5))
+                backdrop.blit(rank_text, (SCREEN_WIDTH // 2 - 150, y))
+                backdrop.blit(score_text, (SCREEN_WIDTH // 2 - 80, y))
+                backdrop.blit(players_text, (SCREEN_WIDTH // 2 + 50, y + 5))
+                backdrop.blit(date_text, (SCREEN_WIDTH // 2 + 120, y + 5))
         
         # Back instruction
         back_text = self.font_small.render("Press ENTER or ESC to go back", True, LIGHT_GRAY)
-        back_rect = back_text.get_rect(centerx=SCREEN_WIDTH // 2, y=SCREEN_HEIGHT - 50)
-        self.screen.blit(back_text, back_rect)
+        backdrop.blit(back_text, back_text.get_rect(centerx=SCREEN_WIDTH // 2, y=SCREEN_HEIGHT - 50))
+        return backdrop
 
 
 class GameOverScreen:
@@ -445,17 +554,18 @@ class GameOverScreen:
         self.num_players = num_players
         self.is_high_score = is_high_score
         
-        self.font_title = pygame.font.Font(None, 72)
-        self.font_score = pygame.font.Font(None, 56)
-        self.font_text = pygame.font.Font(None, 36)
-        self.font_small = pygame.font.Font(None, 28)
+        self.font_title = Fonts.get(72)
+        self.font_score = Fonts.get(56)
+        self.font_text = Fonts.get(36)
+        self.font_small = Fonts.get(28)
         
         # Load background image
         try:
-            self.background = pygame.image.load("assets/endmenu.png").convert()
-            self.background = pygame.transform.scale(self.background, (SCREEN_WIDTH, SCREEN_HEIGHT))
+            from sprites import SpriteSheet
+            self.background = SpriteSheet.load_image("endmenu.png", (SCREEN_WIDTH, SCREEN_HEIGHT))
         except:
             self.background = None  
+        self.backdrop = None
         
     def handle_input(self, event):
         """Handle input"""
@@ -466,48 +576,81 @@ class GameOverScreen:
                 return "Restart"
         return None
     
+    def view_state(self):
+        return None
+    
     def draw(self):
-        if self.background:
-            self.screen.blit(self.background, (0, 0))
-        else:
-            self.screen.fill(DARK_BROWN)
+        # Nothing on this screen changes after the shift ends
+        if self.backdrop is None:
+            self.backdrop = self._compose_backdrop()
+        self.screen.blit(self.backdrop, (0, 0))
         
-        # Semi-transparent overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.fill(BLACK)
-        overlay.set_alpha(150)
-        self.screen.blit(overlay, (0, 0))
+        DirtyRects.report(self, self.screen.get_rect())
+    
+    def _compose_backdrop(self):
+        backdrop = _dimmed_background(self.background)
         
         # Title
         title = self.font_title.render("SHIFT COMPLETE!", True, YELLOW)
         title_rect = title.get_rect(centerx=SCREEN_WIDTH // 2, y=120)
-        self.screen.blit(title, title_rect)
+        backdrop.blit(title, title_rect)
         
         # Score
         score_label = self.font_text.render("Your Final Salary:", True, WHITE)
         score_rect = score_label.get_rect(centerx=SCREEN_WIDTH // 2, y=220)
-        self.screen.blit(score_label, score_rect)
+        backdrop.blit(score_label, score_rect)
         
         score_text = self.font_score.render(f"${self.score}", True, GREEN)
         score_text_rect = score_text.get_rect(centerx=SCREEN_WIDTH // 2, y=270)
-        self.screen.blit(score_text, score_text_rect)
+        backdrop.blit(score_text, score_text_rect)
         
         # High score notification
         if self.is_high_score:
             hs_text = self.font_text.render("NEW HIGH SCORE!", True, ORANGE)
             hs_rect = hs_text.get_rect(centerx=SCREEN_WIDTH // 2, y=340)
-            self.screen.blit(hs_text, hs_rect)
+            backdrop.blit(hs_text, hs_rect)
         
         # Player mode
         mode_text = self.font_small.render(f"Mode: {self.num_players} Player(s)", True, LIGHT_GRAY)
         mode_rect = mode_text.get_rect(centerx=SCREEN_WIDTH // 2, y=400)
-        self.screen.blit(mode_text, mode_rect)
+        backdrop.blit(mode_text, mode_rect)
         
         # Options
         restart_text = self.font_text.render("Press R to Play Again & Visit Store", True, WHITE)
         restart_rect = restart_text.get_rect(centerx=SCREEN_WIDTH // 2, y=480)
-        self.screen.blit(restart_text, restart_rect)
+        backdrop.blit(restart_text, restart_rect)
         
         menu_text = self.font_text.render("Press ENTER for Main Menu", True, WHITE)
         menu_rect = menu_text.get_rect(centerx=SCREEN_WIDTH // 2, y=530)
-        self.screen.blit(menu_text, menu_rect)
+        backdrop.blit(menu_text, menu_rect)
+        return backdrop
+
+
+def _draw_options(screen, font, options, selected):
+    # Selected option in yellow, the others indented in white
+    for i, option in enumerate(options):
+        if i == selected:
+            color = YELLOW
+            prefix = ""
+        else:
+            color = WHITE
+            prefix = "  "
+        
+        text = font.render(prefix + option, True, color)
+        text_rect = text.get_rect(centerx=SCREEN_WIDTH // 2, y=280 + i * 60)
+        screen.blit(text, text_rect)
+
+
+def _dimmed_background(background):
+    # Menu background under a semi-transparent black overlay
+    backdrop = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    if background:
+        backdrop.blit(background, (0, 0))
+    else:
+        backdrop.fill(DARK_BROWN)
+    
+    overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    overlay.fill(BLACK)
+    overlay.set_alpha(150)
+    backdrop.blit(overlay, (0, 0))
+    return backdrop